@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Benchmark offline breached-password lookups on synthetic corpora.
+
+For every corpus size a sorted "SHA1:COUNT" text file is generated and
+converted, then single lookups of breached and unknown passwords are timed
+and a whole vault is checked:
+
+    python benchmarks/bench_breach.py --sizes 1000000,10000000 [--json results.json]
+
+Runs headless; no display or QGuiApplication is needed.
+"""
+import argparse
+import hashlib
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from password_manager.core.breach import BreachCorpus, build_corpus, find_breached  # noqa: E402
+from password_manager.core.cipher import CipherSettings  # noqa: E402
+from password_manager.core.vault import VaultManager  # noqa: E402
+
+DEFAULT_SIZES = (100000, 1000000)
+DEFAULT_LOOKUPS = 100000
+VAULT_ENTRIES = 10000
+
+
+def breached_password(i: int) -> str:
+    return f"breached-{i}"
+
+
+def write_text_corpus(path: Path, count: int):
+    lines = sorted(
+        f"{hashlib.sha1(breached_password(i).encode()).hexdigest().upper()}:{i % 1000 + 1}\n"
+        for i in range(count)
+    )
+    with open(path, "w") as f:
+        f.writelines(lines)
+
+
+def lookups_per_s(corpus: BreachCorpus, passwords: list) -> float:
+    start = time.perf_counter()
+    for password in passwords:
+        corpus.times_seen(password)
+    return len(passwords) / (time.perf_counter() - start)
+
+
+def bench_corpus(workdir: Path, count: int, lookups: int) -> dict:
+    results = {}
+    text_path = workdir / f"corpus-{count}.txt"
+    path = workdir / f"corpus-{count}.bin"
+    write_text_corpus(text_path, count)
+
+    start = time.perf_counter()
+    build_corpus(text_path, path)
+    results["build_s"] = time.perf_counter() - start
+    results["corpus_bytes"] = path.stat().st_size
+    text_path.unlink()
+
+    with BreachCorpus(path) as corpus:
+        step = max(count // lookups, 1)
+        hits = [breached_password(i) for i in range(0, count, step)][:lookups]
+        misses = [f"unknown-{i}" for i in range(lookups)]
+        results["hit_lookups_per_s"] = lookups_per_s(corpus, hits)
+        results["miss_lookups_per_s"] = lookups_per_s(corpus, misses)
+
+        # One entry in ten uses a breached password
+        vault = VaultManager()
+        vault.create(workdir / f"check-{count}.vault", "Bench", "Bench-Master-1!", CipherSettings())
+        vault.add_passwords([
+            (f"https://site{i}.example.com", f"user{i}",
+             breached_password(i % count) if i % 10 == 0 else f"unique-{i}", "", 0)
+            for i in range(VAULT_ENTRIES)
+        ])
+        start = time.perf_counter()
+        breached = find_breached(vault, corpus)
+        results[f"check_{VAULT_ENTRIES}_entries_ms"] = (time.perf_counter() - start) * 1000
+        assert len(breached) == VAULT_ENTRIES // 10
+        vault.close()
+    return {name: round(value, 3) for name, value in results.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma separated corpus sizes in hashes")
+    parser.add_argument("--lookups", type=int, default=DEFAULT_LOOKUPS, help="lookups per measurement")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "lookups": args.lookups,
+        },
+        "results": {},
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in map(int, args.sizes.split(",")):
+            metrics = bench_corpus(Path(tmp), count, args.lookups)
+            results["results"][str(count)] = metrics
+            print(count)
+            for name, value in metrics.items():
+                print(f"  {name:<30}{value:>16.3f}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Measure password-manager-cli start-up time per command.
+
+Each command runs in a fresh interpreter against a vault whose key
+derivation is a single iteration, so the times show start-up and the
+command itself rather than the deliberately slow KDF. Times are wall
+clock, interpreter start-up included; a bare ``python -c pass`` is timed
+in the same loop for reference. With ``--budget-ms`` a median above it
+fails the run. That the CLI never imports Qt is checked by
+tests/test_cli.py:
+
+    python benchmarks/bench_cli_startup.py [--runs 10] [--budget-ms 150] [--json results.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from password_manager.core.cipher import CipherSettings  # noqa: E402
+from password_manager.core.vault import VaultManager  # noqa: E402
+
+MASTER_PASSWORD = "Bench-Master-1!"
+
+
+def commands(workdir: Path) -> dict:
+    return {
+        "help": ["--help"],
+        "list": ["list"],
+        "search": ["search", "mail"],
+        "get": ["get", "1"],
+        "totp": ["totp", "1"],
+        "export": ["export", str(workdir / "export.csv")],
+        "import": ["import", "--dry-run", str(workdir / "export.csv")],
+    }
+
+
+def create_vault(path: Path):
+    vault = VaultManager()
+    vault.create(path, "CLI", MASTER_PASSWORD, CipherSettings(kdf_iter=1))
+    vault.add_password("mail.example.com", "alice", "pw-1", "JBSWY3DPEHPK3PXP")
+    vault.add_passwords([(f"site{i}.example.org", f"user{i}", f"pw-{i}", "", 0) for i in range(100)])
+    vault.close()
+
+
+def time_ms(argv: list, env: dict) -> float:
+    start = time.perf_counter()
+    subprocess.run(argv, env=env, capture_output=True, timeout=60)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="runs per command")
+    parser.add_argument("--budget-ms", type=float, help="fail if a median wall time is above this")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    results = {}
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        vault_path = workdir / "cli.vault"
+        create_vault(vault_path)
+        env = dict(os.environ)
+        # An installed package has its bytecode compiled; let the first runs write it
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+        env["PASSWORD_MANAGER_VAULT"] = str(vault_path)
+        env["PASSWORD_MANAGER_PASSWORD"] = MASTER_PASSWORD
+
+        # Runs once first, so the export the import reads exists and the bytecode is written
+        for name, command in commands(workdir).items():
+            argv = [sys.executable, "-m", "password_manager.cli", *command]
+            first = subprocess.run(argv, env=env, capture_output=True, text=True, timeout=60)
+            if first.returncode != 0:
+                failures.append(f"{name}: exit code {first.returncode}: {first.stderr.strip()[-200:]}")
+            results[name] = {}
+
+        interpreter = []
+        for _ in range(args.runs):
+            interpreter.append(time_ms([sys.executable, "-c", "pass"], env))
+            for name, command in commands(workdir).items():
+                argv = [sys.executable, "-m", "password_manager.cli", *command]
+                results[name].setdefault("samples", []).append(time_ms(argv, env))
+
+    baseline = round(statistics.median(interpreter), 1)
+    print(f"python -c pass: {baseline:.1f} ms median")
+    print(f"{'command':<10}{'median':>12}{'min':>12}")
+    for name, result in results.items():
+        samples = result.pop("samples")
+        result["median_ms"] = round(statistics.median(samples), 1)
+        result["min_ms"] = round(min(samples), 1)
+        print(f"{name:<10}{result['median_ms']:>9.1f} ms{result['min_ms']:>9.1f} ms")
+        if args.budget_ms is not None and result["median_ms"] > args.budget_ms:
+            failures.append(f"{name}: median {result['median_ms']} ms is over the {args.budget_ms:g} ms budget")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"runs": args.runs, "budget_ms": args.budget_ms,
+                                               "interpreter_ms": baseline, "results": results}, indent=2))
+    for failure in failures:
+        print("FAIL", failure, file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
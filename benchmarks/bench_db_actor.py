@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""Stress the vault's database thread with mixed operations from many threads.
+
+Every thread adds, updates, favorites, deletes, searches and reads its own
+entries, half of them through blocking calls and half through
+VaultManager.submit(). Afterwards the vault is reopened from disk and
+checked against what each thread expects, so any lost or interleaved
+write fails the run:
+
+    python benchmarks/bench_db_actor.py [--threads 8] [--ops 2000] [--json results.json]
+
+Runs once with the save scheduler, as the app does, and once saving every
+edit synchronously, where edits queued together are saved as one batch.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from password_manager.core.cipher import CipherSettings  # noqa: E402
+from password_manager.core.vault import VaultManager  # noqa: E402
+
+MASTER_PASSWORD = "Bench-Master-1!"
+DEFAULT_THREADS = 8
+DEFAULT_OPS = 2000
+SAVE_DELAY = 0.05
+
+
+def worker(vault: VaultManager, number: int, ops: int, expected: dict, errors: list):
+    """Run ``ops`` random operations; ``expected`` ends as {id: (website, username, password, favorite)}."""
+    rng = random.Random(number)
+    mine = {}
+    try:
+        for op in range(ops):
+            use_future = op % 2 == 1
+
+            def run(method, *args):
+                return vault.submit(method, *args).result() if use_future else method(*args)
+
+            choice = rng.random()
+            if choice < 0.3 or not mine:
+                website, username, password = f"t{number}-{op}.example.com", f"user{number}", f"pw-{op}"
+                entry_id = run(vault.add_password, website, username, password)
+                mine[entry_id] = (website, username, password, False)
+            elif choice < 0.45:
+                entry_id = rng.choice(list(mine))
+                website, username, _, favorite = mine[entry_id]
+                password = f"pw-{op}-changed"
+                run(vault.update_password, entry_id, website, username, password)
+                mine[entry_id] = (website, username, password, favorite)
+            elif choice < 0.55:
+                entry_id = rng.choice(list(mine))
+                website, username, password, favorite = mine[entry_id]
+                if run(vault.toggle_favorite, entry_id) == favorite:
+                    raise AssertionError(f"favorite of {entry_id} did not flip")
+                mine[entry_id] = (website, username, password, not favorite)
+            elif choice < 0.65:
+                entry_id = rng.choice(list(mine))
+                run(vault.delete_password, entry_id)
+                del mine[entry_id]
+            elif choice < 0.8:
+                entry_id = rng.choice(list(mine))
+                secret = run(vault.get_secret, entry_id)
+                if secret is None or secret[0] != mine[entry_id][2]:
+                    raise AssertionError(f"read back a wrong secret for {entry_id}")
+            elif choice < 0.9:
+                website = mine[rng.choice(list(mine))][0]
+                ids = run(vault.search, website, 10)
+                if not any(i in mine and mine[i][0] == website for i in ids):
+                    raise AssertionError(f"search missed {website}")
+            else:
+                run(vault.count_entries)
+    except Exception as e:
+        errors.append(f"thread {number}: {e!r}")
+    expected.update(mine)
+
+
+def stress(workdir: Path, threads: int, ops: int, save_delay) -> dict:
+    path = workdir / f"stress-{'scheduled' if save_delay else 'sync'}.vault"
+    vault = VaultManager(save_delay=save_delay)
+    vault.create(path, "Stress", MASTER_PASSWORD, CipherSettings())
+
+    expected, errors = {}, []
+    workers = [
+        threading.Thread(target=worker, args=(vault, number, ops, expected, errors))
+        for number in range(threads)
+    ]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    requests, batches = vault._actor.requests, vault._actor.batches
+    vault.close()
+
+    # Everything acknowledged must be on disk, and nothing else
+    reopened = VaultManager()
+    if not reopened.open(path, MASTER_PASSWORD):
+        errors.append("vault does not reopen")
+    else:
+        stored = {
+            entry_id: (website, username, password, bool(favorite))
+            for entry_id, website, username, password, _, favorite in reopened.iter_passwords()
+        }
+        if stored != expected:
+            missing = expected.keys() - stored.keys()
+            extra = stored.keys() - expected.keys()
+            changed = sum(1 for i in expected.keys() & stored.keys() if expected[i] != stored[i])
+            errors.append(f"vault differs: {len(missing)} missing, {len(extra)} extra, {changed} changed")
+        reopened.close()
+
+    for error in errors:
+        print("ERROR", error, file=sys.stderr)
+    return {
+        "ops_per_s": threads * ops / elapsed,
+        "requests": requests,
+        "requests_per_batch": requests / max(batches, 1),
+        "entries": len(expected),
+        "errors": len(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=DEFAULT_THREADS, help="threads issuing operations")
+    parser.add_argument("--ops", type=int, default=DEFAULT_OPS, help="operations per thread")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "threads": args.threads,
+            "ops": args.ops,
+        },
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        results["results"]["scheduled_save"] = stress(Path(tmp), args.threads, args.ops, SAVE_DELAY)
+        results["results"]["sync_save"] = stress(Path(tmp), args.threads, args.ops, None)
+
+    for name, metrics in results["results"].items():
+        print(name)
+        for metric, value in metrics.items():
+            print(f"  {metric:<30}{value:>16.3f}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+    if any(metrics["errors"] for metrics in results["results"].values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
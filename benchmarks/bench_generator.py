@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Benchmark the password generator and check its output is uniform.
+
+Times single and batched generation against drawing every character with
+secrets.choice(), then runs chi-square tests on the random source, on
+passphrase words and on where each character class lands in generated
+passwords:
+
+    python benchmarks/bench_generator.py [--samples 1000000] [--json results.json]
+
+A p-value far below 0.001 means the output is detectably non-uniform.
+"""
+import argparse
+import json
+import math
+import platform
+import secrets
+import sys
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from password_manager.core import generator  # noqa: E402
+
+PASSWORD_LENGTH = 16
+BATCH_SIZE = 10000
+DEFAULT_SAMPLES = 1000000
+
+
+def per_s(count: int, func) -> float:
+    start = time.perf_counter()
+    func()
+    return count / (time.perf_counter() - start)
+
+
+def chi_square_p(observed: list, expected: list, dof: int = None) -> tuple:
+    """Return the chi-square statistic and its upper-tail p-value (Wilson-Hilferty approximation)."""
+    statistic = sum((o - e) ** 2 / e for o, e in zip(observed, expected))
+    dof = dof or len(observed) - 1
+    z = ((statistic / dof) ** (1 / 3) - (1 - 2 / (9 * dof))) / math.sqrt(2 / (9 * dof))
+    return statistic, 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def uniform_p(values: list, n: int) -> float:
+    counts = [0] * n
+    for value in values:
+        counts[value] += 1
+    return chi_square_p(counts, [len(values) / n] * n)[1]
+
+
+def bench_throughput() -> dict:
+    alphabet = "".join(generator.CHARACTER_CLASSES.values())
+    return {
+        "password_single_per_s": per_s(BATCH_SIZE, lambda: [
+            generator.generate_password(PASSWORD_LENGTH) for _ in range(BATCH_SIZE)
+        ]),
+        "password_batch_per_s": per_s(BATCH_SIZE, lambda: generator.generate_batch(
+            BATCH_SIZE, generator.generate_password, PASSWORD_LENGTH
+        )),
+        "secrets_choice_per_s": per_s(BATCH_SIZE, lambda: [
+            "".join(secrets.choice(alphabet) for _ in range(PASSWORD_LENGTH)) for _ in range(BATCH_SIZE)
+        ]),
+        "passphrase_batch_per_s": per_s(BATCH_SIZE, lambda: generator.generate_batch(
+            BATCH_SIZE, generator.generate_passphrase, 6
+        )),
+    }
+
+
+def bench_uniformity(samples: int) -> dict:
+    source = generator.RandomSource()
+    alphabet = "".join(generator.CHARACTER_CLASSES.values())
+    index = {char: i for i, char in enumerate(alphabet)}
+    words = generator.passphrase_words()
+    word_index = {word: i for i, word in enumerate(words)}
+
+    # Each class should be equally likely at every position of a password
+    classes = list(generator.CHARACTER_CLASSES.values())
+    class_of = {char: c for c, chars in enumerate(classes) for char in chars}
+    table = [[0] * len(classes) for _ in range(PASSWORD_LENGTH)]
+    for _ in range(samples // PASSWORD_LENGTH):
+        for position, char in enumerate(generator.generate_password(PASSWORD_LENGTH)):
+            table[position][class_of[char]] += 1
+    column_totals = [sum(row[c] for row in table) for c in range(len(classes))]
+    observed = [count for row in table for count in row]
+    expected = [total / PASSWORD_LENGTH for _ in table for total in column_totals]
+    # Independence test: (rows - 1) * (columns - 1) degrees of freedom
+    class_by_position_p = chi_square_p(observed, expected, (PASSWORD_LENGTH - 1) * (len(classes) - 1))[1]
+
+    return {
+        "choices_p": uniform_p([index[c] for c in source.choices(alphabet, samples)], len(alphabet)),
+        "randbelow_1000_p": uniform_p([source.randbelow(1000) for _ in range(samples // 10)], 1000),
+        "passphrase_word_p": uniform_p(
+            [word_index[w] for w in source.choices(words, samples // 10)], len(words)
+        ),
+        "class_by_position_p": class_by_position_p,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="characters drawn per test")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "samples": args.samples,
+        },
+        "results": {
+            "throughput": bench_throughput(),
+            "uniformity": bench_uniformity(args.samples),
+        },
+    }
+    for name, metrics in results["results"].items():
+        print(name)
+        for metric, value in metrics.items():
+            print(f"  {metric:<30}{value:>16.3f}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Measure what the metrics instrumentation costs, switched off and on.
+
+Times a no-op function bare and wrapped by Metrics.timed(), then the
+instrumented VaultManager calls the app makes most often (get_secret and
+count_entries through the database thread), each with recording off and on:
+
+    python benchmarks/bench_metrics.py [--entries 1000] [--calls 20000] [--json results.json]
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from password_manager.core.cipher import CipherSettings  # noqa: E402
+from password_manager.core.metrics import metrics  # noqa: E402
+from password_manager.core.vault import VaultManager  # noqa: E402
+
+MASTER_PASSWORD = "Bench-Master-1!"
+DEFAULT_ENTRIES = 1000
+DEFAULT_CALLS = 20000
+ROUNDS = 5
+
+
+def per_call_us(fn, calls: int) -> float:
+    """Median over ROUNDS of the mean time per call, in microseconds."""
+    samples = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        samples.append((time.perf_counter() - start) / calls * 1e6)
+    return statistics.median(samples)
+
+
+def bench_wrapper(calls: int) -> dict:
+    def noop():
+        pass
+
+    timed_noop = metrics.timed("bench.noop")(noop)
+    results = {"noop_us": per_call_us(noop, calls * 10)}
+    metrics.enabled = False
+    results["timed_noop_off_us"] = per_call_us(timed_noop, calls * 10)
+    metrics.enabled = True
+    results["timed_noop_on_us"] = per_call_us(timed_noop, calls * 10)
+    metrics.enabled = False
+    return results
+
+
+def bench_vault(workdir: Path, entries: int, calls: int) -> dict:
+    rng = random.Random(0)
+    path = workdir / "metrics.vault"
+    vault = VaultManager()
+    vault.create(path, "Metrics", MASTER_PASSWORD, CipherSettings())
+    ids = [vault.add_password(f"site{i}.example.com", "user", f"pw-{i}") for i in range(entries)]
+
+    results = {}
+    for enabled in (False, True):
+        metrics.enabled = enabled
+        state = "on" if enabled else "off"
+        results[f"get_secret_{state}_us"] = per_call_us(lambda: vault.get_secret(rng.choice(ids)), calls)
+        results[f"count_entries_{state}_us"] = per_call_us(vault.count_entries, calls)
+    metrics.enabled = False
+    vault.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=DEFAULT_ENTRIES, help="entries in the vault")
+    parser.add_argument("--calls", type=int, default=DEFAULT_CALLS, help="vault calls per round")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    metrics_data = bench_wrapper(args.calls)
+    with tempfile.TemporaryDirectory() as tmp:
+        metrics_data.update(bench_vault(Path(tmp), args.entries, args.calls))
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "entries": args.entries,
+            "calls": args.calls,
+        },
+        "results": metrics_data,
+    }
+    for metric, value in metrics_data.items():
+        print(f"{metric:<30}{value:>16.3f}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Benchmark keeping several vaults open and searching all of them.
+
+Opens vaults one after another and records how much the resident memory
+grows with each, then times a search in one vault against the same search
+in every open vault, run one vault after another and in parallel:
+
+    python benchmarks/bench_multi_vault.py [--vaults 4] [--entries 10000] [--json results.json]
+
+Runs headless on Linux; memory is read from /proc/self/status.
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from password_manager.core.cipher import CipherSettings  # noqa: E402
+from password_manager.core.vault import VaultManager  # noqa: E402
+from password_manager.core.vault_set import VaultSet  # noqa: E402
+
+MASTER_PASSWORD = "Bench-Master-1!"
+DEFAULT_VAULTS = 4
+DEFAULT_ENTRIES = 10000
+QUERIES = ("mail", "bank", "shop12", "user4", "cloud.example", "zzz")
+REPEAT = 20
+
+
+def rss_kib() -> int:
+    for line in Path("/proc/self/status").read_text().splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1])
+    return 0
+
+
+def create_vault(path: Path, count: int, seed: int):
+    rng = random.Random(seed)
+    words = ["mail", "bank", "shop", "cloud", "news", "chat", "games", "travel", "photo", "code"]
+    vault = VaultManager()
+    vault.create(path, f"Vault {seed}", MASTER_PASSWORD, CipherSettings())
+    vault.add_passwords([
+        (f"https://{rng.choice(words)}{i}.example.com", f"user{rng.randrange(1_000_000)}@example.com",
+         f"pw-{rng.getrandbits(64):x}", "", 0)
+        for i in range(count)
+    ])
+    vault.close()
+
+
+def median_ms(fn) -> float:
+    samples = []
+    for _ in range(REPEAT):
+        for query in QUERIES:
+            start = time.perf_counter()
+            fn(query)
+            samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def bench(workdir: Path, vault_count: int, entries: int) -> dict:
+    paths = [workdir / f"multi-{i}.vault" for i in range(vault_count)]
+    for i, path in enumerate(paths):
+        create_vault(path, entries, i)
+
+    results = {}
+    vaults = VaultSet()
+    before = rss_kib()
+    for i, path in enumerate(paths):
+        vault = VaultManager()
+        start = time.perf_counter()
+        vault.open(path, MASTER_PASSWORD)
+        results[f"open_{i + 1}_ms"] = (time.perf_counter() - start) * 1000
+        vaults.add(vault)
+        results[f"rss_{i + 1}_vaults_mib"] = rss_kib() / 1024
+    results["rss_per_vault_mib"] = (rss_kib() - before) / 1024 / vault_count
+
+    first = vaults[0]
+
+    def search_one(query):
+        first.get_logins(first.search(query, 200))
+
+    def search_each(query):
+        for vault in vaults:
+            vault.get_logins(vault.search(query, 200))
+
+    results["search_one_vault_ms"] = median_ms(search_one)
+    results["search_sequential_ms"] = median_ms(search_each)
+    results["search_all_vaults_ms"] = median_ms(vaults.search)
+
+    for vault in vaults:
+        vault.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vaults", type=int, default=DEFAULT_VAULTS, help="vaults kept open")
+    parser.add_argument("--entries", type=int, default=DEFAULT_ENTRIES, help="entries per vault")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        metrics = bench(Path(tmp), args.vaults, args.entries)
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "vaults": args.vaults,
+            "entries": args.entries,
+        },
+        "results": metrics,
+    }
+    for metric, value in metrics.items():
+        print(f"{metric:<30}{value:>16.3f}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Benchmark opening a vault and the queries served by its indexes.
+
+Creates a vault with a few favorites among many entries, then times
+reopening it, the entry counts shown in the sidebar and the duplicate
+lookups an import makes:
+
+    python benchmarks/bench_schema.py [--entries 100000] [--json results.json]
+
+Reopening an up-to-date vault should cost the key derivation and little
+else; the schema is only read.
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from password_manager.core.cipher import CipherSettings  # noqa: E402
+from password_manager.core.vault import VaultManager  # noqa: E402
+
+MASTER_PASSWORD = "Bench-Master-1!"
+DEFAULT_ENTRIES = 100000
+FAVORITE_SHARE = 0.01
+LOOKUPS = 1000
+REPEAT = 20
+
+
+def median_ms(fn, repeat: int = REPEAT) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def bench(workdir: Path, entries: int) -> dict:
+    rng = random.Random(0)
+    path = workdir / "schema.vault"
+    rows = [
+        (f"https://site{i}.example.com", f"user{rng.randrange(1_000_000)}@example.com",
+         f"pw-{rng.getrandbits(64):x}", "", int(rng.random() < FAVORITE_SHARE))
+        for i in range(entries)
+    ]
+    vault = VaultManager()
+    vault.create(path, "Schema", MASTER_PASSWORD, CipherSettings())
+    vault.add_passwords(rows)
+    vault.close()
+
+    results = {}
+
+    def reopen():
+        reopened = VaultManager()
+        reopened.open(path, MASTER_PASSWORD)
+        reopened.close()
+
+    results["open_ms"] = median_ms(reopen, 5)
+
+    vault = VaultManager()
+    vault.open(path, MASTER_PASSWORD)
+    results["count_entries_ms"] = median_ms(vault.count_entries)
+
+    present = [(website, username) for website, username, *_ in rng.sample(rows, LOOKUPS // 2)]
+    absent = [(f"https://other{i}.example.com", "nobody@example.com") for i in range(LOOKUPS // 2)]
+    logins = present + absent
+    found = vault.existing_logins(logins)
+    if len(found) != len(present):
+        raise SystemExit(f"existing_logins found {len(found)} of {len(present)}")
+    results[f"existing_logins_{LOOKUPS}_ms"] = median_ms(lambda: vault.existing_logins(logins))
+    vault.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=DEFAULT_ENTRIES, help="entries in the vault")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        metrics = bench(Path(tmp), args.entries)
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "entries": args.entries,
+        },
+        "results": metrics,
+    }
+    for metric, value in metrics.items():
+        print(f"{metric:<30}{value:>16.3f}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
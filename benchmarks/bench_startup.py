@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Measure application start-up time to the unlock dialog and the first frame.
+
+Each run starts the app in a fresh interpreter on the offscreen platform.
+Cold runs get an empty QML disk cache, warm runs reuse one primed by an
+earlier start. Times are milliseconds from spawning the process.
+
+    python benchmarks/bench_startup.py --runs 5 [--json results.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+TRACE_ENV = "PASSWORD_MANAGER_STARTUP_TRACE"
+MILESTONES = ("main", "imports", "unlock_dialog", "first_frame")
+
+
+def start_once(cache_dir: str) -> dict:
+    """Start the app once and return milestone offsets in milliseconds."""
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    env["XDG_CACHE_HOME"] = cache_dir
+    env[TRACE_ENV] = "1"
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+
+    started = time.time()
+    result = subprocess.run(
+        [sys.executable, "-m", "password_manager"],
+        env=env, capture_output=True, text=True, timeout=60,
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith("{"):
+            trace = json.loads(line)
+            return {name: (trace[name] - started) * 1000 for name in MILESTONES}
+    raise RuntimeError(f"no startup trace (exit code {result.returncode}):\n{result.stderr}")
+
+
+def summarize(samples: list) -> dict:
+    return {
+        name: {
+            "median_ms": round(statistics.median(s[name] for s in samples), 1),
+            "min_ms": round(min(s[name] for s in samples), 1),
+        }
+        for name in MILESTONES
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="runs per scenario")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    cold = []
+    for _ in range(args.runs):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cold.append(start_once(cache_dir))
+
+    warm = []
+    with tempfile.TemporaryDirectory() as cache_dir:
+        start_once(cache_dir)
+        for _ in range(args.runs):
+            warm.append(start_once(cache_dir))
+
+    results = {"runs": args.runs, "cold": summarize(cold), "warm": summarize(warm)}
+
+    print(f"{'milestone':<16}{'cold median':>14}{'warm median':>14}")
+    for name in MILESTONES:
+        print(f"{name:<16}{results['cold'][name]['median_ms']:>11.1f} ms"
+              f"{results['warm'][name]['median_ms']:>11.1f} ms")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
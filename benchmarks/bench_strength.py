@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Benchmark password strength estimation, live and across a whole vault.
+
+Times loading the word lists, scoring every prefix of typical passwords as
+they would be typed, and scoring a vault in the background batches the
+audit uses:
+
+    python benchmarks/bench_strength.py --entries 1000,10000 [--json results.json]
+
+Runs headless; no display or QGuiApplication is needed.
+"""
+import argparse
+import json
+import platform
+import random
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from password_manager.core import strength  # noqa: E402
+from password_manager.core.cipher import CipherSettings  # noqa: E402
+from password_manager.core.vault import VaultManager  # noqa: E402
+
+DEFAULT_ENTRIES = (1000, 10000)
+TYPED_PASSWORDS = (
+    "Password1!",
+    "correct horse battery staple",
+    "qwertyuiop123",
+    "Tr0ub4dor&3",
+    "michael1987",
+)
+# Share of vault entries reusing a password, as the audit deduplicates them
+REUSE_RATIO = 0.2
+
+
+def random_password(rng: random.Random) -> str:
+    alphabet = string.ascii_letters + string.digits + "!@#$%^&*"
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(10, 20)))
+
+
+def bench_typing() -> dict:
+    results = {}
+    start = time.perf_counter()
+    strength.estimate_strength("warm up")
+    results["load_wordlists_ms"] = (time.perf_counter() - start) * 1000
+    timings = []
+    for password in TYPED_PASSWORDS:
+        for end in range(1, len(password) + 1):
+            start = time.perf_counter()
+            strength.estimate_strength(password[:end])
+            timings.append(time.perf_counter() - start)
+    timings.sort()
+    results["keystroke_median_ms"] = timings[len(timings) // 2] * 1000
+    results["keystroke_p99_ms"] = timings[int(len(timings) * 0.99)] * 1000
+    results["keystroke_max_ms"] = timings[-1] * 1000
+    return results
+
+
+def bench_vault(workdir: Path, count: int) -> dict:
+    rng = random.Random(count)
+    shared = [random_password(rng) for _ in range(max(int(count * REUSE_RATIO) // 5, 1))]
+    vault = VaultManager()
+    vault.create(workdir / f"strength-{count}.vault", "Bench", "Bench-Master-1!", CipherSettings())
+    vault.add_passwords([
+        (f"https://site{i}.example.com", f"user{i}",
+         rng.choice(shared) if rng.random() < REUSE_RATIO else random_password(rng), "", 0)
+        for i in range(count)
+    ])
+    start = time.perf_counter()
+    scored = vault.score_passwords()
+    elapsed = time.perf_counter() - start
+    assert scored == count and vault.audit().unscored == 0
+    vault.close()
+    return {
+        "score_vault_s": elapsed,
+        "entries_per_s": count / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", default=",".join(map(str, DEFAULT_ENTRIES)),
+                        help="comma separated vault sizes")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": {"typing": bench_typing()},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in map(int, args.entries.split(",")):
+            results["results"][str(count)] = bench_vault(Path(tmp), count)
+
+    for name, metrics in results["results"].items():
+        print(name)
+        for metric, value in metrics.items():
+            print(f"  {metric:<30}{value:>16.3f}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""Benchmark the vault core on synthetic vaults of realistic sizes.
+
+For every size, with and without TOTP keys, a vault is generated and the
+main VaultManager operations, exports and TOTP generation are timed.
+Results are written as JSON so runs from different commits can be compared:
+
+    python benchmarks/bench_vault.py --json before.json
+    python benchmarks/bench_vault.py --json after.json --compare before.json
+
+Runs headless; no display or QGuiApplication is needed.
+"""
+import argparse
+import base64
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from password_manager.core.cipher import CipherSettings  # noqa: E402
+from password_manager.core.export import export_passwords  # noqa: E402
+from password_manager.core.importer import import_passwords  # noqa: E402
+from password_manager.core.vault import VaultManager  # noqa: E402
+from password_manager.core.totp import generate_totp  # noqa: E402
+
+MASTER_PASSWORD = "Bench-Master-1!"
+NEW_MASTER_PASSWORD = "Bench-Master-2!"
+DEFAULT_SIZES = (1000, 10000, 100000)
+# Edits per operation; each one is a synchronous save, like a user edit
+DEFAULT_OPS = 200
+TOTP_CODES = 10000
+
+
+def synthetic_entries(count: int, with_totp: bool, seed: int = 0) -> list:
+    """Return (website, username, password, totp_key) rows."""
+    rng = random.Random(seed)
+    words = ["mail", "bank", "shop", "cloud", "news", "chat", "games", "travel", "photo", "code"]
+    entries = []
+    for i in range(count):
+        website = f"https://{rng.choice(words)}{i}.example.com"
+        username = f"user{rng.randrange(1_000_000)}@example.com"
+        password = base64.b64encode(rng.randbytes(18)).decode()
+        totp_key = base64.b32encode(rng.randbytes(10)).decode() if with_totp else ""
+        entries.append((website, username, password, totp_key))
+    return entries
+
+
+def populate(vault: VaultManager, entries: list):
+    # One transaction instead of a save per add_password(), which would make
+    # generating the large vaults take longer than the benchmark itself
+    vault.add_passwords([entry + (0,) for entry in entries])
+
+
+def timed(fn, *args, repeat: int = 1) -> float:
+    """Return the best wall time of fn(*args) over ``repeat`` calls, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+def per_op(fn, items) -> float:
+    """Return the median time per call of fn(item) in milliseconds."""
+    samples = []
+    for item in items:
+        start = time.perf_counter()
+        fn(item)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def bench_vault(workdir: Path, count: int, with_totp: bool, ops: int, repeat: int) -> dict:
+    results = {}
+    path = workdir / f"bench-{count}-{'totp' if with_totp else 'plain'}.vault"
+    entries = synthetic_entries(count, with_totp)
+
+    vault = VaultManager()
+    # Fixed SQLCipher defaults rather than a calibrated KDF, so results are
+    # comparable between machines
+    results["create_ms"] = timed(vault.create, path, "Bench", MASTER_PASSWORD, CipherSettings())
+    populate(vault, entries)
+    results["close_ms"] = timed(vault.close)
+    results["vault_bytes"] = path.stat().st_size
+
+    open_samples = []
+    for i in range(repeat):
+        if i:
+            vault.close()
+        vault = VaultManager()
+        open_samples.append(timed(vault.open, path, MASTER_PASSWORD))
+    results["open_ms"] = min(open_samples)
+    # Re-unlocking reuses the derived key, so compare it with open_ms
+    results["lock_ms"] = timed(vault.lock)
+    results["unlock_ms"] = timed(vault.unlock, MASTER_PASSWORD)
+    results["get_all_passwords_ms"] = timed(vault.get_all_passwords, repeat=repeat)
+
+    ids = [row[0] for row in vault.get_entry_summaries(limit=ops)]
+    new_rows = synthetic_entries(ops, with_totp, seed=1)
+    results["add_password_ms_per_op"] = per_op(lambda row: vault.add_password(*row), new_rows)
+    results["update_password_ms_per_op"] = per_op(
+        lambda pair: vault.update_password(pair[0], *pair[1]), list(zip(ids, new_rows))
+    )
+    results["toggle_favorite_ms_per_op"] = per_op(vault.toggle_favorite, ids)
+    results["delete_password_ms_per_op"] = per_op(vault.delete_password, ids)
+
+    results["export_csv_ms"] = timed(export_passwords, vault, workdir / "export.csv", "csv", repeat=repeat)
+    results["export_json_ms"] = timed(export_passwords, vault, workdir / "export.json", "json", repeat=repeat)
+
+    # Importing the export into an empty vault: one transaction and one save
+    target = VaultManager()
+    target.create(workdir / "import.vault", "Import", MASTER_PASSWORD, CipherSettings())
+    results["import_csv_ms"] = timed(import_passwords, target, workdir / "export.csv")
+    target.close()
+
+    if with_totp:
+        keys = [entry[3] for entry in entries[:TOTP_CODES]]
+        elapsed = timed(lambda: [generate_totp(key) for key in keys], repeat=repeat) / 1000
+        results["generate_totp_per_s"] = len(keys) / elapsed
+
+    results["change_master_password_ms"] = timed(
+        vault.change_master_password, MASTER_PASSWORD, NEW_MASTER_PASSWORD
+    )
+    vault.close()
+    return {name: round(value, 3) for name, value in results.items()}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=SRC_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def compare(results: dict, baseline: dict, threshold: float):
+    """Print metrics that changed by more than ``threshold`` (a fraction) against a baseline."""
+    print(f"\nCompared with {baseline['meta'].get('commit') or 'baseline'}:")
+    for case, metrics in results["results"].items():
+        old_metrics = baseline["results"].get(case, {})
+        for name, value in metrics.items():
+            old = old_metrics.get(name)
+            if not old or name == "vault_bytes":
+                continue
+            ratio = value / old
+            # Throughput is better when higher, everything else when lower
+            slower = ratio < 1 - threshold if name.endswith("_per_s") else ratio > 1 + threshold
+            faster = ratio > 1 + threshold if name.endswith("_per_s") else ratio < 1 - threshold
+            if slower or faster:
+                label = "REGRESSION" if slower else "improved"
+                print(f"  {case:<14}{name:<30}{old:>12.3f} -> {value:<12.3f}{label}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma separated entry counts")
+    parser.add_argument("--ops", type=int, default=DEFAULT_OPS, help="edits per edit benchmark")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="runs of each read-only benchmark; the best is kept")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="baseline JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative change reported by --compare")
+    args = parser.parse_args()
+
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "ops": args.ops,
+            "repeat": args.repeat,
+        },
+        "results": {},
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in map(int, args.sizes.split(",")):
+            for with_totp in (False, True):
+                case = f"{count}/{'totp' if with_totp else 'plain'}"
+                metrics = bench_vault(Path(tmp), count, with_totp, args.ops, args.repeat)
+                results["results"][case] = metrics
+                print(case)
+                for name, value in metrics.items():
+                    print(f"  {name:<30}{value:>14.3f}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+    if args.compare:
+        compare(results, json.loads(Path(args.compare).read_text()), args.threshold)
+
+
+if __name__ == "__main__":
+    main()
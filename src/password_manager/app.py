@@ -1,12 +1,13 @@
+import json
 import os
 import sys
+import time
 from pathlib import Path
 
-from PyQt6.QtGui import QGuiApplication, QFontDatabase
-from PyQt6.QtQml import QQmlApplicationEngine
 
-from password_manager.controllers.vault_controller import VaultController
-from password_manager.controllers.password_controller import PasswordController
+# When set, main() prints startup milestones (epoch seconds) as one JSON line
+# and quits after the first frame. Used by benchmarks/bench_startup.py.
+STARTUP_TRACE_ENV = "PASSWORD_MANAGER_STARTUP_TRACE"
 
 
 def get_resource_path(relative_path: str) -> Path:
@@ -21,8 +22,24 @@ def get_resource_path(relative_path: str) -> Path:
 
 
 def main():
+    trace = {"main": time.time()} if os.environ.get(STARTUP_TRACE_ENV) else None
+
+    # Imported here so importing this module doesn't pull in Qt and the vault stack
+    from PyQt6.QtGui import QGuiApplication, QFontDatabase
+    from PyQt6.QtQml import QQmlApplicationEngine
+
+    from password_manager.controllers.vault_controller import VaultController
+    from password_manager.controllers.password_controller import PasswordController
+    from password_manager.controllers.generator_controller import GeneratorController
+    from password_manager.controllers.diagnostics_controller import DiagnosticsController
+    from password_manager.core.metrics import env_dump_path
+
+    if trace is not None:
+        trace["imports"] = time.time()
+
     os.environ.setdefault("QT_QUICK_CONTROLS_STYLE", "Material")
     app = QGuiApplication(sys.argv)
+    # Also names the QML disk cache directory, so compiled QML is reused across runs
     app.setApplicationName("Password Manager")
 
     # Load Material Icons font
@@ -32,10 +49,14 @@ def main():
     # Create controllers with app as parent to control lifetime
     password_controller = PasswordController(app)
     vault_controller = VaultController(password_controller, app)
+    generator_controller = GeneratorController(app)
+    diagnostics_controller = DiagnosticsController(vault_controller, app)
 
     engine = QQmlApplicationEngine()
     engine.rootContext().setContextProperty("vaultController", vault_controller)
     engine.rootContext().setContextProperty("passwordController", password_controller)
+    engine.rootContext().setContextProperty("generatorController", generator_controller)
+    engine.rootContext().setContextProperty("diagnosticsController", diagnostics_controller)
 
     # Load main QML file
     qml_file = get_resource_path("qml/Main.qml")
@@ -44,6 +65,29 @@ def main():
     if not engine.rootObjects():
         sys.exit(-1)
 
+    if trace is not None:
+        # The unlock view is loaded synchronously with Main.qml
+        trace["unlock_dialog"] = time.time()
+        window = engine.rootObjects()[0]
+
+        def on_first_frame():
+            window.frameSwapped.disconnect(on_first_frame)
+            trace["first_frame"] = time.time()
+            print(json.dumps(trace), flush=True)
+            app.quit()
+
+        window.frameSwapped.connect(on_first_frame)
+
+    # Input anywhere in the window postpones the idle auto-lock
+    engine.rootObjects()[0].installEventFilter(vault_controller)
+
+    # Flush pending background saves even if the window never saw onClosing
+    app.aboutToQuit.connect(vault_controller.shutdown)
+
+    metrics_path = env_dump_path()
+    if metrics_path:
+        app.aboutToQuit.connect(lambda: diagnostics_controller.dumpJson(str(metrics_path)))
+
     exit_code = app.exec()
 
     # Cleanup before exit
@@ -0,0 +1,262 @@
+"""Headless command-line access to a vault.
+
+    password-manager-cli --vault PATH list [--favorites]
+    password-manager-cli --vault PATH search QUERY
+    password-manager-cli --vault PATH get ENTRY [--field password]
+    password-manager-cli --vault PATH totp ENTRY
+    password-manager-cli --vault PATH add WEBSITE USERNAME [--password-stdin | --generate 20]
+    password-manager-cli --vault PATH export FILE [--format csv]
+    password-manager-cli --vault PATH import FILE [--dry-run]
+
+ENTRY is an entry id, or a search that matches exactly one entry. The
+vault and master password may also come from PASSWORD_MANAGER_VAULT and
+PASSWORD_MANAGER_PASSWORD; otherwise the password is prompted for.
+``--json`` prints machine-readable output.
+
+Only the standard library is imported up front, and the vault stack once
+a command needs it, so the CLI starts quickly and never loads Qt.
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+VAULT_ENV = "PASSWORD_MANAGER_VAULT"
+PASSWORD_ENV = "PASSWORD_MANAGER_PASSWORD"
+SEARCH_LIMIT = 50
+ENTRY_FIELDS = ("password", "username", "website", "totp", "all")
+
+
+class CliError(Exception):
+    """A failed command; its message is printed and the exit code is 1."""
+
+
+def _print(args, data, text: str):
+    if args.json:
+        json.dump(data, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    elif text:
+        print(text)
+
+
+def _read_secret(prompt: str) -> str:
+    import getpass
+    return getpass.getpass(prompt)
+
+
+def _open_vault(args):
+    from password_manager.core.vault import VaultManager
+
+    path = args.vault or os.environ.get(VAULT_ENV)
+    if not path:
+        raise CliError(f"no vault given; use --vault or set {VAULT_ENV}")
+    path = Path(path)
+    if not VaultManager.exists(path):
+        raise CliError(f"not a vault: {path}")
+    password = os.environ.get(PASSWORD_ENV)
+    if password is None:
+        password = _read_secret(f"Master password for {path.name}: ")
+    vault = VaultManager()
+    if not vault.open(path, password):
+        raise CliError("wrong master password, or the vault could not be read")
+    return vault
+
+
+def _summary(row) -> dict:
+    entry_id, website, username, has_totp, favorite = row
+    return {"id": entry_id, "website": website, "username": username,
+            "has_totp": bool(has_totp), "favorite": bool(favorite)}
+
+
+def _summaries_text(entries: list) -> str:
+    return "\n".join(
+        f"{e['id']}\t{e['website']}\t{e['username']}" + ("\t*" if e.get("favorite") else "")
+        for e in entries
+    )
+
+
+def _find_entry(vault, entry: str) -> int:
+    """Resolve an id, or a search matching exactly one entry, to an entry id."""
+    if entry.isdigit() and vault.get_secret(int(entry)) is not None:
+        return int(entry)
+    ids = vault.search(entry, SEARCH_LIMIT)
+    if len(ids) == 1:
+        return ids[0]
+    if not ids:
+        raise CliError(f"no entry matches {entry!r}")
+    logins = vault.get_logins(ids)
+    matches = ", ".join(f"{i} ({logins[i][0]})" for i in ids if i in logins)
+    raise CliError(f"{entry!r} matches {len(ids)} entries: {matches}")
+
+
+def cmd_list(args, vault):
+    entries = [_summary(row) for row in vault.get_entry_summaries()]
+    if args.favorites:
+        entries = [e for e in entries if e["favorite"]]
+    _print(args, entries, _summaries_text(entries))
+
+
+def cmd_search(args, vault):
+    ids = vault.search(args.query, args.limit)
+    logins = vault.get_logins(ids)
+    entries = [{"id": i, "website": logins[i][0], "username": logins[i][1]} for i in ids if i in logins]
+    _print(args, entries, _summaries_text(entries))
+
+
+def cmd_get(args, vault):
+    from password_manager.core.totp import generate_totp
+
+    entry_id = _find_entry(vault, args.entry)
+    password, totp_key = vault.get_secret(entry_id)
+    website, username = vault.get_logins([entry_id])[entry_id]
+    entry = {"id": entry_id, "website": website, "username": username,
+             "password": password, "totp": generate_totp(totp_key)}
+    if args.field == "all":
+        text = "\n".join(f"{name}: {value}" for name, value in entry.items() if value != "")
+        _print(args, entry, text)
+    else:
+        _print(args, {args.field: entry[args.field]}, entry[args.field])
+
+
+def cmd_totp(args, vault):
+    import time
+    from password_manager.core.totp import compute_totp, parse_totp_key
+
+    entry_id = _find_entry(vault, args.entry)
+    totp_key = vault.get_secret(entry_id)[1]
+    if not totp_key:
+        raise CliError(f"entry {entry_id} has no TOTP key")
+    try:
+        key = parse_totp_key(totp_key)
+    except (ValueError, TypeError) as e:
+        raise CliError(f"entry {entry_id} has an invalid TOTP key: {e}")
+    now = time.time()
+    code = compute_totp(key, now)
+    remaining = key.period - int(now) % key.period
+    _print(args, {"id": entry_id, "code": code, "remaining": remaining, "period": key.period}, code)
+
+
+def cmd_add(args, vault):
+    from password_manager.core.validators import validate_url, validate_username, validate_totp_key
+
+    if not validate_url(args.website):
+        raise CliError("enter a valid URL (e.g., example.com)")
+    if not validate_username(args.username):
+        raise CliError("username cannot be empty")
+    if args.totp and not validate_totp_key(args.totp):
+        raise CliError("invalid TOTP key (base32 A-Z, 2-7 or otpauth:// URI)")
+
+    if args.generate is not None:
+        if args.generate <= 0:
+            raise CliError("--generate needs a length above 0")
+        from password_manager.core.generator import generate_password
+        password = generate_password(args.generate)
+    elif args.password_stdin:
+        password = sys.stdin.readline().rstrip("\r\n")
+    else:
+        password = _read_secret("Entry password: ")
+    if not password.strip():
+        raise CliError("password cannot be empty")
+
+    entry_id = vault.add_password(args.website, args.username, password, args.totp or "")
+    data = {"id": entry_id}
+    if args.generate is not None:
+        data["password"] = password
+    _print(args, data, password if args.generate is not None else str(entry_id))
+
+
+def cmd_export(args, vault):
+    from password_manager.core.export import EXPORT_FORMATS, export_passwords
+
+    path = Path(args.file)
+    fmt = args.format or path.suffix.lstrip(".").lower()
+    if fmt not in EXPORT_FORMATS:
+        raise CliError(f"cannot tell the export format from {path.name}; use --format")
+    export_passwords(vault, path, fmt)
+    count = vault.count_entries()[0]
+    _print(args, {"file": str(path), "format": fmt, "entries": count}, f"Exported {count} entries to {path}")
+
+
+def cmd_import(args, vault):
+    from password_manager.core.importer import import_passwords
+
+    result = import_passwords(vault, Path(args.file), dry_run=args.dry_run)
+    verb = "Would import" if args.dry_run else "Imported"
+    text = (f"{verb} {result.new} of {result.total} entries from {result.source} "
+            f"({result.duplicates} duplicates, {result.invalid} invalid)")
+    text = "\n".join([text] + result.errors)
+    _print(args, result._asdict(), text)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="password-manager-cli", description="Read and edit a vault from the command line."
+    )
+    parser.add_argument("--vault", help=f"vault file (default: ${VAULT_ENV})")
+    parser.add_argument("--json", action="store_true", help="print JSON")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="COMMAND")
+
+    command = commands.add_parser("list", help="list entries")
+    command.add_argument("--favorites", action="store_true", help="only favorites")
+    command.set_defaults(run=cmd_list)
+
+    command = commands.add_parser("search", help="search websites and usernames")
+    command.add_argument("query")
+    command.add_argument("--limit", type=int, default=SEARCH_LIMIT)
+    command.set_defaults(run=cmd_search)
+
+    command = commands.add_parser("get", help="print a field of an entry")
+    command.add_argument("entry", help="entry id or a search matching one entry")
+    command.add_argument("--field", choices=ENTRY_FIELDS, default="password")
+    command.set_defaults(run=cmd_get)
+
+    command = commands.add_parser("totp", help="print the current TOTP code of an entry")
+    command.add_argument("entry", help="entry id or a search matching one entry")
+    command.set_defaults(run=cmd_totp)
+
+    command = commands.add_parser("add", help="add an entry")
+    command.add_argument("website")
+    command.add_argument("username")
+    command.add_argument("--totp", help="TOTP key (base32 or otpauth:// URI)")
+    source = command.add_mutually_exclusive_group()
+    source.add_argument("--password-stdin", action="store_true", help="read the password from stdin")
+    source.add_argument("--generate", type=int, metavar="LENGTH", help="generate a password")
+    command.set_defaults(run=cmd_add)
+
+    command = commands.add_parser("export", help="export all entries to a CSV or JSON file")
+    command.add_argument("file")
+    command.add_argument("--format", choices=("csv", "json"), help="default: from the file extension")
+    command.set_defaults(run=cmd_export)
+
+    command = commands.add_parser("import", help="import entries from a CSV or JSON export")
+    command.add_argument("file")
+    command.add_argument("--dry-run", action="store_true", help="only report what would be imported")
+    command.set_defaults(run=cmd_import)
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    vault = None
+    try:
+        vault = _open_vault(args)
+        args.run(args, vault)
+    except (CliError, OSError, ValueError) as e:
+        print(f"{parser.prog}: error: {e}", file=sys.stderr)
+        return 1
+    except EOFError:
+        # getpass and stdin reads without a terminal or with stdin closed
+        print(f"{parser.prog}: error: no input to read the password from", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        if vault is not None:
+            vault.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
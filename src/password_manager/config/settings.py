@@ -5,6 +5,9 @@ from PyQt6.QtCore import QSettings
 
 class SettingsManager:
     MAX_RECENT_VAULTS = 5
+    DEFAULT_SAVE_DELAY_MS = 500
+    DEFAULT_AUTO_LOCK_MINUTES = 15
+    DEFAULT_UNLOCK_GRACE_SECONDS = 300
 
     def __init__(self):
         if sys.platform == "win32":
@@ -62,3 +65,38 @@ class SettingsManager:
         """Clears all recent vaults."""
         self._settings.beginWriteArray("recentVaults")
         self._settings.endArray()
+
+    def get_save_delay_ms(self) -> int:
+        """Returns the debounce window for background vault saves."""
+        return int(self._settings.value("saveDelayMs", self.DEFAULT_SAVE_DELAY_MS))
+
+    def set_save_delay_ms(self, delay_ms: int):
+        self._settings.setValue("saveDelayMs", int(delay_ms))
+
+    def get_auto_lock_minutes(self) -> int:
+        """Returns the idle time before an open vault locks itself, 0 to never lock."""
+        return int(self._settings.value("autoLockMinutes", self.DEFAULT_AUTO_LOCK_MINUTES))
+
+    def set_auto_lock_minutes(self, minutes: int):
+        self._settings.setValue("autoLockMinutes", int(minutes))
+
+    def get_unlock_grace_seconds(self) -> int:
+        """Returns how long a locked vault keeps its key for a quick unlock, 0 to not keep it."""
+        return int(self._settings.value("unlockGraceSeconds", self.DEFAULT_UNLOCK_GRACE_SECONDS))
+
+    def set_unlock_grace_seconds(self, seconds: int):
+        self._settings.setValue("unlockGraceSeconds", int(seconds))
+
+    def get_breach_corpus_path(self) -> str:
+        """Returns the breached password corpus to check against, "" if none."""
+        return str(self._settings.value("breachCorpusPath", ""))
+
+    def set_breach_corpus_path(self, path: str):
+        self._settings.setValue("breachCorpusPath", path)
+
+    def get_metrics_enabled(self) -> bool:
+        """Returns whether diagnostics metrics are recorded from startup."""
+        return str(self._settings.value("metricsEnabled", "false")).lower() == "true"
+
+    def set_metrics_enabled(self, enabled: bool):
+        self._settings.setValue("metricsEnabled", bool(enabled))
@@ -1,2 +1,4 @@
 from password_manager.controllers.vault_controller import VaultController
 from password_manager.controllers.password_controller import PasswordController
+from password_manager.controllers.generator_controller import GeneratorController
+from password_manager.controllers.diagnostics_controller import DiagnosticsController
@@ -0,0 +1,99 @@
+import time
+from pathlib import Path
+
+from PyQt6.QtCore import QObject, QStandardPaths, QTimer, pyqtSignal, pyqtSlot, pyqtProperty
+
+from password_manager.config.settings import SettingsManager
+from password_manager.core.metrics import ProfileCapture, metrics
+
+# Longest profile capture the panel starts; a forgotten capture stops by itself
+MAX_CAPTURE_SECONDS = 300
+
+
+class DiagnosticsController(QObject):
+    """Backs the hidden diagnostics panel: metrics recording, JSON dumps and profile captures."""
+    enabledChanged = pyqtSignal()
+    capturingChanged = pyqtSignal()
+    captureFinished = pyqtSignal(list)  # paths of the written files
+
+    def __init__(self, vault_controller=None, parent=None):
+        super().__init__(parent)
+        self._settings = SettingsManager()
+        self._vault_controller = vault_controller
+        if self._settings.get_metrics_enabled():
+            metrics.enabled = True
+        self._capture = ProfileCapture(self.outputDirectory)
+        self._capture_timer = QTimer(self)
+        self._capture_timer.setSingleShot(True)
+        self._capture_timer.timeout.connect(self.stopCapture)
+
+    @pyqtProperty(bool, notify=enabledChanged)
+    def enabled(self):
+        return metrics.enabled
+
+    @enabled.setter
+    def enabled(self, value: bool):
+        if value != metrics.enabled:
+            metrics.enabled = value
+            self._settings.set_metrics_enabled(value)
+            self.enabledChanged.emit()
+
+    @pyqtProperty(bool, notify=capturingChanged)
+    def capturing(self):
+        return self._capture.active
+
+    @pyqtProperty(str, constant=True)
+    def outputDirectory(self):
+        base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppLocalDataLocation)
+        return str(Path(base) / "diagnostics")
+
+    @pyqtSlot(result='QVariantMap')
+    def snapshot(self) -> dict:
+        """Counters and histogram summaries as lists of rows for the panel."""
+        data = metrics.snapshot()
+        return {
+            "counters": [{"name": name, "value": value} for name, value in data["counters"].items()],
+            "histograms": [
+                {"name": name, "count": h["count"], "mean": h["mean"], "p50": h["p50"],
+                 "p95": h["p95"], "max": h["max"]}
+                for name, h in data["histograms"].items()
+            ],
+            "seconds": round(data["now"] - data["since"]),
+        }
+
+    @pyqtSlot()
+    def reset(self):
+        metrics.reset()
+
+    @pyqtSlot(str, result=str)
+    def dumpJson(self, path: str = "") -> str:
+        """Write all metrics and recent job timings as JSON; returns the path, or "" on failure."""
+        target = Path(path) if path else Path(self.outputDirectory) / time.strftime("metrics-%Y%m%d-%H%M%S.json")
+        extra = {"jobs": self._vault_controller.jobTimings} if self._vault_controller else None
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            metrics.dump(target, extra)
+        except OSError:
+            return ""
+        return str(target)
+
+    @pyqtSlot(int)
+    def startCapture(self, seconds: int):
+        """Profile the GUI thread and trace allocations for ``seconds``."""
+        if self._capture.active:
+            return
+        self._capture.start()
+        self._capture_timer.start(max(1, min(seconds, MAX_CAPTURE_SECONDS)) * 1000)
+        self.capturingChanged.emit()
+
+    @pyqtSlot()
+    def stopCapture(self):
+        if not self._capture.active:
+            return
+        self._capture_timer.stop()
+        try:
+            paths = [str(path) for path in self._capture.stop()]
+        except OSError:
+            paths = []
+        self.capturingChanged.emit()
+        self.captureFinished.emit(paths)
@@ -0,0 +1,48 @@
+from PyQt6.QtCore import QObject, pyqtSlot
+
+from password_manager.core.generator import (
+    generate_batch, generate_passphrase, generate_password, passphrase_entropy, password_entropy
+)
+from password_manager.core.metrics import timed_slots
+
+
+def _classes(uppercase: bool, lowercase: bool, digits: bool, symbols: bool) -> tuple:
+    selected = (("uppercase", uppercase), ("lowercase", lowercase), ("digits", digits), ("symbols", symbols))
+    return tuple(name for name, enabled in selected if enabled)
+
+
+@timed_slots
+class GeneratorController(QObject):
+    """Generates passwords and passphrases for QML from the OS CSPRNG."""
+
+    @pyqtSlot(int, bool, bool, bool, bool, result=str)
+    def generatePassword(self, length: int, uppercase: bool, lowercase: bool, digits: bool, symbols: bool) -> str:
+        return generate_password(length, _classes(uppercase, lowercase, digits, symbols))
+
+    @pyqtSlot(int, bool, bool, bool, bool, result=float)
+    def passwordEntropy(self, length: int, uppercase: bool, lowercase: bool, digits: bool, symbols: bool) -> float:
+        return password_entropy(length, _classes(uppercase, lowercase, digits, symbols))
+
+    @pyqtSlot(int, str, bool, bool, result=str)
+    def generatePassphrase(self, words: int, separator: str, capitalize: bool, include_number: bool) -> str:
+        return generate_passphrase(words, separator, capitalize, include_number)
+
+    @pyqtSlot(int, bool, result=float)
+    def passphraseEntropy(self, words: int, include_number: bool) -> float:
+        return passphrase_entropy(words, include_number)
+
+    @pyqtSlot(int, 'QVariantMap', result=list)
+    def generateBatch(self, count: int, options: dict) -> list:
+        """Generate ``count`` candidates in one call, e.g. for rotating many entries.
+
+        ``options`` holds "passphrase" plus the arguments of generatePassword
+        ("length", "uppercase", "lowercase", "digits", "symbols") or of
+        generatePassphrase ("words", "separator", "capitalize", "includeNumber").
+        """
+        if options.get("passphrase"):
+            return generate_batch(
+                count, generate_passphrase, int(options.get("words", 5)), options.get("separator", "-"),
+                bool(options.get("capitalize")), bool(options.get("includeNumber"))
+            )
+        classes = _classes(*(bool(options.get(name, True)) for name in ("uppercase", "lowercase", "digits", "symbols")))
+        return generate_batch(count, generate_password, int(options.get("length", 16)), classes)
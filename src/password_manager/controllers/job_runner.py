@@ -0,0 +1,217 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from PyQt6.QtCore import QObject, Qt, QThreadPool, pyqtSignal
+
+from password_manager.core.metrics import metrics
+
+# Finished jobs kept for diagnostics
+JOB_HISTORY_SIZE = 50
+
+
+class Job(QObject):
+    """A long-running operation executed on a JobRunner's thread pool.
+
+    Subclasses implement execute(), which runs on a pool thread and returns
+    the result or raises an exception whose message is reported by failed.
+    Long jobs report progress with report_progress() and stop early when
+    cancel_event is set. Signals are delivered on the thread that created
+    the job, normally the GUI thread.
+
+    Exclusive jobs change the vault and run one at a time in submission
+    order; other jobs run alongside them.
+    """
+    name = "job"
+    exclusive = True
+
+    progress = pyqtSignal(int, int)  # done, total
+    succeeded = pyqtSignal(object)  # result
+    failed = pyqtSignal(str)  # error_message
+    cancelled = pyqtSignal()
+    finished = pyqtSignal()  # after any of the above
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.cancel_event = threading.Event()
+        self.status = "queued"
+        self.queued_at = time.perf_counter()
+        self.started_at = None
+        self.finished_at = None
+        self._done = threading.Event()
+
+    def execute(self):
+        raise NotImplementedError
+
+    def report_progress(self, done: int, total: int):
+        self.progress.emit(done, total)
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until the job has finished or, if still queued, was dropped."""
+        return self._done.wait(timeout)
+
+    @property
+    def wait_ms(self) -> float:
+        """Time spent in the queue."""
+        started = self.started_at or self.finished_at or time.perf_counter()
+        return (started - self.queued_at) * 1000
+
+    @property
+    def run_ms(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return ((self.finished_at or time.perf_counter()) - self.started_at) * 1000
+
+    def timings(self) -> dict:
+        return {
+            "name": self.name,
+            "status": self.status,
+            "waitMs": round(self.wait_ms, 1),
+            "runMs": round(self.run_ms, 1),
+        }
+
+    def _run(self):
+        # Runs on a pool thread
+        if self.cancel_event.is_set():
+            self._finish("cancelled")
+            self.cancelled.emit()
+        else:
+            self.started_at = time.perf_counter()
+            self.status = "running"
+            try:
+                result = self.execute()
+            except Exception as e:
+                self._finish("failed")
+                self.failed.emit(str(e))
+            else:
+                if self.cancel_event.is_set():
+                    self._finish("cancelled")
+                    self.cancelled.emit()
+                else:
+                    self._finish("succeeded")
+                    self.succeeded.emit(result)
+        self._done.set()
+        self.finished.emit()
+
+    def _finish(self, status: str):
+        self.finished_at = time.perf_counter()
+        self.status = status
+
+
+class JobRunner(QObject):
+    """Runs Jobs on a thread pool, queueing exclusive jobs behind each other."""
+    jobsChanged = pyqtSignal()
+
+    def __init__(self, parent=None, max_threads: int = 2):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+        self._queue = deque()
+        self._running_exclusive = None
+        self._active = set()
+        self._idle_callbacks = []
+        self.history = deque(maxlen=JOB_HISTORY_SIZE)
+
+    def submit(self, job: Job) -> Job:
+        job.queued_at = time.perf_counter()
+        self._active.add(job)
+        job.finished.connect(lambda: self._on_finished(job))
+        if job.exclusive:
+            self._queue.append(job)
+            self._start_next()
+        else:
+            self._pool.start(job._run)
+        self.jobsChanged.emit()
+        return job
+
+    def cancel_all(self):
+        for job in self._active:
+            job.cancel()
+
+    def stop(self, job: Job):
+        """Cancel a job and block until it has stopped.
+
+        An exclusive job still queued could only be started from this
+        thread's event loop, so it is taken out of the queue and finished
+        here instead of waited for.
+        """
+        job.cancel()
+        if job in self._queue:
+            self._queue.remove(job)
+            job._run()
+        job.wait()
+
+    def when_idle(self, callback):
+        """Cancel all jobs and call ``callback`` once the running ones have stopped.
+
+        Does not block: unless no job is running, ``callback`` is called from
+        this thread's event loop when the last one reports that it finished.
+        """
+        self.cancel_all()
+        while self._queue:
+            self._queue.popleft()._run()
+        if self._active:
+            self._idle_callbacks.append(callback)
+        else:
+            callback()
+
+    def wait(self):
+        """Cancel all jobs and block until the running ones have stopped."""
+        self.cancel_all()
+        # Queued exclusive jobs are started from this thread's event loop,
+        # so finish them here; being cancelled, they only report so
+        while self._queue:
+            job = self._queue.popleft()
+            job._run()
+        self._pool.waitForDone()
+
+    def _start_next(self):
+        if self._running_exclusive is None and self._queue:
+            self._running_exclusive = self._queue.popleft()
+            self._pool.start(self._running_exclusive._run)
+
+    def _on_finished(self, job: Job):
+        if job not in self._active:
+            return
+        self._active.discard(job)
+        self.history.append(job.timings())
+        metrics.observe(f"job.{job.name}", job.run_ms)
+        metrics.count(f"job.{job.name}.{job.status}")
+        if job is self._running_exclusive:
+            self._running_exclusive = None
+            self._start_next()
+        self.jobsChanged.emit()
+        if not self._active:
+            callbacks, self._idle_callbacks = self._idle_callbacks, []
+            for callback in callbacks:
+                callback()
+
+
+class FutureWatcher(QObject):
+    """Reports the outcome of a Future on the thread that created the watcher.
+
+    Used for requests to a vault's database thread (VaultManager.submit).
+    The watcher deletes itself once it has reported.
+    """
+    succeeded = pyqtSignal(object)  # result
+    failed = pyqtSignal(str)  # error_message
+    _done = pyqtSignal(object)
+
+    def __init__(self, future: Future, parent=None):
+        super().__init__(parent)
+        # Queued even when the future is already done, so callers can
+        # connect to the signals after creating the watcher
+        self._done.connect(self._report, Qt.ConnectionType.QueuedConnection)
+        future.add_done_callback(self._done.emit)
+
+    def _report(self, future: Future):
+        error = future.exception()
+        if error is None:
+            self.succeeded.emit(future.result())
+        else:
+            self.failed.emit(str(error) or type(error).__name__)
+        self.deleteLater()
@@ -1,48 +1,241 @@
-import csv
-import json
+from pathlib import Path
+
 from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot, pyqtProperty, QUrl
 from PyQt6.QtGui import QGuiApplication, QDesktopServices
 
+from password_manager.config.settings import SettingsManager
+from password_manager.core.audit import REPORT_LIST_LIMIT, STALE_DAYS
+from password_manager.core.breach import BreachCorpus, find_breached
+from password_manager.core.export import export_passwords
+from password_manager.core.importer import import_passwords
+from password_manager.core.metrics import timed_slots
+from password_manager.core.strength import estimate_strength
+from password_manager.core.totp import generate_totp
 from password_manager.core.vault import VaultManager
 from password_manager.models.password_model import PasswordListModel
+from password_manager.models.password_filter_model import PasswordFilterModel
 from password_manager.core.validators import validate_url, validate_username, validate_totp_key
-from password_manager.core.totp import generate_totp
+from password_manager.controllers.job_runner import FutureWatcher, Job, JobRunner
+
+
+# Vaults with at least this many entries are searched through the vault's
+# full-text index instead of the in-memory filter
+DB_SEARCH_MIN_ROWS = 20000
+DB_SEARCH_LIMIT = 1000
+
+
+class ExportJob(Job):
+    name = "export"
+    # Reads in batches, each a separate database request, so it can run beside other jobs
+    exclusive = False
+
+    def __init__(self, vault: VaultManager, file_path: str, fmt: str):
+        super().__init__()
+        self._vault = vault
+        self._file_path = Path(file_path)
+        self._format = fmt
+
+    def execute(self):
+        export_passwords(
+            self._vault, self._file_path, self._format,
+            progress=self.report_progress, cancel=self.cancel_event
+        )
+
+
+class ImportJob(Job):
+    name = "import"
+
+    def __init__(self, vault: VaultManager, file_path: str, dry_run: bool):
+        super().__init__()
+        self._vault = vault
+        self._file_path = Path(file_path)
+        self.dry_run = dry_run
+
+    def execute(self):
+        result = import_passwords(
+            self._vault, self._file_path, self.dry_run,
+            progress=self.report_progress, cancel=self.cancel_event
+        )
+        if result is None:
+            return None
+        summary = result._asdict()
+        summary["dryRun"] = self.dry_run
+        return summary
+
+
+class BreachCheckJob(Job):
+    name = "breach_check"
+    exclusive = False
+
+    def __init__(self, vault: VaultManager, corpus: BreachCorpus):
+        super().__init__()
+        self._vault = vault
+        self._corpus = corpus
+
+    def execute(self):
+        """Return the (entry id, times seen) pairs and the logins of those listed in the report."""
+        breached = find_breached(self._vault, self._corpus, progress=self.report_progress, cancel=self.cancel_event)
+        if breached is None:
+            return None
+        logins = self._vault.get_logins([entry_id for entry_id, _ in breached[:REPORT_LIST_LIMIT]])
+        return breached, logins
+
+
+class AuditJob(Job):
+    name = "audit"
+
+    def __init__(self, vault: VaultManager):
+        super().__init__()
+        self._vault = vault
 
+    def execute(self):
+        """Return the audit report and the logins of the entries it lists."""
+        if self._vault.score_passwords(progress=self.report_progress, cancel=self.cancel_event) is None:
+            return None
+        report = self._vault.audit()
+        return report, self._vault.get_logins(_audit_ids(report))
 
+
+def _audit_findings(report) -> tuple:
+    return (
+        ("reused", "Reused passwords", report.reused_count, report.reused),
+        ("weak", "Weak passwords", report.weak_count, report.weak),
+        ("withoutTotp", "Without two-factor code", report.without_totp_count, report.without_totp),
+        ("stale", f"Unchanged for over {STALE_DAYS} days", report.stale_count, report.stale),
+    )
+
+
+def _audit_ids(report) -> list:
+    """Ids of the entries listed in an audit report."""
+    return sorted({entry_id for finding in _audit_findings(report) for entry_id in finding[3]})
+
+
+@timed_slots
 class PasswordController(QObject):
     urlErrorChanged = pyqtSignal()
     usernameErrorChanged = pyqtSignal()
     passwordErrorChanged = pyqtSignal()
     totpErrorChanged = pyqtSignal()
+    exportingChanged = pyqtSignal()
+    exportProgress = pyqtSignal(int, int)  # done, total
+    exportFinished = pyqtSignal(bool, str)  # success, error_message ("" if cancelled)
+    importingChanged = pyqtSignal()
+    importProgress = pyqtSignal(int, int)  # done, total
+    importFinished = pyqtSignal(bool, str, 'QVariantMap')  # success, error_message, summary
+    breachCorpusChanged = pyqtSignal()
+    breachCheckingChanged = pyqtSignal()
+    breachCheckProgress = pyqtSignal(int, int)  # done, total
+    breachCheckFinished = pyqtSignal(bool, str, 'QVariantMap')  # success, error_message, result
+    auditingChanged = pyqtSignal()
+    auditProgress = pyqtSignal(int, int)  # done, total
+    auditFinished = pyqtSignal(bool, str, 'QVariantMap')  # success, error_message, report
+    auditReady = pyqtSignal('QVariantMap')  # report, see requestAudit()
+    entryLoaded = pyqtSignal(int, str, str, str, str)  # row, website, username, password, totp_key
+    writeFailed = pyqtSignal(str)  # error_message
+    readFailed = pyqtSignal(str)  # error_message
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self._vault: VaultManager = None
         self._password_model = PasswordListModel(self)
+        self._filter_model = PasswordFilterModel(self)
+        self._filter_model.setSourceModel(self._password_model)
         self._url_error = ""
         self._username_error = ""
         self._password_error = ""
         self._totp_error = ""
+        # Replaced by the vault controller's runner, so all vault work shares one queue
+        self._jobs = JobRunner(self)
+        self._export_job: ExportJob = None
+        self._import_job: ImportJob = None
+        self._breach_job: BreachCheckJob = None
+        self._audit_job: AuditJob = None
+        self._settings = SettingsManager()
+        self._breach_corpus: BreachCorpus = None
+        self._breach_corpus_error = ""
+        self._open_breach_corpus(self._settings.get_breach_corpus_path())
+
+    def set_job_runner(self, runner: JobRunner):
+        self._jobs = runner
 
     def set_vault(self, vault: VaultManager):
         """Set the vault manager and load entries."""
         self._vault = vault
+        self._password_model.set_secret_loader(self._load_secret)
+        self._filter_model.set_search_provider(self._search, DB_SEARCH_MIN_ROWS)
         self._load_entries()
 
     def clear(self):
         """Clear the password model when vault is closed."""
+        for job in (self._export_job, self._import_job, self._breach_job, self._audit_job):
+            if job is not None:
+                self._jobs.stop(job)
         self._vault = None
+        self._filter_model.set_search_provider(None)
+        self._password_model.set_secret_loader(None)
         self._password_model.load_entries([])
 
+    def _write(self, method, *args, on_done=None):
+        """Run a vault edit on its database thread without waiting for it.
+
+        The model is updated right away (or by ``on_done``, with the result);
+        if the edit fails, the model is reloaded from the vault.
+        """
+        vault = self._vault
+        watcher = FutureWatcher(vault.submit(method, *args), self)
+        if on_done is not None:
+            watcher.succeeded.connect(lambda result: vault is self._vault and on_done(result))
+        watcher.failed.connect(lambda error: self._on_write_failed(vault, error))
+
+    def _on_write_failed(self, vault: VaultManager, error: str):
+        if vault is self._vault and vault.is_open:
+            self._load_entries()
+        self.writeFailed.emit(error)
+
+    def _read(self, method, *args, on_done, on_failed=None):
+        """Run a vault read on its database thread and pass the result to ``on_done``.
+
+        Results arrive on this thread; those for a vault closed or replaced
+        since are dropped. Failures call ``on_failed`` and are reported by
+        readFailed.
+        """
+        vault = self._vault
+        watcher = FutureWatcher(vault.submit(method, *args), self)
+        watcher.succeeded.connect(lambda result: vault is self._vault and on_done(result))
+        watcher.failed.connect(lambda error: self._on_read_failed(vault, error, on_failed))
+
+    def _on_read_failed(self, vault: VaultManager, error: str, on_failed):
+        if vault is not self._vault:
+            return
+        if on_failed is not None:
+            on_failed()
+        self.readFailed.emit(error)
+
     def _load_entries(self):
         if self._vault:
-            entries = self._vault.get_all_passwords()
-            self._password_model.load_entries(entries)
+            self._read(
+                self._vault.count_entries,
+                on_done=lambda counts: self._password_model.load_pages(self._load_page, *counts)
+            )
+
+    def _load_page(self, after_id: int, limit: int, callback):
+        self._read(self._vault.get_entry_summaries, after_id, limit,
+                   on_done=callback, on_failed=lambda: callback(None))
+
+    def _load_secret(self, entry_id: int, callback):
+        self._read(self._vault.get_secret, entry_id, on_done=callback, on_failed=lambda: callback(None))
+
+    def _search(self, query: str, callback):
+        self._read(self._vault.search_summaries, query, DB_SEARCH_LIMIT, on_done=callback)
 
     @pyqtProperty(PasswordListModel, constant=True)
     def passwordModel(self):
         return self._password_model
 
+    @pyqtProperty(PasswordFilterModel, constant=True)
+    def filterModel(self):
+        return self._filter_model
+
     @pyqtProperty(str, notify=urlErrorChanged)
     def urlError(self):
         return self._url_error
@@ -85,7 +278,7 @@ class PasswordController(QObject):
         self.passwordErrorChanged.emit()
 
         if totp_key and not validate_totp_key(totp_key):
-            self._totp_error = "Invalid TOTP key (must be base32: A-Z, 2-7)"
+            self._totp_error = "Invalid TOTP key (base32 A-Z, 2-7 or otpauth:// URI)"
             valid = False
         else:
             self._totp_error = ""
@@ -101,8 +294,11 @@ class PasswordController(QObject):
         if not self._validate_entry(website, username, password, totp_key):
             return False
 
-        entry_id = self._vault.add_password(website, username, password, totp_key)
-        self._password_model.add_entry(entry_id, website, username, password, totp_key)
+        # The row appears once the database thread has assigned its id
+        self._write(
+            self._vault.add_password, website, username, password, totp_key,
+            on_done=lambda entry_id: self._password_model.add_entry(entry_id, website, username, password, totp_key)
+        )
         return True
 
     @pyqtSlot(int)
@@ -112,7 +308,7 @@ class PasswordController(QObject):
 
         entry_id = self._password_model.getEntryId(row)
         if entry_id >= 0:
-            self._vault.delete_password(entry_id)
+            self._write(self._vault.delete_password, entry_id)
             self._password_model.remove_entry(row)
 
     @pyqtSlot(int, str, str, str, str, result=bool)
@@ -125,7 +321,7 @@ class PasswordController(QObject):
 
         entry_id = self._password_model.getEntryId(row)
         if entry_id >= 0:
-            self._vault.update_password(entry_id, website, username, password, totp_key)
+            self._write(self._vault.update_password, entry_id, website, username, password, totp_key)
             self._password_model.update_entry(row, website, username, password, totp_key)
             return True
         return False
@@ -138,36 +334,41 @@ class PasswordController(QObject):
     def getUsername(self, row: int) -> str:
         return self._password_model.getUsername(row)
 
-    @pyqtSlot(int, result=str)
-    def getPassword(self, row: int) -> str:
-        return self._password_model.getPassword(row)
-
-    @pyqtSlot(int, result=str)
-    def getTotpKey(self, row: int) -> str:
-        return self._password_model.getTotpKey(row)
+    @pyqtSlot(int)
+    def loadEntry(self, row: int):
+        """Load an entry with its secrets for editing; reported by entryLoaded."""
+        entry_id = self._password_model.getEntryId(row)
+        if entry_id < 0:
+            return
+        website = self._password_model.getWebsite(row)
+        username = self._password_model.getUsername(row)
+        self._password_model.request_secret(
+            entry_id, lambda secret: self.entryLoaded.emit(row, website, username, secret[0], secret[1] or "")
+        )
 
     @pyqtSlot(int)
     def copyPassword(self, row: int):
-        password = self._password_model.getPassword(row)
-        if password:
-            clipboard = QGuiApplication.clipboard()
-            clipboard.setText(password)
+        entry_id = self._password_model.getEntryId(row)
+        if entry_id >= 0:
+            self._password_model.request_secret(entry_id, lambda secret: self._copy(secret[0], entry_id))
 
     @pyqtSlot(int)
     def copyUsername(self, row: int):
-        username = self._password_model.getUsername(row)
-        if username:
-            clipboard = QGuiApplication.clipboard()
-            clipboard.setText(username)
+        self._copy(self._password_model.getUsername(row), self._password_model.getEntryId(row))
 
     @pyqtSlot(int)
     def copyTotp(self, row: int):
-        totp_key = self._password_model.getTotpKey(row)
-        if totp_key:
-            code = generate_totp(totp_key)
-            if code:
-                clipboard = QGuiApplication.clipboard()
-                clipboard.setText(code)
+        entry_id = self._password_model.getEntryId(row)
+        if entry_id >= 0:
+            self._password_model.request_secret(
+                entry_id, lambda secret: secret[1] and self._copy(generate_totp(secret[1]), entry_id)
+            )
+
+    def _copy(self, text: str, entry_id: int):
+        if text:
+            clipboard = QGuiApplication.clipboard()
+            clipboard.setText(text)
+            self._record_use(entry_id)
 
     @pyqtSlot(str)
     def copyToClipboard(self, text: str):
@@ -177,10 +378,12 @@ class PasswordController(QObject):
 
     @pyqtSlot(int, result=str)
     def generateTotp(self, row: int) -> str:
-        totp_key = self._password_model.getTotpKey(row)
-        if totp_key:
-            return generate_totp(totp_key)
-        return ""
+        return self._password_model.getTotpCode(row)
+
+    @pyqtSlot()
+    def refreshTotpCodes(self):
+        """Called once per second; only entries whose period rolled over are recomputed."""
+        self._password_model.refresh_totp_codes()
 
     @pyqtSlot(int)
     def openWebsite(self, row: int):
@@ -189,6 +392,11 @@ class PasswordController(QObject):
             if not website.startswith("http://") and not website.startswith("https://"):
                 website = "https://" + website
             QDesktopServices.openUrl(QUrl(website))
+            self._record_use(self._password_model.getEntryId(row))
+
+    def _record_use(self, entry_id: int):
+        if self._vault and entry_id >= 0:
+            self._write(self._vault.record_use, entry_id)
 
     @pyqtSlot(int)
     def togglePasswordVisibility(self, row: int):
@@ -200,56 +408,222 @@ class PasswordController(QObject):
             return
         entry_id = self._password_model.getEntryId(row)
         if entry_id >= 0:
-            self._vault.toggle_favorite(entry_id)
+            self._write(self._vault.toggle_favorite, entry_id)
             self._password_model.toggleFavorite(row)
 
+    @pyqtSlot(str, result='QVariantMap')
+    def passwordStrength(self, password: str) -> dict:
+        """Estimate a password's strength as it is typed."""
+        strength = estimate_strength(password)
+        return {
+            "score": strength.score,
+            "bits": strength.bits,
+            "label": strength.label,
+            "warning": strength.warning,
+        }
+
+    @pyqtSlot()
+    def requestAudit(self):
+        """Read the password audit with the affected entries of each finding; reported by auditReady.
+
+        Entries whose strength is not scored yet are counted in "unscored";
+        runAudit() scores them in the background.
+        """
+        if not self._vault:
+            return
+        self._read(self._vault.audit, on_done=lambda report: self._read(
+            self._vault.get_logins, _audit_ids(report),
+            on_done=lambda logins: self.auditReady.emit(self._audit_result(report, logins))
+        ))
+
+    @staticmethod
+    def _audit_result(report, logins: dict) -> dict:
+        findings = _audit_findings(report)
+        return {
+            "total": report.total,
+            "unscored": report.unscored,
+            "reusedGroups": report.reused_groups,
+            "findings": [
+                {
+                    "key": key,
+                    "label": label,
+                    "count": count,
+                    "entries": [
+                        {"website": logins[i][0], "username": logins[i][1]} for i in ids if i in logins
+                    ],
+                }
+                for key, label, count, ids in findings
+            ],
+        }
+
+    @pyqtProperty(bool, notify=auditingChanged)
+    def auditing(self):
+        return self._audit_job is not None
+
+    @pyqtSlot(result=bool)
+    def runAudit(self) -> bool:
+        """Score unscored passwords on the job pool, then report the audit by auditFinished."""
+        if not self._vault or self._audit_job is not None:
+            return False
+        job = self._audit_job = AuditJob(self._vault)
+        job.progress.connect(self.auditProgress)
+        job.succeeded.connect(lambda result: self._on_audit_finished(True, "", result))
+        job.failed.connect(lambda error: self._on_audit_finished(False, f"Audit failed: {error}", None))
+        job.cancelled.connect(lambda: self._on_audit_finished(False, "", None))
+        self._jobs.submit(job)
+        self.auditingChanged.emit()
+        return True
+
+    def _on_audit_finished(self, success: bool, error: str, result):
+        self._audit_job = None
+        self.auditingChanged.emit()
+        self.auditFinished.emit(success, error, self._audit_result(*result) if success else {})
+
+    @pyqtProperty(bool, notify=exportingChanged)
+    def exporting(self):
+        return self._export_job is not None
+
     @pyqtSlot(str, result=bool)
     def exportToCsv(self, file_path: str) -> bool:
-        """Export all passwords to a CSV file."""
-        if not self._vault:
+        """Start exporting all passwords to a CSV file in the background."""
+        return self._start_export(file_path, "csv")
+
+    @pyqtSlot(str, result=bool)
+    def exportToJson(self, file_path: str) -> bool:
+        """Start exporting all passwords to a JSON file in the background."""
+        return self._start_export(file_path, "json")
+
+    def _start_export(self, file_path: str, fmt: str) -> bool:
+        if not self._vault or self._export_job is not None:
             return False
+        job = self._export_job = ExportJob(self._vault, file_path, fmt)
+        job.progress.connect(self.exportProgress)
+        job.succeeded.connect(lambda result: self._on_export_finished(True, ""))
+        job.failed.connect(lambda error: self._on_export_finished(False, f"Export failed: {error}"))
+        job.cancelled.connect(lambda: self._on_export_finished(False, ""))
+        self._jobs.submit(job)
+        self.exportingChanged.emit()
+        return True
 
-        try:
-            # Returns tuples: (id, website, username, password, totp_key, favorite)
-            entries = self._vault.get_all_passwords()
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['website', 'username', 'password', 'totp_key', 'favorite'])
-                for entry in entries:
-                    writer.writerow([
-                        entry[1],  # website
-                        entry[2],  # username
-                        entry[3],  # password
-                        entry[4],  # totp_key
-                        entry[5]   # favorite
-                    ])
-            return True
-        except Exception as e:
-            print(f"Export CSV error: {e}")
+    @pyqtSlot()
+    def cancelExport(self):
+        if self._export_job is not None:
+            self._export_job.cancel()
+
+    def _on_export_finished(self, success: bool, error: str):
+        self._export_job = None
+        self.exportingChanged.emit()
+        self.exportFinished.emit(success, error)
+
+    @pyqtProperty(bool, notify=importingChanged)
+    def importing(self):
+        return self._import_job is not None
+
+    @pyqtSlot(str, bool, result=bool)
+    def importFile(self, file_path: str, dry_run: bool) -> bool:
+        """Start importing a CSV or JSON export; a dry run only reports what would be added."""
+        if not self._vault or self._import_job is not None:
             return False
+        job = self._import_job = ImportJob(self._vault, file_path, dry_run)
+        job.progress.connect(self.importProgress)
+        job.succeeded.connect(lambda summary: self._on_import_finished(True, "", summary))
+        job.failed.connect(lambda error: self._on_import_finished(False, f"Import failed: {error}", {}))
+        job.cancelled.connect(lambda: self._on_import_finished(False, "", {}))
+        self._jobs.submit(job)
+        self.importingChanged.emit()
+        return True
+
+    @pyqtSlot()
+    def cancelImport(self):
+        if self._import_job is not None:
+            self._import_job.cancel()
+
+    def _on_import_finished(self, success: bool, error: str, summary: dict):
+        self._import_job = None
+        self.importingChanged.emit()
+        if success and not summary["dryRun"] and summary["new"]:
+            self._load_entries()
+        self.importFinished.emit(success, error, summary)
+
+    def _open_breach_corpus(self, path: str) -> bool:
+        # A running check keeps its own reference, so the old corpus stays mapped until it ends
+        self._breach_corpus = None
+        self._breach_corpus_error = ""
+        if path:
+            try:
+                self._breach_corpus = BreachCorpus(Path(path))
+            except OSError:
+                self._breach_corpus_error = f"Cannot open {path}"
+            except ValueError as e:
+                self._breach_corpus_error = str(e)
+        self.breachCorpusChanged.emit()
+        return self._breach_corpus is not None
+
+    @pyqtProperty(str, notify=breachCorpusChanged)
+    def breachCorpusPath(self):
+        return str(self._breach_corpus.path) if self._breach_corpus else ""
+
+    @pyqtProperty(float, notify=breachCorpusChanged)
+    def breachCorpusSize(self):
+        """Number of hashes in the corpus; a float, as large corpora overflow int."""
+        return float(len(self._breach_corpus)) if self._breach_corpus else 0.0
+
+    @pyqtProperty(str, notify=breachCorpusChanged)
+    def breachCorpusError(self):
+        return self._breach_corpus_error
 
     @pyqtSlot(str, result=bool)
-    def exportToJson(self, file_path: str) -> bool:
-        """Export all passwords to a JSON file."""
-        if not self._vault:
+    def setBreachCorpus(self, path: str) -> bool:
+        """Use a corpus built by tools/build_breach_corpus.py; "" stops checking."""
+        if not self._open_breach_corpus(path) and path:
             return False
+        self._settings.set_breach_corpus_path(path)
+        return True
 
-        try:
-            # Returns tuples: (id, website, username, password, totp_key, favorite)
-            entries = self._vault.get_all_passwords()
-            export_data = []
-            for entry in entries:
-                export_data.append({
-                    'website': entry[1],
-                    'username': entry[2],
-                    'password': entry[3],
-                    'totp_key': entry[4],
-                    'favorite': bool(entry[5])
-                })
-
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
-            return True
-        except Exception as e:
-            print(f"Export JSON error: {e}")
+    @pyqtSlot(str, result=int)
+    def breachCount(self, password: str) -> int:
+        """Return how often a password was seen in breaches, -1 without a corpus."""
+        if self._breach_corpus is None:
+            return -1
+        if not password:
+            return 0
+        return min(self._breach_corpus.times_seen(password), 2**31 - 1)
+
+    @pyqtProperty(bool, notify=breachCheckingChanged)
+    def breachChecking(self):
+        return self._breach_job is not None
+
+    @pyqtSlot(result=bool)
+    def checkBreaches(self) -> bool:
+        """Start looking up every vault password in the breach corpus."""
+        if not self._vault or self._breach_corpus is None or self._breach_job is not None:
             return False
+        job = self._breach_job = BreachCheckJob(self._vault, self._breach_corpus)
+        job.progress.connect(self.breachCheckProgress)
+        job.succeeded.connect(lambda result: self._on_breach_check_finished(True, "", result))
+        job.failed.connect(lambda error: self._on_breach_check_finished(False, f"Check failed: {error}", None))
+        job.cancelled.connect(lambda: self._on_breach_check_finished(False, "", None))
+        self._jobs.submit(job)
+        self.breachCheckingChanged.emit()
+        return True
+
+    @pyqtSlot()
+    def cancelBreachCheck(self):
+        if self._breach_job is not None:
+            self._breach_job.cancel()
+
+    def _on_breach_check_finished(self, success: bool, error: str, found):
+        self._breach_job = None
+        self.breachCheckingChanged.emit()
+        result = {}
+        if success:
+            breached, logins = found
+            listed = breached[:REPORT_LIST_LIMIT]
+            result = {
+                "count": len(breached),
+                "entries": [
+                    {"website": logins[i][0], "username": logins[i][1], "seen": seen}
+                    for i, seen in listed if i in logins
+                ],
+            }
+        self.breachCheckFinished.emit(success, error, result)
@@ -1,79 +1,280 @@
 from pathlib import Path
 
-from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot, pyqtProperty, QThread
+from PyQt6.QtCore import QObject, QEvent, QTimer, pyqtSignal, pyqtSlot, pyqtProperty
 
+from password_manager.core.cipher import CipherSettings, PAGE_SIZES
 from password_manager.core.vault import VaultManager
+from password_manager.core.metrics import timed_slots
+from password_manager.core.vault_set import VaultSet
 from password_manager.models.recent_vaults_model import RecentVaultsModel
 from password_manager.config.settings import SettingsManager
+from password_manager.controllers.job_runner import FutureWatcher, Job, JobRunner
 from password_manager.core.validators import validate_password
 
+# Window events that count as user activity for the idle auto-lock
+ACTIVITY_EVENTS = frozenset({
+    QEvent.Type.KeyPress,
+    QEvent.Type.MouseButtonPress,
+    QEvent.Type.MouseMove,
+    QEvent.Type.Wheel,
+    QEvent.Type.TouchBegin,
+})
 
-class VaultWorker(QThread):
-    """Worker thread for vault operations to avoid UI freezing."""
-    finished = pyqtSignal(bool, str)  # success, error_message
+class OpenVaultJob(Job):
+    name = "open"
 
-    def __init__(self, vault: VaultManager, operation: str, **kwargs):
+    def __init__(self, vault: VaultManager, path: str, master_password: str):
         super().__init__()
         self._vault = vault
-        self._operation = operation
-        self._kwargs = kwargs
-        self._result = False
+        self.path = path
+        self._password = master_password
 
-    def run(self):
-        try:
-            if self._operation == "open":
-                self._result = self._vault.open(
-                    Path(self._kwargs["path"]),
-                    self._kwargs["password"]
-                )
-                if self._result:
-                    self.finished.emit(True, "")
-                else:
-                    self.finished.emit(False, "Incorrect password")
-            elif self._operation == "create":
-                self._vault.create(
-                    Path(self._kwargs["path"]),
-                    self._kwargs["name"],
-                    self._kwargs["password"]
-                )
-                self._result = True
-                self.finished.emit(True, "")
-        except Exception as e:
-            self.finished.emit(False, str(e))
+    def execute(self):
+        if not self._vault.open(Path(self.path), self._password):
+            raise ValueError("Incorrect password")
+
+
+class CreateVaultJob(Job):
+    name = "create"
+
+    def __init__(self, vault: VaultManager, path: str, vault_name: str, master_password: str):
+        super().__init__()
+        self._vault = vault
+        self.path = path
+        self.vault_name = vault_name
+        self._password = master_password
+
+    def execute(self):
+        self._vault.create(Path(self.path), self.vault_name, self._password)
+
+
+class RetuneVaultJob(Job):
+    name = "retune"
+
+    def __init__(self, vault: VaultManager, master_password: str, page_size: int):
+        super().__init__()
+        self._vault = vault
+        self._password = master_password
+        self._page_size = page_size
+
+    def execute(self):
+        if not self._vault.verify_password(self._password):
+            raise ValueError("Master password is incorrect")
+        cipher = CipherSettings.calibrated(page_size=self._page_size)
+        self._vault.retune(self._password, cipher, progress=self.report_progress)
+
+
+class ChangePasswordJob(Job):
+    name = "rekey"
+
+    def __init__(self, vault: VaultManager, current_password: str, new_password: str):
+        super().__init__()
+        self._vault = vault
+        self._current = current_password
+        self._new = new_password
+
+    def execute(self):
+        if not self._vault.change_master_password(self._current, self._new, progress=self.report_progress):
+            raise ValueError("Current password is incorrect")
 
 
+@timed_slots
 class VaultController(QObject):
     vaultOpened = pyqtSignal()
     vaultCreated = pyqtSignal()
     vaultClosed = pyqtSignal()
+    vaultLocked = pyqtSignal()
     vaultError = pyqtSignal(str)
+    vaultSaving = pyqtSignal()
+    vaultSaved = pyqtSignal()
+    vaultSaveFailed = pyqtSignal(str)
+    vaultRetuned = pyqtSignal()
+    masterPasswordChanged = pyqtSignal()
+    masterPasswordChangeFailed = pyqtSignal(str)
+    reencryptProgress = pyqtSignal(int, int)  # done, total
+    openVaultsChanged = pyqtSignal()
 
     vaultNameChanged = pyqtSignal()
+    vaultNameChangeFailed = pyqtSignal(str)
     recentVaultsChanged = pyqtSignal()
     loadingChanged = pyqtSignal()
+    saveStatusChanged = pyqtSignal()
+    cipherSettingsChanged = pyqtSignal()
+    lockedVaultPathChanged = pyqtSignal()
+    jobTimingsChanged = pyqtSignal()
 
     def __init__(self, password_controller=None, parent=None):
         super().__init__(parent)
-        self._vault = VaultManager()
+        self._settings = SettingsManager()
+        # Unlocked vaults; _vault is the active one the password controller
+        # shows, or an unopened or locked manager when none is unlocked
+        self._vaults = VaultSet()
+        self._vault = self._new_vault()
         self._password_controller = password_controller
         self._recent_vaults_model = RecentVaultsModel(self)
-        self._settings = SettingsManager()
         self._vault_name = ""
-        self._loading = False
-        self._worker = None
-        self._pending_vault_path = None
-        self._pending_vault_name = None
+        # Background work on the vault; open, create and re-tune jobs are
+        # tracked separately since they drive the loading state
+        self._jobs = JobRunner(self)
+        self._jobs.jobsChanged.connect(self.jobTimingsChanged)
+        self._vault_jobs = []
+        if password_controller:
+            password_controller.set_job_runner(self._jobs)
+            password_controller.writeFailed.connect(self.vaultSaveFailed)
+        self._save_status = ""
         self._load_recent_vaults()
 
+        self.vaultSaving.connect(self._on_vault_saving)
+        self.vaultSaved.connect(self._on_vault_saved)
+        self.vaultSaveFailed.connect(self._on_vault_save_failed)
+
+        # Locks an open vault after a period without user input
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.setInterval(self._settings.get_auto_lock_minutes() * 60 * 1000)
+        self._idle_timer.timeout.connect(self.lockVault)
+        # Wipes the key of a locked vault, so the next unlock needs the full KDF
+        self._grace_timer = QTimer(self)
+        self._grace_timer.setSingleShot(True)
+        self._grace_timer.setInterval(self._settings.get_unlock_grace_seconds() * 1000)
+        self._grace_timer.timeout.connect(self._forget_locked_vault)
+
+    def _new_vault(self) -> VaultManager:
+        vault = VaultManager(save_delay=self._settings.get_save_delay_ms() / 1000)
+        # The scheduler calls back from its own thread; emitting signals from
+        # there queues the status updates onto the GUI thread. Progress is
+        # shown for the active vault only, failures for every vault.
+        scheduler = vault.save_scheduler
+        if scheduler:
+            scheduler.on_saving = lambda: vault is self._vault and self.vaultSaving.emit()
+            scheduler.on_saved = lambda: vault is self._vault and self.vaultSaved.emit()
+            scheduler.on_failed = self.vaultSaveFailed.emit
+        return vault
+
+    def _activate(self, vault: VaultManager):
+        """Make an unlocked vault the one shown, adding it to the open vaults."""
+        previous = self._vault
+        self._vaults.add(vault)
+        self._vault = vault
+        if previous is not vault and self._password_controller:
+            # Stops jobs of the previous vault before the models switch
+            self._password_controller.clear()
+        self._set_save_status("")
+        self._vault_name = vault.vault_name or ""
+        self.vaultNameChanged.emit()
+        self._on_vault_ready()
+        self.openVaultsChanged.emit()
+
+    @pyqtProperty(list, notify=openVaultsChanged)
+    def openVaults(self):
+        """Name and path of each unlocked vault, in the order they were opened."""
+        return [{"name": vault.vault_name, "path": str(vault.vault_path)} for vault in self._vaults]
+
+    @pyqtProperty(int, notify=openVaultsChanged)
+    def activeVaultIndex(self):
+        return self._vaults.index(self._vault) if self._vault in self._vaults else -1
+
+    @pyqtSlot(int)
+    def switchVault(self, index: int):
+        if 0 <= index < len(self._vaults) and self._vaults[index] is not self._vault:
+            self._activate(self._vaults[index])
+
+    @pyqtSlot(str, result=list)
+    def searchAllVaults(self, query: str) -> list:
+        """Search the website and username of entries in every open vault."""
+        paths = [vault.vault_path for vault in self._vaults]
+        return [
+            {
+                "vaultIndex": paths.index(hit.vault_path),
+                "vaultName": hit.vault_name,
+                "entryId": hit.entry_id,
+                "website": hit.website,
+                "username": hit.username,
+            }
+            for hit in self._vaults.search(query)
+        ]
+
     @pyqtProperty(bool, notify=loadingChanged)
     def loading(self):
-        return self._loading
+        return bool(self._vault_jobs)
+
+    @pyqtProperty(list, notify=jobTimingsChanged)
+    def jobTimings(self):
+        """Queue and run times of recent background jobs, for diagnostics."""
+        return list(self._jobs.history)
 
-    def _set_loading(self, value: bool):
-        if self._loading != value:
-            self._loading = value
+    def _submit_vault_job(self, job: Job, on_success, error_message: str, on_error=None):
+        """Run an open, create or re-encrypt job; failures go to ``on_error``, by default vaultError."""
+        on_error = on_error or self.vaultError.emit
+        self._vault_jobs.append(job)
+        job.succeeded.connect(lambda result: self._on_vault_job_done(job, lambda: on_success(job)))
+        job.failed.connect(lambda error: self._on_vault_job_done(
+            job, lambda: on_error(error or error_message)
+        ))
+        job.cancelled.connect(lambda: self._on_vault_job_done(job, None))
+        self._jobs.submit(job)
+        if len(self._vault_jobs) == 1:
             self.loadingChanged.emit()
 
+    def _on_vault_job_done(self, job: Job, handler):
+        # Clear the loading state before handlers react to the result
+        self._vault_jobs.remove(job)
+        if not self._vault_jobs:
+            self.loadingChanged.emit()
+        if handler:
+            handler()
+
+    def _opening(self) -> bool:
+        # Opening or creating replaces the current vault, so a second request
+        # while one is pending is a repeated click rather than separate work
+        return any(isinstance(job, (OpenVaultJob, CreateVaultJob)) for job in self._vault_jobs)
+
+    @pyqtProperty(str, notify=saveStatusChanged)
+    def saveStatus(self):
+        """One of "", "saving", "saved" or "failed"."""
+        return self._save_status
+
+    def _set_save_status(self, status: str):
+        if self._save_status != status:
+            self._save_status = status
+            self.saveStatusChanged.emit()
+
+    def _on_vault_saving(self):
+        self._set_save_status("saving")
+
+    def _on_vault_saved(self):
+        self._set_save_status("saved")
+
+    def _on_vault_save_failed(self, error: str):
+        self._set_save_status("failed")
+
+    @pyqtProperty(int, notify=cipherSettingsChanged)
+    def kdfIterations(self):
+        return (self._vault.cipher or CipherSettings()).kdf_iter
+
+    @pyqtProperty(int, notify=cipherSettingsChanged)
+    def cipherPageSize(self):
+        return (self._vault.cipher or CipherSettings()).page_size
+
+    @pyqtProperty(list, constant=True)
+    def cipherPageSizes(self):
+        return list(PAGE_SIZES)
+
+    @pyqtProperty(str, notify=lockedVaultPathChanged)
+    def lockedVaultPath(self):
+        """Path of a locked vault that can still be unlocked without the KDF."""
+        return str(self._vault.vault_path) if self._vault.locked else ""
+
+    def eventFilter(self, obj, event):
+        # Installed on the main window; any input restarts the auto-lock countdown
+        if event.type() in ACTIVITY_EVENTS and self._idle_timer.isActive():
+            self._idle_timer.start()
+        return False
+
+    def _start_idle_timer(self):
+        if self._idle_timer.interval() > 0:
+            self._idle_timer.start()
+
     def _load_recent_vaults(self):
         vaults = self._settings.get_recent_vaults()
         self._recent_vaults_model.load_vaults(vaults)
@@ -82,6 +283,8 @@ class VaultController(QObject):
         """Called when vault is opened or created to sync with password controller."""
         if self._password_controller:
             self._password_controller.set_vault(self._vault)
+        self.cipherSettingsChanged.emit()
+        self._start_idle_timer()
 
     @pyqtProperty(RecentVaultsModel, notify=recentVaultsChanged)
     def recentVaultsModel(self):
@@ -97,67 +300,158 @@ class VaultController(QObject):
 
     @pyqtSlot(str, str, str)
     def createVault(self, path: str, name: str, master_password: str):
-        if self._loading:
+        if self._opening():
             return
-        self._set_loading(True)
-        self._pending_vault_path = path
-        self._pending_vault_name = name
         # Create parent directory synchronously (fast operation)
         vault_path = Path(path)
         vault_path.parent.mkdir(parents=True, exist_ok=True)
-        self._worker = VaultWorker(self._vault, "create", path=path, name=name, password=master_password)
-        self._worker.finished.connect(self._on_create_finished)
-        self._worker.start()
-
-    def _on_create_finished(self, success: bool, error: str):
-        self._set_loading(False)
-        if success:
-            self._vault_name = self._pending_vault_name
-            self.vaultNameChanged.emit()
-            self._on_vault_ready()
-            self._settings.add_recent_vault(self._pending_vault_path, self._pending_vault_name)
-            self._load_recent_vaults()
-            self.recentVaultsChanged.emit()
-            self.vaultCreated.emit()
-        else:
-            self.vaultError.emit(error or "Failed to create vault")
-        self._pending_vault_path = None
-        self._pending_vault_name = None
-        self._worker = None
+        vault = self._target_vault()
+        job = CreateVaultJob(vault, path, name, master_password)
+        self._submit_vault_job(job, lambda job: self._on_create_finished(vault, job), "Failed to create vault")
+
+    def _target_vault(self) -> VaultManager:
+        """The manager to open or create a vault with; unlocked vaults stay open beside it."""
+        return self._new_vault() if len(self._vaults) else self._vault
+
+    def _on_create_finished(self, vault: VaultManager, job: CreateVaultJob):
+        self._activate(vault)
+        self._settings.add_recent_vault(job.path, job.vault_name)
+        self._load_recent_vaults()
+        self.recentVaultsChanged.emit()
+        self.vaultCreated.emit()
 
     @pyqtSlot(str, str)
     def openVault(self, path: str, master_password: str):
-        if self._loading:
+        if self._opening():
             return
-        self._set_loading(True)
-        self._pending_vault_path = path
-        self._worker = VaultWorker(self._vault, "open", path=path, password=master_password)
-        self._worker.finished.connect(self._on_open_finished)
-        self._worker.start()
-
-    def _on_open_finished(self, success: bool, error: str):
-        self._set_loading(False)
-        if success:
-            self._vault_name = self._vault.vault_name
-            self.vaultNameChanged.emit()
-            self._on_vault_ready()
-            self._settings.add_recent_vault(self._pending_vault_path, self._vault_name)
-            self._load_recent_vaults()
-            self.recentVaultsChanged.emit()
+        already_open = self._vaults.find(Path(path))
+        if already_open is not None:
+            if not already_open.verify_password(master_password):
+                self.vaultError.emit("Incorrect password")
+                return
+            self._activate(already_open)
             self.vaultOpened.emit()
-        else:
-            self.vaultError.emit(error or "Failed to open vault")
-        self._pending_vault_path = None
-        self._worker = None
+            return
+        if self._vault.locked and Path(path) == self._vault.vault_path:
+            # The key is still held, so this skips the KDF and extraction
+            if self._vault.unlock(master_password):
+                self._grace_timer.stop()
+                self.lockedVaultPathChanged.emit()
+                self._on_vault_opened(self._vault, path)
+                return
+            if self._vault.locked:
+                self.vaultError.emit("Incorrect password")
+                return
+            # The vault changed on disk and was closed; open it from scratch
+            self.lockedVaultPathChanged.emit()
+        vault = self._target_vault()
+        job = OpenVaultJob(vault, path, master_password)
+        self._submit_vault_job(job, lambda job: self._on_vault_opened(vault, job.path), "Failed to open vault")
+
+    def _on_vault_opened(self, vault: VaultManager, path: str):
+        self._activate(vault)
+        self._settings.add_recent_vault(path, self._vault_name)
+        self._load_recent_vaults()
+        self.recentVaultsChanged.emit()
+        self.vaultOpened.emit()
+
+    def _close(self, vault: VaultManager):
+        self._vaults.remove(vault)
+        try:
+            vault.close()
+        except Exception as e:
+            self.vaultSaveFailed.emit(str(e))
 
     @pyqtSlot()
     def closeVault(self):
-        self._vault.close()
+        """Close every open vault once the background jobs, cancelled here, have stopped."""
+        self._idle_timer.stop()
+        self._grace_timer.stop()
+        self._jobs.when_idle(self._close_all)
+
+    def shutdown(self):
+        """Close every open vault before the application exits, blocking until the jobs have stopped."""
+        self._idle_timer.stop()
+        self._grace_timer.stop()
+        self._jobs.wait()
+        self._close_all()
+
+    def _close_all(self):
+        was_locked = self._vault.locked
+        for vault in self._vaults:
+            if vault is not self._vault:
+                self._close(vault)
+        self._close(self._vault)
+        if was_locked:
+            self.lockedVaultPathChanged.emit()
+        self._clear_vault_state()
+        self.vaultClosed.emit()
+
+    @pyqtSlot(int)
+    def closeOpenVault(self, index: int):
+        """Close one open vault; closing the active one switches to the next open vault."""
+        if not 0 <= index < len(self._vaults):
+            return
+        vault = self._vaults[index]
+        if len(self._vaults) == 1:
+            self.closeVault()
+            return
+        self._jobs.when_idle(lambda: self._close_open_vault(vault))
+
+    def _close_open_vault(self, vault: VaultManager):
+        if vault not in self._vaults:
+            return
+        if len(self._vaults) == 1:
+            self._close_all()
+            return
+        if vault is self._vault:
+            index = self._vaults.index(vault)
+            self._activate(self._vaults[index - 1 if index else 1])
+        self._close(vault)
+        self.openVaultsChanged.emit()
+
+    @pyqtSlot()
+    def lockVault(self):
+        """Lock the active vault, keeping its key for the unlock grace period.
+
+        The other open vaults are closed; they are unlocked again one by one.
+        """
+        self._idle_timer.stop()
+        if self._vault.is_open:
+            self._jobs.when_idle(self._lock)
+
+    def _lock(self):
+        if not self._vault.is_open:
+            return
+        for vault in self._vaults:
+            if vault is not self._vault:
+                self._close(vault)
+        self._vaults.remove(self._vault)
+        try:
+            self._vault.lock()
+        except Exception as e:
+            self.vaultSaveFailed.emit(str(e))
+        if self._grace_timer.interval() > 0:
+            self._grace_timer.start()
+        else:
+            self._vault.close()
+        self._clear_vault_state()
+        self.lockedVaultPathChanged.emit()
+        self.vaultLocked.emit()
+
+    def _forget_locked_vault(self):
+        if self._vault.locked:
+            self._vault.close()
+            self.lockedVaultPathChanged.emit()
+
+    def _clear_vault_state(self):
+        self._set_save_status("")
         self._vault_name = ""
         self.vaultNameChanged.emit()
         if self._password_controller:
             self._password_controller.clear()
-        self.vaultClosed.emit()
+        self.cipherSettingsChanged.emit()
+        self.openVaultsChanged.emit()
 
     @pyqtSlot(int, result=str)
     def getRecentVaultPath(self, row: int) -> str:
@@ -183,20 +477,46 @@ class VaultController(QObject):
 
     @pyqtSlot(str, result=bool)
     def changeVaultName(self, new_name: str) -> bool:
-        """Change the vault name."""
+        """Start renaming the vault; reported by vaultNameChanged or vaultNameChangeFailed."""
         if not new_name.strip():
             return False
-        self._vault.change_vault_name(new_name.strip())
-        self._vault_name = new_name.strip()
+        vault = self._vault
+        watcher = FutureWatcher(vault.submit(vault.change_vault_name, new_name.strip()), self)
+        watcher.succeeded.connect(lambda result: vault is self._vault and self._on_vault_renamed(new_name.strip()))
+        watcher.failed.connect(lambda error: self.vaultNameChangeFailed.emit(error or "Failed to change vault name"))
+        return True
+
+    def _on_vault_renamed(self, new_name: str):
+        self._vault_name = new_name
         self.vaultNameChanged.emit()
         # Update recent vaults with new name
         if self._vault.vault_path:
             self._settings.add_recent_vault(str(self._vault.vault_path), self._vault_name)
             self._load_recent_vaults()
             self.recentVaultsChanged.emit()
-        return True
+        self.openVaultsChanged.emit()
+
+    @pyqtSlot(str, str)
+    def changeMasterPassword(self, current_password: str, new_password: str):
+        """Re-encrypt the vault under a new master password in the background.
+
+        Reports masterPasswordChanged or masterPasswordChangeFailed; until
+        then the vault keeps its current password.
+        """
+        job = ChangePasswordJob(self._vault, current_password, new_password)
+        job.progress.connect(self.reencryptProgress)
+        self._submit_vault_job(
+            job, lambda job: self.masterPasswordChanged.emit(), "Failed to change the master password",
+            self.masterPasswordChangeFailed.emit
+        )
+
+    @pyqtSlot(str, int)
+    def retuneVault(self, master_password: str, page_size: int):
+        """Re-calibrate the key derivation and re-encrypt with the given page size."""
+        job = RetuneVaultJob(self._vault, master_password, page_size)
+        job.progress.connect(self.reencryptProgress)
+        self._submit_vault_job(job, self._on_retune_finished, "Failed to re-tune vault encryption")
 
-    @pyqtSlot(str, str, result=bool)
-    def changeMasterPassword(self, current_password: str, new_password: str) -> bool:
-        """Change the master password."""
-        return self._vault.change_master_password(current_password, new_password)
+    def _on_retune_finished(self, job: RetuneVaultJob):
+        self.cipherSettingsChanged.emit()
+        self.vaultRetuned.emit()
@@ -1,3 +1,7 @@
 from password_manager.core.vault import VaultManager
-from password_manager.core.totp import generate_totp
+from password_manager.core.vault_set import VaultSet, SearchHit
+from password_manager.core.metrics import Metrics, metrics
+from password_manager.core.cipher import CipherSettings, calibrate_kdf_iter
+from password_manager.core.totp import generate_totp, parse_totp_key, TotpKey, TotpCodeCache
+from password_manager.core.strength import estimate_strength, PasswordStrength
 from password_manager.core.validators import validate_url, validate_username, validate_password, validate_totp_key
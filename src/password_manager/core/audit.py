@@ -0,0 +1,231 @@
+import hashlib
+import hmac
+import os
+from typing import NamedTuple
+
+from password_manager.core.strength import MIN_SCORE, estimate_strength
+
+# Passwords not changed for this long are reported as stale
+STALE_DAYS = 365
+# Entries listed per finding; the counts cover all of them
+REPORT_LIST_LIMIT = 200
+# Bump when the strength estimate changes, so stored scores are recomputed
+STRENGTH_VERSION = 1
+
+# One row per entry with a keyed hash of its password, so reused passwords
+# are found by grouping on an index instead of comparing every pair.
+# The key is random per vault and, like the hashes, stored encrypted.
+AUDIT_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS vault_meta (key TEXT PRIMARY KEY, value BLOB)",
+    """
+    CREATE TABLE IF NOT EXISTS password_audit (
+        id INTEGER PRIMARY KEY,
+        digest BLOB NOT NULL,
+        weak INTEGER NOT NULL,
+        changed_at TIMESTAMP NOT NULL,
+        strength INTEGER
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS password_audit_digest ON password_audit(digest)",
+    # How many entries use each password, kept current by triggers so
+    # reused passwords are read without grouping the whole index
+    "CREATE TABLE IF NOT EXISTS password_reuse (digest BLOB PRIMARY KEY, uses INTEGER NOT NULL)",
+    """
+    CREATE TRIGGER IF NOT EXISTS password_audit_insert AFTER INSERT ON password_audit BEGIN
+        INSERT INTO password_reuse (digest, uses) VALUES (new.digest, 1)
+        ON CONFLICT(digest) DO UPDATE SET uses = uses + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS password_audit_delete AFTER DELETE ON password_audit BEGIN
+        UPDATE password_reuse SET uses = uses - 1 WHERE digest = old.digest;
+        DELETE FROM password_reuse WHERE digest = old.digest AND uses <= 0;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS password_audit_update AFTER UPDATE OF digest ON password_audit
+    WHEN old.digest != new.digest BEGIN
+        UPDATE password_reuse SET uses = uses - 1 WHERE digest = old.digest;
+        DELETE FROM password_reuse WHERE digest = old.digest AND uses <= 0;
+        INSERT INTO password_reuse (digest, uses) VALUES (new.digest, 1)
+        ON CONFLICT(digest) DO UPDATE SET uses = uses + 1;
+    END
+    """,
+    # Partial and range indexes, so each finding reads only its own rows
+    "CREATE INDEX IF NOT EXISTS password_reuse_shared ON password_reuse(digest) WHERE uses > 1",
+    "CREATE INDEX IF NOT EXISTS password_audit_weak ON password_audit(id) WHERE weak",
+    "CREATE INDEX IF NOT EXISTS password_audit_changed ON password_audit(changed_at)",
+    "CREATE INDEX IF NOT EXISTS passwords_without_totp ON passwords(id) WHERE coalesce(totp_key, '') = ''",
+)
+
+# Strength scores are NULL until estimated; single edits score inline, bulk
+# inserts leave it to score_passwords() on a background thread
+STRENGTH_SCHEMA = (
+    "CREATE INDEX IF NOT EXISTS password_audit_unscored ON password_audit(id) WHERE strength IS NULL",
+)
+
+# Inserts clear the 'audit_synced' marker until the index covers them, and
+# deletes drop their index row, whichever version of the app writes the vault.
+# The hash needs the key, so the index itself cannot be kept by a trigger.
+SYNC_SCHEMA = (
+    """
+    CREATE TRIGGER IF NOT EXISTS passwords_audit_pending AFTER INSERT ON passwords BEGIN
+        INSERT OR REPLACE INTO vault_meta (key, value) VALUES ('audit_synced', 0);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS passwords_audit_delete AFTER DELETE ON passwords BEGIN
+        DELETE FROM password_audit WHERE id = old.id;
+    END
+    """,
+)
+
+_UPSERT = """
+    INSERT INTO password_audit (id, digest, weak, changed_at, strength)
+    VALUES (?, ?, ?, coalesce(?, CURRENT_TIMESTAMP), ?)
+    ON CONFLICT(id) DO UPDATE SET
+        weak = excluded.weak,
+        strength = excluded.strength,
+        changed_at = CASE WHEN digest = excluded.digest THEN changed_at ELSE excluded.changed_at END,
+        digest = excluded.digest
+"""
+
+
+class AuditReport(NamedTuple):
+    """Findings of a password audit. Lists hold entry ids, at most REPORT_LIST_LIMIT each."""
+    total: int
+    reused_groups: int
+    reused_count: int
+    reused: list
+    weak_count: int
+    weak: list
+    without_totp_count: int
+    without_totp: list
+    stale_count: int
+    stale: list
+    unscored: int
+
+
+def reset_outdated_scores(cursor) -> bool:
+    """Clear the stored scores if they were estimated before the last STRENGTH_VERSION bump.
+
+    One vault_meta lookup when they are current. Returns whether they were cleared.
+    """
+    cursor.execute("SELECT value FROM vault_meta WHERE key = 'strength_version'")
+    row = cursor.fetchone()
+    if row and row[0] == STRENGTH_VERSION:
+        return False
+    cursor.execute("UPDATE password_audit SET strength = NULL")
+    cursor.execute(
+        "INSERT OR REPLACE INTO vault_meta (key, value) VALUES ('strength_version', ?)", (STRENGTH_VERSION,)
+    )
+    return True
+
+
+def audit_key(cursor) -> bytes:
+    """Return the vault's audit hash key, creating it on first use."""
+    cursor.execute("SELECT value FROM vault_meta WHERE key = 'audit_key'")
+    row = cursor.fetchone()
+    if row:
+        return bytes(row[0])
+    key = os.urandom(32)
+    cursor.execute("INSERT INTO vault_meta (key, value) VALUES ('audit_key', ?)", (key,))
+    return key
+
+
+def password_digest(key: bytes, password: str) -> bytes:
+    return hmac.new(key, password.encode(), hashlib.sha256).digest()
+
+
+def index_entry(cursor, key: bytes, entry_id: int, password: str, changed_at=None):
+    """Add or refresh one entry; changed_at moves only when the password changes."""
+    score = estimate_strength(password).score
+    cursor.execute(_UPSERT, (entry_id, password_digest(key, password), int(score < MIN_SCORE), changed_at, score))
+
+
+def index_in_sync(cursor) -> bool:
+    """Whether every entry is indexed, read from the marker SYNC_SCHEMA keeps."""
+    cursor.execute("SELECT value FROM vault_meta WHERE key = 'audit_synced'")
+    row = cursor.fetchone()
+    return bool(row and row[0])
+
+
+def mark_in_sync(cursor):
+    """Record that the entries inserted so far are indexed."""
+    cursor.execute("INSERT OR REPLACE INTO vault_meta (key, value) VALUES ('audit_synced', 1)")
+
+
+def sync_index(cursor, key: bytes) -> int:
+    """Index entries the index does not cover yet and drop deleted ones.
+
+    Builds the index for vaults created before it existed and for rows
+    inserted in bulk. Their strength is left unscored. Returns the number
+    of entries indexed.
+    """
+    cursor.execute(
+        "SELECT p.id, p.password, p.created_at FROM passwords p "
+        "LEFT JOIN password_audit a ON a.id = p.id WHERE a.id IS NULL"
+    )
+    missing = cursor.fetchall()
+    cursor.executemany(_UPSERT, [
+        (entry_id, password_digest(key, password), 0, created_at, None)
+        for entry_id, password, created_at in missing
+    ])
+    cursor.execute("DELETE FROM password_audit WHERE id NOT IN (SELECT id FROM passwords)")
+    mark_in_sync(cursor)
+    return len(missing)
+
+
+def unscored_entries(cursor, limit: int) -> list:
+    """Return up to ``limit`` (id, password) rows whose strength is not scored yet."""
+    cursor.execute(
+        "SELECT a.id, p.password FROM password_audit a JOIN passwords p ON p.id = a.id "
+        "WHERE a.strength IS NULL LIMIT ?",
+        (limit,)
+    )
+    return cursor.fetchall()
+
+
+def store_scores(cursor, scores: list):
+    """Store (id, score) pairs; entries edited since they were read keep their new score."""
+    cursor.executemany(
+        "UPDATE password_audit SET strength = ?, weak = ? WHERE id = ? AND strength IS NULL",
+        [(score, int(score < MIN_SCORE), entry_id) for entry_id, score in scores]
+    )
+
+
+def count_unscored(cursor) -> int:
+    cursor.execute("SELECT count(*) FROM password_audit WHERE strength IS NULL")
+    return cursor.fetchone()[0]
+
+
+def _ids(cursor, where: str, table: str = "password_audit", order: str = "id", params=()) -> tuple:
+    cursor.execute(f"SELECT count(*) FROM {table} WHERE {where}", params)
+    count = cursor.fetchone()[0]
+    cursor.execute(f"SELECT id FROM {table} WHERE {where} ORDER BY {order} LIMIT {REPORT_LIST_LIMIT}", params)
+    return count, [row[0] for row in cursor.fetchall()]
+
+
+def build_report(cursor, stale_days: int = STALE_DAYS) -> AuditReport:
+    """Read the findings from the indexes, touching only the flagged entries."""
+    cursor.execute("SELECT count(*) FROM password_audit")
+    total = cursor.fetchone()[0]
+    cursor.execute("SELECT count(*), coalesce(sum(uses), 0) FROM password_reuse WHERE uses > 1")
+    reused_groups, reused_count = cursor.fetchone()
+    # Entries sharing a password, grouped so reused ones are listed together
+    cursor.execute(
+        "SELECT a.id FROM password_reuse r JOIN password_audit a ON a.digest = r.digest "
+        f"WHERE r.uses > 1 ORDER BY r.digest, a.id LIMIT {REPORT_LIST_LIMIT}"
+    )
+    reused = [row[0] for row in cursor.fetchall()]
+    weak_count, weak = _ids(cursor, "weak")
+    without_totp_count, without_totp = _ids(cursor, "coalesce(totp_key, '') = ''", table="passwords")
+    # Oldest first
+    stale_count, stale = _ids(
+        cursor, "changed_at < datetime('now', ?)", order="changed_at", params=(f"-{stale_days} days",)
+    )
+    return AuditReport(
+        total, reused_groups, reused_count, reused,
+        weak_count, weak, without_totp_count, without_totp, stale_count, stale,
+        count_unscored(cursor)
+    )
@@ -0,0 +1,190 @@
+import hashlib
+import mmap
+import struct
+import sys
+import threading
+from array import array
+from itertools import accumulate
+from pathlib import Path
+from typing import Callable, Optional
+
+from password_manager.core.vault import VaultManager
+
+# Binary corpus of breached password hashes, built from a Have I Been Pwned
+# style "SHA1:COUNT" text file ordered by hash:
+#
+#   header   magic, version, prefix bits, record count, index offset
+#   records  20-byte SHA-1 digest + uint32 times seen, sorted by digest
+#   index    2**bits + 1 uint64 record numbers; bucket p spans the records
+#            whose leading bits equal p
+#
+# The file is memory-mapped, so a lookup touches one index page and the one
+# or two record pages of a single bucket instead of loading the corpus.
+CORPUS_MAGIC = b"PMBREACH"
+CORPUS_VERSION = 1
+_HEADER = struct.Struct("<8sHHQQ")
+_RECORD = struct.Struct("<20sI")
+_BUCKET = struct.Struct("<QQ")
+_DIGEST_SIZE = 20
+# Prefixes are counted at this resolution while converting; the stored index
+# uses at most this many bits
+_MAX_PREFIX_BITS = 24
+_MIN_PREFIX_BITS = 8
+# Records per bucket the converter aims for, about one 4 KiB page
+_BUCKET_TARGET = 128
+# Vault rows read per batch when checking a whole vault
+CHECK_BATCH_SIZE = 1000
+
+
+class BreachCorpus:
+    """Read-only lookups in a corpus file written by build_corpus().
+
+    Lookups only read the memory map, so one corpus can be shared by threads.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, bits, count, index_offset = _HEADER.unpack_from(self._mmap)
+        except struct.error:
+            magic = None
+        if magic != CORPUS_MAGIC or version != CORPUS_VERSION or bits > _MAX_PREFIX_BITS:
+            self._mmap.close()
+            raise ValueError("Not a breached password corpus")
+        if index_offset + ((1 << bits) + 1) * 8 > len(self._mmap):
+            self._mmap.close()
+            raise ValueError("Breached password corpus is truncated")
+        self._shift = _MAX_PREFIX_BITS - bits
+        self._count = count
+        self._index_offset = index_offset
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._mmap.close()
+
+    def times_seen(self, password: str) -> int:
+        """Return how often the password appears in breaches, 0 if never."""
+        return self.digest_times_seen(hashlib.sha1(password.encode()).digest())
+
+    def digest_times_seen(self, digest: bytes) -> int:
+        prefix = int.from_bytes(digest[:3], "big") >> self._shift
+        lo, hi = _BUCKET.unpack_from(self._mmap, self._index_offset + prefix * 8)
+        mm = self._mmap
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = _HEADER.size + mid * _RECORD.size
+            found = mm[offset:offset + _DIGEST_SIZE]
+            if found < digest:
+                lo = mid + 1
+            elif found > digest:
+                hi = mid
+            else:
+                return _RECORD.unpack_from(mm, offset)[1]
+        return 0
+
+
+def find_breached(vault: VaultManager, corpus: BreachCorpus,
+                  progress: Optional[Callable[[int, int], None]] = None,
+                  cancel: Optional[threading.Event] = None) -> Optional[list]:
+    """Look up every password of ``vault`` in ``corpus``.
+
+    Returns (entry_id, times_seen) pairs for the breached entries, most seen
+    first, or None if ``cancel`` was set. Passwords used by several entries
+    are looked up once.
+    """
+    total = vault.count_entries()[0]
+    seen_by_password = {}
+    breached = []
+    done = 0
+    for entry_id, _, _, password, _, _ in vault.iter_passwords(CHECK_BATCH_SIZE):
+        seen = seen_by_password.get(password)
+        if seen is None:
+            seen = seen_by_password[password] = corpus.times_seen(password)
+        if seen:
+            breached.append((entry_id, seen))
+        done += 1
+        if done % CHECK_BATCH_SIZE == 0:
+            if cancel is not None and cancel.is_set():
+                return None
+            if progress is not None:
+                progress(done, total)
+    if progress is not None:
+        progress(done, total)
+    breached.sort(key=lambda item: -item[1])
+    return breached
+
+
+def _prefix_bits(count: int) -> int:
+    bits = max(count // _BUCKET_TARGET, 1).bit_length()
+    return min(max(bits, _MIN_PREFIX_BITS), _MAX_PREFIX_BITS)
+
+
+def build_corpus(source: Path, target: Path, progress=None) -> int:
+    """Convert a "SHA1:COUNT" text corpus ordered by hash into the binary format.
+
+    Reads and writes sequentially, so corpora larger than memory convert in
+    constant space apart from a 64 MiB prefix table. ``progress`` is called
+    with the number of bytes read so far. Returns the number of hashes.
+    """
+    target = Path(target)
+    temp = target.with_name(target.name + ".tmp")
+    try:
+        with open(source, "rb") as src, open(temp, "wb") as out:
+            count = _write_corpus(src, out, progress)
+        temp.replace(target)
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+    return count
+
+
+def _write_corpus(src, out, progress) -> int:
+    counts = array("I", bytes(4 << _MAX_PREFIX_BITS))
+    count = 0
+    previous = b""
+    out.write(bytes(_HEADER.size))
+    for line_number, line in enumerate(src, 1):
+        line = line.strip()
+        if not line:
+            continue
+        hex_digest, _, seen = line.partition(b":")
+        try:
+            digest = bytes.fromhex(hex_digest.decode("ascii"))
+            seen = int(seen or 1)
+        except ValueError:
+            digest = b""
+        if len(digest) != _DIGEST_SIZE:
+            raise ValueError(f"Line {line_number}: expected a SHA-1 hash, optionally followed by :count")
+        if digest <= previous:
+            if digest == previous:
+                continue
+            raise ValueError(f"Line {line_number}: hashes are not sorted; use the corpus ordered by hash")
+        previous = digest
+        out.write(_RECORD.pack(digest, min(seen, 0xFFFFFFFF)))
+        counts[int.from_bytes(digest[:3], "big")] += 1
+        count += 1
+        if progress is not None and count % 1_000_000 == 0:
+            progress(src.tell())
+
+    # Record number where each prefix starts, coarsened to the stored bits
+    bits = _prefix_bits(count)
+    starts = array("Q", [0])
+    starts.extend(accumulate(counts))
+    index = starts[::1 << (_MAX_PREFIX_BITS - bits)]
+    if sys.byteorder == "big":
+        index.byteswap()
+    index_offset = out.tell()
+    out.write(index.tobytes())
+    out.seek(0)
+    out.write(_HEADER.pack(CORPUS_MAGIC, CORPUS_VERSION, bits, count, index_offset))
+    return count
@@ -0,0 +1,115 @@
+import hashlib
+import os
+import time
+from typing import NamedTuple, Optional
+
+# Key derivation functions SQLCipher supports, with the matching hashlib name
+KDF_ALGORITHMS = {
+    "PBKDF2_HMAC_SHA512": "sha512",
+    "PBKDF2_HMAC_SHA256": "sha256",
+    "PBKDF2_HMAC_SHA1": "sha1",
+}
+HMAC_ALGORITHMS = ("HMAC_SHA512", "HMAC_SHA256", "HMAC_SHA1")
+PAGE_SIZES = (1024, 2048, 4096, 8192, 16384, 32768, 65536)
+KEY_SIZE = 32
+# SQLCipher stores the KDF salt unencrypted in the first bytes of the database
+SALT_SIZE = 16
+
+# SQLCipher 4 defaults
+DEFAULT_KDF_ALGORITHM = "PBKDF2_HMAC_SHA512"
+DEFAULT_HMAC_ALGORITHM = "HMAC_SHA512"
+DEFAULT_KDF_ITER = 256000
+DEFAULT_PAGE_SIZE = 4096
+
+# Calibration aims for this key derivation time on the creating machine, but
+# never goes below MIN_KDF_ITER (OWASP's minimum for PBKDF2-HMAC-SHA512)
+TARGET_UNLOCK_SECONDS = 0.5
+MIN_KDF_ITER = 210000
+CALIBRATION_ITER = 20000
+
+
+class CipherSettings(NamedTuple):
+    """SQLCipher parameters of a vault database, stored in vault.json."""
+    kdf_iter: int = DEFAULT_KDF_ITER
+    page_size: int = DEFAULT_PAGE_SIZE
+    hmac_algorithm: str = DEFAULT_HMAC_ALGORITHM
+    kdf_algorithm: str = DEFAULT_KDF_ALGORITHM
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CipherSettings":
+        """Read settings from vault.json. Raises ValueError if any is invalid."""
+        settings = cls(
+            kdf_iter=int(data.get("kdf_iter", DEFAULT_KDF_ITER)),
+            page_size=int(data.get("page_size", DEFAULT_PAGE_SIZE)),
+            hmac_algorithm=data.get("hmac_algorithm", DEFAULT_HMAC_ALGORITHM),
+            kdf_algorithm=data.get("kdf_algorithm", DEFAULT_KDF_ALGORITHM),
+        )
+        settings.validate()
+        return settings
+
+    @classmethod
+    def calibrated(cls, target_seconds: float = TARGET_UNLOCK_SECONDS,
+                   page_size: int = DEFAULT_PAGE_SIZE) -> "CipherSettings":
+        """Settings whose key derivation takes about ``target_seconds`` on this machine."""
+        return cls(kdf_iter=calibrate_kdf_iter(target_seconds), page_size=page_size)
+
+    def validate(self):
+        if self.kdf_iter < 1:
+            raise ValueError(f"Invalid KDF iteration count: {self.kdf_iter}")
+        if self.page_size not in PAGE_SIZES:
+            raise ValueError(f"Invalid cipher page size: {self.page_size}")
+        if self.hmac_algorithm not in HMAC_ALGORITHMS:
+            raise ValueError(f"Unsupported HMAC algorithm: {self.hmac_algorithm}")
+        if self.kdf_algorithm not in KDF_ALGORITHMS:
+            raise ValueError(f"Unsupported KDF algorithm: {self.kdf_algorithm}")
+
+    def derive_key(self, password: str, salt: bytes) -> bytearray:
+        """Derive the raw database key from the master password, as SQLCipher would."""
+        key = hashlib.pbkdf2_hmac(
+            KDF_ALGORITHMS[self.kdf_algorithm], password.encode(), salt, self.kdf_iter, KEY_SIZE
+        )
+        # Mutable, so it can be wiped
+        return bytearray(key)
+
+    def to_dict(self) -> dict:
+        return self._asdict()
+
+    def pragmas(self, schema: str = "") -> list:
+        """PRAGMA statements applying these settings; they must follow PRAGMA key."""
+        self.validate()
+        prefix = f"{schema}." if schema else ""
+        return [
+            f"PRAGMA {prefix}kdf_iter = {self.kdf_iter}",
+            f"PRAGMA {prefix}cipher_page_size = {self.page_size}",
+            f"PRAGMA {prefix}cipher_hmac_algorithm = {self.hmac_algorithm}",
+            f"PRAGMA {prefix}cipher_kdf_algorithm = {self.kdf_algorithm}",
+        ]
+
+
+def raw_key(key: bytearray, salt: Optional[bytes] = None) -> str:
+    """Return a key as an SQLCipher raw key literal, which bypasses the KDF.
+
+    A new database is given its ``salt`` this way; an existing one reads it
+    from its header.
+    """
+    return f"x'{key.hex()}{salt.hex() if salt else ''}'"
+
+
+def calibrate_kdf_iter(target_seconds: float = TARGET_UNLOCK_SECONDS,
+                       kdf_algorithm: str = DEFAULT_KDF_ALGORITHM) -> int:
+    """Return the PBKDF2 iteration count that takes about ``target_seconds`` here.
+
+    SQLCipher derives its key with the same OpenSSL PBKDF2 that hashlib uses,
+    so a short timed run predicts unlock time closely.
+    """
+    digest = KDF_ALGORITHMS[kdf_algorithm]
+    salt = os.urandom(16)
+    # Best of three, so a busy machine doesn't make vaults weaker
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        hashlib.pbkdf2_hmac(digest, b"calibration", salt, CALIBRATION_ITER)
+        best = min(best, time.perf_counter() - start)
+    iterations = int(CALIBRATION_ITER * target_seconds / max(best, 1e-9))
+    # Round to a readable number
+    return max(MIN_KDF_ITER, iterations // 1000 * 1000)
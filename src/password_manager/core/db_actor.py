@@ -0,0 +1,130 @@
+import functools
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+from password_manager.core.metrics import COUNT_BOUNDS, metrics
+
+# Most requests run back to back before the batch hook is called
+MAX_BATCH_SIZE = 256
+# Seconds without requests before the thread exits; the next request starts it again
+IDLE_TIMEOUT = 30.0
+
+
+class DatabaseActor:
+    """Runs every request for one database on a single thread, in order.
+
+    Requests are queued with submit(), which returns a Future, or call(),
+    which waits for the result. A request made from the actor's own thread
+    runs inline, so requests can use each other. Requests that queue up
+    while one runs are taken as a batch and run back to back; ``after_batch``
+    is then called once, and only afterwards are their futures resolved.
+    """
+
+    def __init__(self, name: str = "vault-db", after_batch: Optional[Callable[[], None]] = None):
+        self.name = name
+        self.after_batch = after_batch
+        self._queue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        # True while a batch of more than one request runs
+        self.batching = False
+        self.requests = 0
+        self.batches = 0
+
+    def in_actor_thread(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Queue fn(*args, **kwargs) and return a Future for its result."""
+        future = Future()
+        if self.in_actor_thread():
+            self._run(future, fn, args, kwargs)
+            return future
+        with self._start_lock:
+            self._queue.put((future, fn, args, kwargs))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._serve, name=self.name, daemon=True)
+                self._thread.start()
+        return future
+
+    def call(self, fn: Callable, *args, **kwargs):
+        """Run fn(*args, **kwargs) on the actor thread and return its result."""
+        if self.in_actor_thread():
+            return fn(*args, **kwargs)
+        return self.submit(fn, *args, **kwargs).result()
+
+    @staticmethod
+    def _run(future: Future, fn: Callable, args: tuple, kwargs: dict):
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+
+    def _serve(self):
+        while True:
+            try:
+                request = self._queue.get(timeout=IDLE_TIMEOUT)
+            except queue.Empty:
+                with self._start_lock:
+                    # submit() queues under the same lock, so nothing is missed
+                    if self._queue.empty():
+                        self._thread = None
+                        return
+                continue
+            batch = [request]
+            while len(batch) < MAX_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: list):
+        self.batches += 1
+        self.requests += len(batch)
+        metrics.observe(f"{self.name}.batch_size", len(batch), COUNT_BOUNDS)
+        if len(batch) == 1 or self.after_batch is None:
+            for future, fn, args, kwargs in batch:
+                self._run(future, fn, args, kwargs)
+            return
+
+        # Results are held back until after_batch has run, so a resolved
+        # future never reports an edit whose save is still pending
+        outcomes = []
+        self.batching = True
+        try:
+            for future, fn, args, kwargs in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    outcomes.append((future, fn(*args, **kwargs), None))
+                except BaseException as e:
+                    outcomes.append((future, None, e))
+        finally:
+            self.batching = False
+        try:
+            self.after_batch()
+        except BaseException as e:
+            outcomes = [(future, None, error or e) for future, _, error in outcomes]
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+
+def on_actor(method: Callable) -> Callable:
+    """Run a method on its object's DatabaseActor, found as ``self._actor``.
+
+    Calls are timed as the caller sees them, queueing included, under the
+    method's qualified name.
+    """
+    @metrics.timed(method.__qualname__)
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        return self._actor.call(method, self, *args, **kwargs)
+    return wrapper
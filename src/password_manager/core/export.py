@@ -0,0 +1,89 @@
+import csv
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+from password_manager.core.vault import VaultManager
+
+EXPORT_FORMATS = ("csv", "json")
+EXPORT_FIELDS = ("website", "username", "password", "totp_key", "favorite")
+JSON_ENTRY = (
+    '{{\n    "website": {},\n    "username": {},\n    "password": {},\n'
+    '    "totp_key": {},\n    "favorite": {favorite}\n  }}'
+)
+# Rows read from the vault per batch; progress is reported once per batch
+EXPORT_BATCH_SIZE = 1000
+
+
+def _write_csv(f, rows):
+    writer = csv.writer(f)
+    writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        # Rows are (id, website, username, password, totp_key, favorite)
+        writer.writerow(row[1:])
+
+
+def _write_json(f, rows):
+    # Same layout as json.dump(entries, indent=2), written one entry at a time.
+    # Only the strings go through the encoder; indented dumps of every entry
+    # would use the much slower pure-Python encoder.
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    f.write("[")
+    separator = "\n  "
+    for row in rows:
+        f.write(separator)
+        f.write(JSON_ENTRY.format(
+            *map(encode, row[1:5]), favorite="true" if row[5] else "false"
+        ))
+        separator = ",\n  "
+    # An empty list stays on one line, as json.dump writes it
+    f.write("]" if separator == "\n  " else "\n]")
+
+
+def export_passwords(vault: VaultManager, path: Path, fmt: str,
+                     progress: Optional[Callable[[int, int], None]] = None,
+                     cancel: Optional[threading.Event] = None,
+                     batch_size: int = EXPORT_BATCH_SIZE) -> bool:
+    """Stream all entries of ``vault`` to a CSV or JSON file.
+
+    Entries are read and written in batches, so memory use does not grow
+    with the vault. The file is written to a temp file next to ``path`` and
+    renamed over it when complete. ``progress(done, total)`` is called after
+    every batch. Returns False, leaving ``path`` untouched, if ``cancel`` was set.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    path = Path(path)
+    total = vault.count_entries()[0]
+    writer = _write_csv if fmt == "csv" else _write_json
+
+    def rows():
+        done = 0
+        for row in vault.iter_passwords(batch_size):
+            yield row
+            done += 1
+            if done % batch_size == 0:
+                if cancel is not None and cancel.is_set():
+                    return
+                if progress:
+                    progress(done, total)
+        if progress:
+            progress(done, total)
+
+    # mkstemp creates the file readable by the owner only, which suits a
+    # plain-text copy of the vault
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', newline='', encoding='utf-8') as f:
+            writer(f, rows())
+        if cancel is not None and cancel.is_set():
+            Path(tmp_path).unlink()
+            return False
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+    return True
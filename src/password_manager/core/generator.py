@@ -0,0 +1,152 @@
+import math
+import secrets
+import threading
+from functools import lru_cache
+
+from password_manager.core.strength import wordlist_path
+
+CHARACTER_CLASSES = {
+    "lowercase": "abcdefghijklmnopqrstuvwxyz",
+    "uppercase": "ABCDEFGHIJKLMNOPQRSTUVWXYZ",
+    "digits": "0123456789",
+    "symbols": "!@#$%^&*()_+-=[]{}|;:,.<>?",
+}
+# Used when no class is selected
+FALLBACK_CLASSES = ("lowercase", "uppercase", "digits")
+MAX_PASSWORD_LENGTH = 1024
+MAX_PASSPHRASE_WORDS = 64
+# Passwords or passphrases generated by one batch call at most
+MAX_BATCH_SIZE = 100000
+# Bytes fetched from the OS per refill of a RandomSource
+RANDOM_BUFFER_SIZE = 4096
+PASSPHRASE_WORDLIST = "passphrase"
+
+
+class RandomSource:
+    """Unbiased random choices from the OS CSPRNG, buffered.
+
+    secrets.token_bytes() is called once per RANDOM_BUFFER_SIZE bytes
+    instead of once per character. Bytes are zeroed in the buffer as they
+    are handed out, so generated secrets cannot be recovered from it.
+    Thread-safe.
+    """
+
+    def __init__(self, buffer_size: int = RANDOM_BUFFER_SIZE):
+        self._buffer_size = buffer_size
+        self._buffer = bytearray()
+        self._pos = 0
+        self._lock = threading.Lock()
+
+    def read(self, size: int) -> bytes:
+        with self._lock:
+            if self._pos + size > len(self._buffer):
+                self._buffer[:] = secrets.token_bytes(max(self._buffer_size, size))
+                self._pos = 0
+            data = bytes(self._buffer[self._pos:self._pos + size])
+            self._buffer[self._pos:self._pos + size] = bytes(size)
+            self._pos += size
+            return data
+
+    def randbelow(self, n: int) -> int:
+        """Return a uniform integer in [0, n) by rejection sampling."""
+        if n <= 0:
+            raise ValueError("n must be positive")
+        size = max((n - 1).bit_length() + 7 >> 3, 1)
+        span = 1 << 8 * size
+        # Values at or above limit would favour the low residues
+        limit = span - span % n
+        while True:
+            value = int.from_bytes(self.read(size), "big")
+            if value < limit:
+                return value % n
+
+    def choices(self, population, k: int) -> list:
+        """Return ``k`` uniform, independent picks from ``population``."""
+        n = len(population)
+        if n > 256:
+            return [population[self.randbelow(n)] for _ in range(k)]
+        # One byte per pick; bytes at or above limit are rejected
+        limit = 256 - 256 % n
+        picks = []
+        while len(picks) < k:
+            # Draw a little extra so one read usually suffices
+            needed = k - len(picks)
+            data = self.read(needed + needed * (256 - limit) // limit + 1)
+            picks.extend(population[b % n] for b in data if b < limit)
+        del picks[k:]
+        return picks
+
+
+_default_source = RandomSource()
+
+
+def _alphabet(classes) -> tuple:
+    classes = tuple(classes) or FALLBACK_CLASSES
+    unknown = [name for name in classes if name not in CHARACTER_CLASSES]
+    if unknown:
+        raise ValueError(f"Unknown character class: {unknown[0]}")
+    return classes, "".join(CHARACTER_CLASSES[name] for name in dict.fromkeys(classes))
+
+
+def generate_password(length: int, classes=tuple(CHARACTER_CLASSES), source: RandomSource = None) -> str:
+    """Generate a password with at least one character of every class in ``classes``.
+
+    Characters are drawn uniformly from all selected classes and passwords
+    missing a class are drawn again, so the result is uniform over every
+    password that satisfies the classes. Placing one character of each
+    class first and shuffling would make the rarer classes more likely.
+    """
+    classes, alphabet = _alphabet(classes)
+    if not len(classes) <= length <= MAX_PASSWORD_LENGTH:
+        raise ValueError(f"Length must be between {len(classes)} and {MAX_PASSWORD_LENGTH}")
+    source = source or _default_source
+    required = [set(CHARACTER_CLASSES[name]) for name in classes]
+    while True:
+        password = source.choices(alphabet, length)
+        present = set(password)
+        if all(not present.isdisjoint(chars) for chars in required):
+            return "".join(password)
+
+
+def password_entropy(length: int, classes=tuple(CHARACTER_CLASSES)) -> float:
+    """Bits of entropy of generate_password(length, classes), ignoring the rejection of missing classes."""
+    return length * math.log2(len(_alphabet(classes)[1]))
+
+
+@lru_cache(maxsize=None)
+def passphrase_words() -> tuple:
+    """The diceware word list, read on first use."""
+    with open(wordlist_path(PASSPHRASE_WORDLIST), encoding="utf-8") as f:
+        return tuple(dict.fromkeys(filter(None, (line.strip().lower() for line in f))))
+
+
+def generate_passphrase(words: int = 5, separator: str = "-", capitalize: bool = False,
+                        include_number: bool = False, source: RandomSource = None) -> str:
+    """Generate a diceware passphrase of ``words`` uniformly chosen words.
+
+    With ``include_number`` a random digit is appended to one random word.
+    """
+    if not 1 <= words <= MAX_PASSPHRASE_WORDS:
+        raise ValueError(f"Word count must be between 1 and {MAX_PASSPHRASE_WORDS}")
+    source = source or _default_source
+    chosen = source.choices(passphrase_words(), words)
+    if capitalize:
+        chosen = [word.capitalize() for word in chosen]
+    if include_number:
+        index = source.randbelow(words)
+        chosen[index] += str(source.randbelow(10))
+    return separator.join(chosen)
+
+
+def passphrase_entropy(words: int = 5, include_number: bool = False) -> float:
+    bits = words * math.log2(len(passphrase_words()))
+    if include_number:
+        bits += math.log2(10 * words)
+    return bits
+
+
+def generate_batch(count: int, generate, *args, **kwargs) -> list:
+    """Call ``generate`` (generate_password or generate_passphrase) ``count`` times."""
+    if not 0 <= count <= MAX_BATCH_SIZE:
+        raise ValueError(f"Batch size must be between 0 and {MAX_BATCH_SIZE}")
+    return [generate(*args, **kwargs) for _ in range(count)]
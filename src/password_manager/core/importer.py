@@ -0,0 +1,193 @@
+import csv
+import json
+import threading
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional
+
+from password_manager.core.validators import validate_url, validate_username, validate_totp_key
+from password_manager.core.vault import VaultManager
+
+# Column names used by our own exports and common password managers, per
+# field, in order of preference. Headers are matched case-insensitively.
+COLUMN_ALIASES = {
+    "website": ("website", "url", "login_uri", "web site", "uri"),
+    "username": ("username", "login_username", "login name", "user name", "login"),
+    "password": ("password", "login_password"),
+    "totp_key": ("totp_key", "totp", "login_totp", "otpauth"),
+    "favorite": ("favorite",),
+}
+# Used as the website when an entry has no URL
+TITLE_COLUMNS = ("name", "title", "account")
+# Rows between progress reports
+IMPORT_PROGRESS_ROWS = 1000
+# Invalid rows described in the result; the rest are only counted
+MAX_REPORTED_ERRORS = 20
+
+
+class ImportResult(NamedTuple):
+    """Outcome of an import or dry run."""
+    source: str
+    total: int
+    # Entries added, or that would be added by a dry run
+    new: int
+    duplicates: int
+    invalid: int
+    errors: list
+
+
+def _column_map(header: list) -> dict:
+    columns = {name.strip().lower(): index for index, name in enumerate(header)}
+    mapping = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in columns:
+                mapping[field] = columns[alias]
+                break
+    for alias in TITLE_COLUMNS:
+        if alias in columns:
+            mapping["title"] = columns[alias]
+            break
+    return mapping
+
+
+def _csv_source(header: list) -> str:
+    names = {name.strip().lower() for name in header}
+    if "login_uri" in names:
+        return "Bitwarden CSV"
+    if "title" in names and "group" in names:
+        return "KeePass CSV"
+    if "website" in names and "totp_key" in names:
+        return "Password Manager CSV"
+    return "CSV"
+
+
+def _parse_bool(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes")
+    return bool(value)
+
+
+def _read_csv(f):
+    reader = csv.reader(f)
+    header = next(reader, [])
+    mapping = _column_map(header)
+    if "password" not in mapping:
+        raise ValueError("No password column found")
+
+    def records():
+        for row in reader:
+            if not any(cell.strip() for cell in row):
+                continue
+            record = {field: row[index] if index < len(row) else "" for field, index in mapping.items()}
+            record["website"] = record.get("website") or record.get("title", "")
+            yield record
+
+    return _csv_source(header), records()
+
+
+def _read_json(f):
+    data = json.load(f)
+    if isinstance(data, list):
+        return "Password Manager JSON", iter(data)
+    if isinstance(data, dict) and isinstance(data.get("items"), list):
+        return "Bitwarden JSON", _bitwarden_records(data["items"])
+    raise ValueError("Unrecognized JSON export")
+
+
+def _bitwarden_records(items: list):
+    for item in items:
+        login = item.get("login")
+        # Only logins; notes, cards and identities have no password
+        if not isinstance(login, dict):
+            continue
+        uris = login.get("uris") or []
+        website = uris[0].get("uri", "") if uris else ""
+        yield {
+            "website": website or item.get("name", ""),
+            "username": login.get("username") or "",
+            "password": login.get("password") or "",
+            "totp_key": login.get("totp") or "",
+            "favorite": item.get("favorite", False),
+        }
+
+
+def _validate(record: dict) -> tuple:
+    """Return (row, error); row is None if the record is invalid."""
+    if not isinstance(record, dict):
+        return None, "not an entry"
+    website = str(record.get("website") or "").strip()
+    username = str(record.get("username") or "").strip()
+    password = str(record.get("password") or "")
+    totp_key = str(record.get("totp_key") or "").strip()
+    if not validate_url(website):
+        return None, f"invalid website '{website}'"
+    if not validate_username(username):
+        return None, "missing username"
+    if not password:
+        return None, "missing password"
+    if not validate_totp_key(totp_key):
+        return None, "invalid TOTP key"
+    return (website, username, password, totp_key, int(_parse_bool(record.get("favorite", False)))), None
+
+
+def _first_character(f) -> str:
+    """Return the first character that is not whitespace, "" for a blank file."""
+    while True:
+        char = f.read(1)
+        if not char or not char.isspace():
+            return char
+
+
+def import_passwords(vault: VaultManager, path: Path, dry_run: bool = False,
+                     progress: Optional[Callable[[int, int], None]] = None,
+                     cancel: Optional[threading.Event] = None) -> Optional[ImportResult]:
+    """Import entries from a CSV or JSON export into ``vault``.
+
+    Our own CSV and JSON exports, Bitwarden CSV and JSON, KeePass CSV and
+    browser CSV exports are recognized by their columns. Every row is
+    validated, rows whose (website, username) already exists in the vault
+    or earlier in the file are skipped, and the rest are inserted in a
+    single transaction followed by one save. With ``dry_run`` nothing is
+    inserted. Returns None if ``cancel`` was set before the insert.
+    """
+    path = Path(path)
+    with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+        # Sniff the first character rather than trusting the extension
+        first = _first_character(f)
+        f.seek(0)
+        source, records = _read_json(f) if first in ("[", "{") else _read_csv(f)
+        records = list(records)
+
+    total = len(records)
+    rows = []
+    errors = []
+    invalid = 0
+    for number, record in enumerate(records, 1):
+        row, error = _validate(record)
+        if row is None:
+            invalid += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append(f"Entry {number}: {error}")
+        else:
+            rows.append(row)
+        if number % IMPORT_PROGRESS_ROWS == 0:
+            if cancel is not None and cancel.is_set():
+                return None
+            if progress:
+                progress(number, total)
+
+    # Drop repeats within the file, then logins the vault already has
+    unique = {}
+    for row in rows:
+        unique.setdefault(row[:2], row)
+    existing = vault.existing_logins(unique.keys())
+    new_rows = [row for login, row in unique.items() if login not in existing]
+    duplicates = len(rows) - len(new_rows)
+
+    if cancel is not None and cancel.is_set():
+        return None
+    if not dry_run and new_rows:
+        vault.add_passwords(new_rows)
+    if progress:
+        progress(total, total)
+    return ImportResult(source, total, len(new_rows), duplicates, invalid, errors)
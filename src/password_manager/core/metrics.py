@@ -0,0 +1,247 @@
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+# Set to 1 to record metrics from startup, or to a .json path to also
+# write them there when the app quits. The diagnostics panel can turn
+# recording on at runtime too (Ctrl+Shift+D).
+METRICS_ENV = "PASSWORD_MANAGER_METRICS"
+
+# Upper bucket bounds; values above the last one land in an overflow bucket
+LATENCY_BOUNDS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+SIZE_BOUNDS_BYTES = tuple(256 * 4 ** i for i in range(12))  # 256 B .. 1 GiB
+COUNT_BOUNDS = tuple(2 ** i for i in range(9))  # 1 .. 256
+
+# Frames kept per allocation while a capture traces memory
+CAPTURE_TRACE_FRAMES = 10
+CAPTURE_TOP_ALLOCATIONS = 50
+
+
+class Histogram:
+    """Counts of observed values per bucket, with their sum and extremes."""
+
+    def __init__(self, bounds: tuple):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value: float):
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Estimate the value below which ``fraction`` of the values fall.
+
+        Interpolates within the bucket holding that rank, narrowed to the
+        observed minimum and maximum.
+        """
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            if n and seen + n >= rank:
+                lower = max(self.bounds[i - 1] if i else self.min, self.min)
+                upper = min(self.bounds[i] if i < len(self.bounds) else self.max, self.max)
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            # [upper bound or None for the overflow bucket, count], empty buckets left out
+            "buckets": [
+                [self.bounds[i] if i < len(self.bounds) else None, n]
+                for i, n in enumerate(self.buckets) if n
+            ],
+        }
+
+
+class Metrics:
+    """Counters and histograms recorded while ``enabled`` is set.
+
+    Recording points check ``enabled`` before doing anything else, so
+    leaving it off costs one attribute read per call. Updates come from
+    the GUI, database and save threads and are serialized by a lock.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._since = time.time()
+
+    def count(self, name: str, n: int = 1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def observe(self, name: str, value: float, bounds: tuple = LATENCY_BOUNDS_MS):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram(bounds)
+            histogram.observe(value)
+
+    def timed(self, name: Optional[str] = None) -> Callable:
+        """Decorator recording the latency of each call, in ms, under ``name`` (default: qualified name)."""
+        def decorate(fn):
+            key = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.observe(key, (time.perf_counter() - start) * 1000)
+            return wrapper
+        return decorate
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._since = time.time()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "since": self._since,
+                "now": time.time(),
+                "counters": dict(sorted(self._counters.items())),
+                "histograms": {name: h.to_dict() for name, h in sorted(self._histograms.items())},
+            }
+
+    def dump(self, path: Path, extra: Optional[dict] = None):
+        """Write snapshot() as JSON, with ``extra`` sections merged in."""
+        data = self.snapshot()
+        if extra:
+            data.update(extra)
+        Path(path).write_text(json.dumps(data, indent=2))
+
+
+def _env_enabled() -> bool:
+    return bool(os.environ.get(METRICS_ENV))
+
+
+def env_dump_path() -> Optional[Path]:
+    """The path METRICS_ENV names, if it names one rather than just turning recording on."""
+    value = os.environ.get(METRICS_ENV, "")
+    return Path(value) if value.endswith(".json") else None
+
+
+metrics = Metrics(enabled=_env_enabled())
+
+
+def timed_slots(cls):
+    """Class decorator recording the latency of every pyqtSlot as ``slot.<Class>.<name>``.
+
+    The wrappers keep the slot signatures, and PyQt looks slots up by name
+    when QML calls them, so the wrappers are what runs.
+    """
+    for name, attr in list(vars(cls).items()):
+        if callable(attr) and hasattr(attr, "__pyqtSignature__"):
+            setattr(cls, name, metrics.timed(f"slot.{cls.__name__}.{name}")(attr))
+    return cls
+
+
+def track_resets(model):
+    """Count and time the resets of a Qt item model as ``model_reset.<Class>``."""
+    name = f"model_reset.{type(model).__name__}"
+    started = []
+
+    def about_to_reset():
+        if metrics.enabled:
+            started.append(time.perf_counter())
+
+    def reset():
+        if started:
+            metrics.observe(name, (time.perf_counter() - started.pop()) * 1000)
+
+    model.modelAboutToBeReset.connect(about_to_reset)
+    model.modelReset.connect(reset)
+
+
+class ProfileCapture:
+    """Profiles the calling thread and traces allocations between start() and stop().
+
+    cProfile only sees the thread that started it, normally the GUI thread;
+    time spent on the database thread shows up in the latency histograms.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._profile = None
+        self._snapshot = None
+        self._started_tracing = False
+
+    @property
+    def active(self) -> bool:
+        return self._profile is not None
+
+    def start(self):
+        # Imported here, since most runs never capture
+        import cProfile
+        import tracemalloc
+
+        if self.active:
+            return
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start(CAPTURE_TRACE_FRAMES)
+        self._snapshot = tracemalloc.take_snapshot()
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def stop(self) -> list:
+        """End the capture and return the paths of the profile and the allocation report."""
+        import tracemalloc
+
+        if not self.active:
+            return []
+        self._profile.disable()
+        profile, self._profile = self._profile, None
+        allocations = tracemalloc.take_snapshot().compare_to(self._snapshot, "lineno")
+        traced, peak = tracemalloc.get_traced_memory()
+        if self._started_tracing:
+            tracemalloc.stop()
+        self._snapshot = None
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stem = self.directory / time.strftime("capture-%Y%m%d-%H%M%S")
+        profile_path = stem.with_suffix(".prof")
+        profile.dump_stats(str(profile_path))
+        alloc_path = stem.with_suffix(".alloc.txt")
+        lines = [f"traced {traced} bytes, peak {peak} bytes", ""]
+        lines += [str(stat) for stat in allocations[:CAPTURE_TOP_ALLOCATIONS]]
+        alloc_path.write_text("\n".join(lines) + "\n")
+        return [profile_path, alloc_path]
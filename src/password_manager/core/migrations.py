@@ -0,0 +1,139 @@
+from password_manager.core.audit import AUDIT_SCHEMA, STRENGTH_SCHEMA, SYNC_SCHEMA, audit_key
+
+# Full-text index over the searchable columns. It is an external-content
+# table, so it holds only the trigram index and reads text from passwords.
+# The trigram tokenizer matches arbitrary substrings of 3+ characters.
+SEARCH_INDEX_SCHEMA = (
+    """
+    CREATE VIRTUAL TABLE passwords_fts USING fts5(
+        website, username,
+        content='passwords', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER passwords_fts_insert AFTER INSERT ON passwords BEGIN
+        INSERT INTO passwords_fts(rowid, website, username)
+        VALUES (new.id, new.website, new.username);
+    END
+    """,
+    """
+    CREATE TRIGGER passwords_fts_delete AFTER DELETE ON passwords BEGIN
+        INSERT INTO passwords_fts(passwords_fts, rowid, website, username)
+        VALUES ('delete', old.id, old.website, old.username);
+    END
+    """,
+    """
+    CREATE TRIGGER passwords_fts_update AFTER UPDATE OF website, username ON passwords BEGIN
+        INSERT INTO passwords_fts(passwords_fts, rowid, website, username)
+        VALUES ('delete', old.id, old.website, old.username);
+        INSERT INTO passwords_fts(rowid, website, username)
+        VALUES (new.id, new.website, new.username);
+    END
+    """,
+    "INSERT INTO passwords_fts(passwords_fts) VALUES ('rebuild')",
+)
+
+
+def _columns(cursor, table: str) -> list:
+    cursor.execute(f"PRAGMA table_info({table})")
+    return [col[1] for col in cursor.fetchall()]
+
+
+def _baseline(cursor):
+    """Everything vaults got before the schema was versioned; each step checks whether it is needed."""
+    columns = _columns(cursor, "passwords")
+    if 'totp_key' not in columns:
+        cursor.execute("ALTER TABLE passwords ADD COLUMN totp_key TEXT DEFAULT ''")
+    if 'favorite' not in columns:
+        cursor.execute("ALTER TABLE passwords ADD COLUMN favorite INTEGER DEFAULT 0")
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'passwords_fts'")
+    if not cursor.fetchone():
+        for statement in SEARCH_INDEX_SCHEMA:
+            cursor.execute(statement)
+    for statement in AUDIT_SCHEMA:
+        cursor.execute(statement)
+    audit_key(cursor)
+
+
+def _lookup_indexes(cursor):
+    # Logins are looked up by website, or website and username, for
+    # duplicate detection; the composite index serves both
+    cursor.execute("CREATE INDEX IF NOT EXISTS passwords_login ON passwords(website, username)")
+    # Favorites are few, so the filter and its count read only their rows
+    cursor.execute("CREATE INDEX IF NOT EXISTS passwords_favorite ON passwords(favorite) WHERE favorite")
+
+
+def _timestamps(cursor):
+    columns = _columns(cursor, "passwords")
+    # NULL until the entry is first edited or used
+    if 'updated_at' not in columns:
+        cursor.execute("ALTER TABLE passwords ADD COLUMN updated_at TIMESTAMP")
+    if 'last_used_at' not in columns:
+        cursor.execute("ALTER TABLE passwords ADD COLUMN last_used_at TIMESTAMP")
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS passwords_updated
+        AFTER UPDATE OF website, username, password, totp_key ON passwords
+        BEGIN
+            UPDATE passwords SET updated_at = CURRENT_TIMESTAMP, last_used_at = CURRENT_TIMESTAMP
+            WHERE id = new.id;
+        END
+    """)
+    # Using an entry is recorded by bumping its use count; see VaultManager.record_use()
+    if 'use_count' not in columns:
+        cursor.execute("ALTER TABLE passwords ADD COLUMN use_count INTEGER NOT NULL DEFAULT 0")
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS passwords_used AFTER UPDATE OF use_count ON passwords
+        BEGIN
+            UPDATE passwords SET last_used_at = CURRENT_TIMESTAMP WHERE id = new.id;
+        END
+    """)
+
+
+def _strength_scores(cursor):
+    # Indexes built before strength was estimated lack the column
+    if 'strength' not in _columns(cursor, "password_audit"):
+        cursor.execute("ALTER TABLE password_audit ADD COLUMN strength INTEGER")
+    for statement in STRENGTH_SCHEMA:
+        cursor.execute(statement)
+
+
+def _audit_sync_marker(cursor):
+    for statement in SYNC_SCHEMA:
+        cursor.execute(statement)
+    # Checked with a full sync on the next open, as the marker was not kept before
+    cursor.execute("INSERT OR REPLACE INTO vault_meta (key, value) VALUES ('audit_synced', 0)")
+
+
+# Applied in order; a vault's PRAGMA user_version is the number it has had.
+# Append new migrations, never change or reorder released ones. Each must
+# be safe to run again on a database that already has its changes.
+MIGRATIONS = (
+    _baseline,
+    _lookup_indexes,
+    _timestamps,
+    _strength_scores,
+    _audit_sync_marker,
+)
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def migrate(conn) -> int:
+    """Apply the migrations a database lacks, each in its own transaction.
+
+    An up-to-date database is only asked for its version. Databases from a
+    newer release are left alone. Returns the number of migrations applied.
+    """
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version >= SCHEMA_VERSION:
+        return 0
+    cursor = conn.cursor()
+    for number in range(version, SCHEMA_VERSION):
+        cursor.execute("BEGIN")
+        try:
+            MIGRATIONS[number](cursor)
+            cursor.execute(f"PRAGMA user_version = {number + 1}")
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+    return SCHEMA_VERSION - version
@@ -0,0 +1,89 @@
+import threading
+import time
+from typing import Callable, Optional
+
+
+class SaveScheduler:
+    """Runs a flush callback on a background thread once edits settle down.
+
+    Every call to schedule() pushes the flush back by ``delay`` seconds, so a
+    burst of edits is written in a single flush, but never later than
+    ``max_delay`` seconds after the first unsaved edit.
+    """
+
+    def __init__(self, flush: Callable[[], None], delay: float, max_delay: Optional[float] = None):
+        self._flush = flush
+        self.delay = delay
+        self.max_delay = max_delay if max_delay is not None else delay * 10
+
+        # Called from the thread that runs the flush
+        self.on_saving: Optional[Callable[[], None]] = None
+        self.on_saved: Optional[Callable[[], None]] = None
+        self.on_failed: Optional[Callable[[str], None]] = None
+
+        self._cond = threading.Condition()
+        self._due: Optional[float] = None
+        self._deadline: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def pending(self) -> bool:
+        with self._cond:
+            return self._due is not None
+
+    def schedule(self):
+        """Request a flush after the debounce window."""
+        with self._cond:
+            now = time.monotonic()
+            if self._due is None:
+                self._deadline = now + self.max_delay
+            self._due = min(now + self.delay, self._deadline)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="vault-save", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def cancel(self):
+        """Drop a pending flush without running it."""
+        with self._cond:
+            self._due = None
+            self._deadline = None
+
+    def flush_now(self):
+        """Run a pending flush immediately on the calling thread."""
+        with self._cond:
+            if self._due is None:
+                return
+            self._due = None
+            self._deadline = None
+        self._run_flush()
+
+    def _run(self):
+        with self._cond:
+            while True:
+                if self._due is None:
+                    self._cond.wait()
+                    continue
+                remaining = self._due - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+                self._due = None
+                self._deadline = None
+                self._cond.release()
+                try:
+                    self._run_flush()
+                finally:
+                    self._cond.acquire()
+
+    def _run_flush(self):
+        if self.on_saving:
+            self.on_saving()
+        try:
+            self._flush()
+        except Exception as e:
+            if self.on_failed:
+                self.on_failed(str(e))
+        else:
+            if self.on_saved:
+                self.on_saved()
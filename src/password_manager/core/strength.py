@@ -0,0 +1,428 @@
+import datetime
+import math
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+# Password strength estimated as the number of guesses an attacker who knows
+# common passwords, words, names and keyboard patterns needs, after the
+# zxcvbn approach: the password is covered by the sequence of pattern
+# matches (and brute-forced gaps) that is cheapest to guess.
+
+# Ranked word lists bundled in resources/wordlists, most common first
+DICTIONARIES = ("passwords", "english", "names")
+# score is the number of these guesses thresholds the estimate reaches
+SCORE_THRESHOLDS = (1e3, 1e6, 1e8, 1e10)
+SCORE_LABELS = ("Very weak", "Weak", "Fair", "Strong", "Very strong")
+# Passwords scoring below this are reported as weak
+MIN_SCORE = 3
+
+_BRUTEFORCE_CARDINALITY = 10
+_MIN_GUESSES_BEFORE_GROWING_SEQUENCE = 10000
+_MIN_SUBMATCH_GUESSES_SINGLE_CHAR = 10
+_MIN_SUBMATCH_GUESSES_MULTI_CHAR = 50
+_MIN_YEAR_SPACE = 20
+_MAX_SEQUENCE_DELTA = 5
+# Longer passwords are estimated from this prefix; extra characters only add
+# guesses, and the matcher is quadratic in the length
+MAX_ESTIMATE_LENGTH = 64
+
+# Letters and the characters commonly substituted for them
+_L33T_TABLE = {
+    "a": "4@", "b": "8", "c": "({[<", "e": "3", "g": "69", "i": "1!|",
+    "l": "1|7", "o": "0", "s": "$5", "t": "+7", "x": "%", "z": "2",
+}
+_L33T_LETTERS = {}
+for _letter, _subs in _L33T_TABLE.items():
+    for _sub in _subs:
+        _L33T_LETTERS.setdefault(_sub, []).append(_letter)
+
+# Keyboard layouts; each key lists its unshifted and shifted character
+_QWERTY = r"""
+`~ 1! 2@ 3# 4$ 5% 6^ 7& 8* 9( 0) -_ =+
+    qQ wW eE rR tT yY uU iI oO pP [{ ]} \|
+     aA sS dD fF gG hH jJ kK lL ;: '"
+      zZ xX cC vV bB nN mM ,< .> /?
+"""
+_KEYPAD = """
+  / * -
+7 8 9 +
+4 5 6
+1 2 3
+  0 .
+"""
+
+_REPEAT_GREEDY = re.compile(r"(.+)\1+")
+_REPEAT_LAZY = re.compile(r"(.+?)\1+")
+_REPEAT_LAZY_ANCHORED = re.compile(r"^(.+?)\1+$")
+_RECENT_YEAR = re.compile(r"19\d\d|20\d\d")
+
+_WARNINGS = {
+    "top_password": "This is a top-10 common password",
+    "common_password": "This is a very common password",
+    "similar_password": "This is similar to a commonly used password",
+    "reversed": "Reversed words aren't much harder to guess",
+    "english": "A word by itself is easy to guess",
+    "names": "Names and surnames by themselves are easy to guess",
+    "straight_row": "Straight rows of keys are easy to guess",
+    "keyboard_pattern": "Short keyboard patterns are easy to guess",
+    "repeat_char": 'Repeats like "aaa" are easy to guess',
+    "repeat": 'Repeats like "abcabcabc" are only slightly harder to guess than "abc"',
+    "sequence": "Sequences like abc or 6543 are easy to guess",
+    "year": "Recent years are easy to guess",
+}
+
+
+class PasswordStrength(NamedTuple):
+    """Estimated guesses to crack a password, their log2 and a 0-4 score."""
+    guesses: float
+    bits: float
+    score: int
+    warning: str
+
+    @property
+    def label(self) -> str:
+        return SCORE_LABELS[self.score]
+
+
+class _Match(NamedTuple):
+    i: int
+    j: int
+    pattern: str
+    guesses: float
+    # dictionary name, spatial turns, repeated base... used for warnings
+    detail: object = None
+
+
+def wordlist_path(name: str) -> Path:
+    """Path of a bundled word list; core cannot use app.get_resource_path, which imports Qt."""
+    if getattr(sys, "frozen", False):
+        base_path = Path(sys._MEIPASS)
+    else:
+        base_path = Path(__file__).resolve().parent.parent
+    return base_path / "resources" / "wordlists" / f"{name}.txt"
+
+
+@lru_cache(maxsize=None)
+def _dictionary_trie() -> dict:
+    """Build one trie over all word lists on first use.
+
+    Nodes are dicts keyed by character; the None key of a node that ends a
+    word holds its best (rank, dictionary).
+    """
+    root = {}
+    for name in DICTIONARIES:
+        with open(wordlist_path(name), encoding="utf-8") as f:
+            words = [line.strip().lower() for line in f]
+        for rank, word in enumerate(filter(None, words), 1):
+            node = root
+            for char in word:
+                node = node.setdefault(char, {})
+            if None not in node or rank < node[None][0]:
+                node[None] = (rank, name)
+    return root
+
+
+def _adjacency_graph(layout: str, slanted: bool) -> dict:
+    """Map each character to its neighbouring keys, in a fixed direction order."""
+    positions = {}
+    lines = layout.split("\n")
+    for y, line in enumerate(lines):
+        slant = y - 1 if slanted else 0
+        for token in line.split():
+            x, _ = divmod(line.index(token) - slant, len(token) + 1)
+            positions[(x, y)] = token
+    if slanted:
+        directions = ((-1, 0), (0, -1), (1, -1), (1, 0), (0, 1), (-1, 1))
+    else:
+        directions = ((-1, 0), (-1, -1), (0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1))
+    graph = {}
+    for (x, y), token in positions.items():
+        neighbours = [positions.get((x + dx, y + dy)) for dx, dy in directions]
+        for char in token:
+            graph[char] = neighbours
+    return graph
+
+
+@lru_cache(maxsize=None)
+def _keyboard_graphs() -> tuple:
+    """(graph, shifted characters, starting positions, average degree) per keyboard."""
+    graphs = []
+    for layout, slanted in ((_QWERTY, True), (_KEYPAD, False)):
+        graph = _adjacency_graph(layout, slanted)
+        keys = [token for token in layout.split() if token]
+        shifted = {token[1] for token in keys if len(token) > 1}
+        degree = sum(len(list(filter(None, graph[token[0]]))) for token in keys) / len(keys)
+        graphs.append((graph, shifted, len(keys), degree))
+    return tuple(graphs)
+
+
+def _variations(special: int, plain: int) -> int:
+    """Ways to place ``special`` characters among ``plain`` ones, at most half either way."""
+    if not special or not plain:
+        return 2
+    return sum(math.comb(special + plain, k) for k in range(1, min(special, plain) + 1))
+
+
+def _uppercase_variations(token: str) -> int:
+    if token.islower() or not any(char.isalpha() for char in token):
+        return 1
+    if token.isupper() or token[1:].islower() or token[:-1].islower():
+        return 2
+    upper = sum(char.isupper() for char in token)
+    lower = sum(char.islower() for char in token)
+    return _variations(upper, lower)
+
+
+def _dictionary_matches(password: str, text: str, reverse: bool) -> list:
+    """Walk the trie from every position of ``text``, trying l33t readings too."""
+    trie = _dictionary_trie()
+    n = len(text)
+    matches = []
+    for start in range(n):
+        stack = [(trie, start, ())]
+        while stack:
+            node, pos, subs = stack.pop()
+            if None in node and pos > start:
+                rank, name = node[None]
+                i, j = (n - pos, n - 1 - start) if reverse else (start, pos - 1)
+                token = password[i:j + 1]
+                guesses = rank * _uppercase_variations(token)
+                lowered = token.lower()
+                for sub, letter in subs:
+                    guesses *= _variations(lowered.count(sub), lowered.count(letter))
+                if reverse:
+                    if lowered == lowered[::-1]:
+                        continue
+                    guesses *= 2
+                matches.append(_Match(i, j, "dictionary", guesses, (name, rank, bool(subs), reverse)))
+            if pos == n:
+                continue
+            char = text[pos]
+            child = node.get(char)
+            if child is not None:
+                stack.append((child, pos + 1, subs))
+            # A substituted character stands for the same letter throughout
+            mapped = dict(subs).get(char)
+            for letter in _L33T_LETTERS.get(char, ()):
+                child = node.get(letter)
+                if child is not None and mapped in (None, letter):
+                    stack.append((child, pos + 1, subs if mapped else subs + ((char, letter),)))
+    return matches
+
+
+def _spatial_matches(password: str) -> list:
+    matches = []
+    for graph, shift_chars, starts, degree in _keyboard_graphs():
+        i = 0
+        while i < len(password) - 1:
+            j = i + 1
+            last_direction = None
+            turns = 0
+            shifted = int(password[i] in shift_chars)
+            while True:
+                found = False
+                if j < len(password):
+                    for direction, neighbour in enumerate(graph.get(password[j - 1], ())):
+                        if neighbour and password[j] in neighbour:
+                            found = True
+                            if neighbour.index(password[j]) == 1:
+                                shifted += 1
+                            if direction != last_direction:
+                                turns += 1
+                                last_direction = direction
+                            break
+                if found:
+                    j += 1
+                    continue
+                if j - i > 2:
+                    length = j - i
+                    guesses = 0
+                    for k in range(2, length + 1):
+                        for t in range(1, min(turns, k - 1) + 1):
+                            guesses += math.comb(k - 1, t - 1) * starts * degree ** t
+                    if shifted:
+                        guesses *= _variations(shifted, length - shifted)
+                    matches.append(_Match(i, j - 1, "spatial", guesses, turns))
+                i = j
+                break
+    return matches
+
+
+def _repeat_matches(password: str) -> list:
+    matches = []
+    pos = 0
+    while pos < len(password):
+        greedy = _REPEAT_GREEDY.search(password, pos)
+        if not greedy:
+            break
+        lazy = _REPEAT_LAZY.search(password, pos)
+        if len(greedy.group(0)) > len(lazy.group(0)):
+            match = greedy
+            base = _REPEAT_LAZY_ANCHORED.match(match.group(0)).group(1)
+        else:
+            match = lazy
+            base = match.group(1)
+        count = len(match.group(0)) // len(base)
+        guesses = _estimate_guesses(base) * count
+        matches.append(_Match(match.start(), match.end() - 1, "repeat", guesses, base))
+        pos = match.end()
+    return matches
+
+
+def _sequence_matches(password: str) -> list:
+    matches = []
+
+    def add(i, j, delta):
+        if (j - i > 1 or abs(delta) == 1) and 0 < abs(delta) <= _MAX_SEQUENCE_DELTA:
+            token = password[i:j + 1]
+            base = 4 if token[0] in "aAzZ019" else (10 if token[0].isdigit() else 26)
+            if delta < 0:
+                base *= 2
+            matches.append(_Match(i, j, "sequence", base * len(token)))
+
+    if len(password) < 2:
+        return matches
+    i = 0
+    last_delta = None
+    for k in range(1, len(password)):
+        delta = ord(password[k]) - ord(password[k - 1])
+        if last_delta is None:
+            last_delta = delta
+        if delta == last_delta:
+            continue
+        add(i, k - 1, last_delta)
+        i = k - 1
+        last_delta = delta
+    add(i, len(password) - 1, last_delta)
+    return matches
+
+
+def _year_matches(password: str) -> list:
+    this_year = datetime.date.today().year
+    return [
+        _Match(m.start(), m.end() - 1, "year", max(abs(int(m.group(0)) - this_year), _MIN_YEAR_SPACE))
+        for m in _RECENT_YEAR.finditer(password)
+    ]
+
+
+def _omnimatch(password: str) -> list:
+    lowered = password.lower()
+    return (
+        _dictionary_matches(password, lowered, False)
+        + _dictionary_matches(password, lowered[::-1], True)
+        + _spatial_matches(password)
+        + _repeat_matches(password)
+        + _sequence_matches(password)
+        + _year_matches(password)
+    )
+
+
+def _most_guessable(password: str) -> tuple:
+    """Return (guesses, matches) of the cheapest way to guess ``password``.
+
+    Dynamic programming over prefix length and number of matches: l matches
+    cost l! times the product of their guesses, plus a penalty per extra
+    match so that one long pattern beats many short ones.
+    """
+    n = len(password)
+    if not n:
+        return 1, []
+    by_end = [[] for _ in range(n)]
+    for match in _omnimatch(password):
+        by_end[match.j].append(match)
+    # best[k][l]: (guesses, product, match) covering password[:k + 1] with l matches
+    best = [{} for _ in range(n)]
+
+    def guesses_of(match):
+        length = match.j - match.i + 1
+        if length == n:
+            minimum = 1
+        elif length == 1:
+            minimum = _MIN_SUBMATCH_GUESSES_SINGLE_CHAR
+        else:
+            minimum = _MIN_SUBMATCH_GUESSES_MULTI_CHAR
+        return max(match.guesses, minimum)
+
+    def update(match, count):
+        k = match.j
+        product = guesses_of(match)
+        if count > 1:
+            product *= best[match.i - 1][count - 1][1]
+        total = math.factorial(count) * product + _MIN_GUESSES_BEFORE_GROWING_SEQUENCE ** (count - 1)
+        for other_count, (other_total, _, _) in best[k].items():
+            if other_count <= count and other_total <= total:
+                return
+        best[k][count] = (total, product, match)
+
+    def bruteforce(i, k):
+        length = k - i + 1
+        guesses = _BRUTEFORCE_CARDINALITY ** length
+        if length < n:
+            guesses = max(guesses, (_MIN_SUBMATCH_GUESSES_SINGLE_CHAR if length == 1
+                                    else _MIN_SUBMATCH_GUESSES_MULTI_CHAR) + 1)
+        return _Match(i, k, "bruteforce", guesses)
+
+    for k in range(n):
+        for match in by_end[k]:
+            if match.i > 0:
+                for count in list(best[match.i - 1]):
+                    update(match, count + 1)
+            else:
+                update(match, 1)
+        update(bruteforce(0, k), 1)
+        for i in range(1, k + 1):
+            match = bruteforce(i, k)
+            for count, (_, _, last) in list(best[i - 1].items()):
+                if last.pattern != "bruteforce":
+                    update(match, count + 1)
+
+    count, (total, _, _) = min(best[n - 1].items(), key=lambda item: item[1][0])
+    sequence = []
+    k = n - 1
+    while k >= 0:
+        match = best[k][count][2]
+        sequence.append(match)
+        k = match.i - 1
+        count -= 1
+    sequence.reverse()
+    return total, sequence
+
+
+def _estimate_guesses(password: str) -> float:
+    return _most_guessable(password)[0]
+
+
+def _warning(sequence: list, score: int) -> str:
+    if score > 2 or not sequence:
+        return ""
+    match = max(sequence, key=lambda m: m.j - m.i)
+    if match.pattern == "dictionary":
+        name, rank, l33t, reverse = match.detail
+        if reverse:
+            return _WARNINGS["reversed"]
+        if name == "passwords":
+            if len(sequence) == 1 and not l33t:
+                return _WARNINGS["top_password" if rank <= 10 else "common_password"]
+            return _WARNINGS["similar_password"]
+        return _WARNINGS[name] if len(sequence) == 1 else ""
+    if match.pattern == "spatial":
+        return _WARNINGS["straight_row" if match.detail == 1 else "keyboard_pattern"]
+    if match.pattern == "repeat":
+        return _WARNINGS["repeat_char" if len(match.detail) == 1 else "repeat"]
+    if match.pattern in ("sequence", "year"):
+        return _WARNINGS[match.pattern]
+    return ""
+
+
+def estimate_strength(password: str) -> PasswordStrength:
+    """Estimate how many guesses ``password`` withstands.
+
+    The word lists are loaded and indexed on the first call. Results are not
+    cached, so passwords are not kept in memory.
+    """
+    guesses, sequence = _most_guessable(password[:MAX_ESTIMATE_LENGTH])
+    score = sum(guesses >= threshold for threshold in SCORE_THRESHOLDS)
+    return PasswordStrength(guesses, math.log2(guesses), score, _warning(sequence, score))
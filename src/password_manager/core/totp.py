@@ -3,42 +3,184 @@ import hashlib
 import struct
 import time
 import base64
+from collections import OrderedDict
+from typing import Callable, NamedTuple, Optional
+from urllib.parse import urlsplit, parse_qs
+
+
+ALGORITHMS = {
+    "SHA1": hashlib.sha1,
+    "SHA256": hashlib.sha256,
+    "SHA512": hashlib.sha512,
+}
+
+
+class TotpKey(NamedTuple):
+    """A decoded TOTP secret with its generation parameters."""
+    secret: bytes
+    algorithm: str = "SHA1"
+    digits: int = 6
+    period: int = 30
+
+
+def decode_base32_secret(secret: str) -> bytes:
+    """Decode a base32 secret, ignoring spaces, case and missing padding."""
+    # Clean up the secret (remove spaces and convert to uppercase)
+    secret = secret.replace(" ", "").upper().rstrip("=")
+
+    # Add padding if necessary
+    padding = 8 - (len(secret) % 8)
+    if padding != 8:
+        secret += "=" * padding
+
+    return base64.b32decode(secret)
+
+
+def parse_totp_key(value: str, interval: int = 30, digits: int = 6) -> TotpKey:
+    """Parse a base32 secret or an otpauth://totp/ URI.
+
+    Raises ValueError if the secret or any URI parameter is invalid.
+    """
+    value = value.strip()
+    if not value.lower().startswith("otpauth://"):
+        return TotpKey(decode_base32_secret(value), "SHA1", digits, interval)
+
+    uri = urlsplit(value)
+    if uri.netloc.lower() != "totp":
+        raise ValueError("Only otpauth://totp/ URIs are supported")
+    params = {name.lower(): values[-1] for name, values in parse_qs(uri.query).items()}
+    if not params.get("secret"):
+        raise ValueError("otpauth URI has no secret")
+
+    algorithm = params.get("algorithm", "SHA1").upper()
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unsupported TOTP algorithm: {algorithm}")
+    digits = int(params.get("digits", digits))
+    period = int(params.get("period", interval))
+    if not 6 <= digits <= 10 or period <= 0:
+        raise ValueError("Invalid TOTP digits or period")
+
+    return TotpKey(decode_base32_secret(params["secret"]), algorithm, digits, period)
+
+
+def compute_totp(key: TotpKey, for_time: Optional[float] = None) -> str:
+    """Compute the TOTP code of an already decoded key."""
+    if for_time is None:
+        for_time = time.time()
+    return _hotp(key, int(for_time) // key.period)
+
+
+def _hotp(key: TotpKey, counter: int) -> str:
+    # Pack counter as big-endian 8-byte integer
+    counter_bytes = struct.pack(">Q", counter)
+
+    hmac_hash = hmac.new(key.secret, counter_bytes, ALGORITHMS[key.algorithm]).digest()
+
+    # Dynamic truncation
+    offset = hmac_hash[-1] & 0x0F
+    code = struct.unpack(">I", hmac_hash[offset:offset + 4])[0]
+    code = (code & 0x7FFFFFFF) % (10 ** key.digits)
+
+    # Pad with zeros if necessary
+    return str(code).zfill(key.digits)
 
 
 def generate_totp(secret: str, interval: int = 30, digits: int = 6) -> str:
-    """Generate a TOTP code from a base32-encoded secret."""
+    """Generate a TOTP code from a base32-encoded secret or otpauth URI."""
     if not secret:
         return ""
 
     try:
-        # Clean up the secret (remove spaces and convert to uppercase)
-        secret = secret.replace(" ", "").upper()
+        return compute_totp(parse_totp_key(secret, interval, digits))
+    except (ValueError, TypeError):
+        return ""
 
-        # Add padding if necessary
-        padding = 8 - (len(secret) % 8)
-        if padding != 8:
-            secret += "=" * padding
 
-        # Decode base32 secret
-        key = base64.b32decode(secret)
+class TotpCodeCache:
+    """Current TOTP codes for a set of entries, keyed by entry id.
 
-        # Get current time step
-        counter = int(time.time()) // interval
+    Each secret is decoded once when it is first seen. Codes are computed on
+    first request and reused until their period rolls over; refresh() only
+    reports which entries rolled over, so a tick never computes codes for
+    entries nobody displays.
 
-        # Pack counter as big-endian 8-byte integer
-        counter_bytes = struct.pack(">Q", counter)
+    With a ``loader`` (entry id -> raw secret) secrets are fetched on first
+    use, and only the ``max_keys`` most recently used keys stay decoded.
+    """
 
-        # Generate HMAC-SHA1
-        hmac_hash = hmac.new(key, counter_bytes, hashlib.sha1).digest()
+    def __init__(self, loader: Optional[Callable[[int], str]] = None, max_keys: int = 1024):
+        self._loader = loader
+        self._max_keys = max_keys
+        self._keys = OrderedDict()  # entry id -> (raw secret, TotpKey or None if invalid)
+        self._codes: dict = {}  # entry id -> (counter, code)
+        self._by_period: dict = {}  # period -> set of entry ids
+        self._counters: dict = {}  # period -> counter seen by the last refresh()
 
-        # Dynamic truncation
-        offset = hmac_hash[-1] & 0x0F
-        code = struct.unpack(">I", hmac_hash[offset:offset + 4])[0]
-        code = (code & 0x7FFFFFFF) % (10 ** digits)
+    def set_key(self, entry_id: int, raw_key: str):
+        """Register or replace the secret of an entry."""
+        cached = self._keys.get(entry_id)
+        if cached and cached[0] == raw_key:
+            return
+        self.invalidate(entry_id)
+        if raw_key:
+            try:
+                key = parse_totp_key(raw_key)
+            except (ValueError, TypeError):
+                key = None
+            self._keys[entry_id] = (raw_key, key)
+            if key is not None:
+                self._by_period.setdefault(key.period, set()).add(entry_id)
+            if self._loader and len(self._keys) > self._max_keys:
+                self.invalidate(next(iter(self._keys)))
 
-        # Pad with zeros if necessary
-        return str(code).zfill(digits)
-    except Exception:
-        return ""
+    def invalidate(self, entry_id: int):
+        cached = self._keys.pop(entry_id, None)
+        self._codes.pop(entry_id, None)
+        if cached and cached[1] is not None:
+            self._by_period[cached[1].period].discard(entry_id)
+
+    def clear(self):
+        self._keys.clear()
+        self._codes.clear()
+        self._by_period.clear()
+        self._counters.clear()
+
+    def _key(self, entry_id: int) -> Optional[TotpKey]:
+        cached = self._keys.get(entry_id)
+        if cached is None and self._loader:
+            self.set_key(entry_id, self._loader(entry_id))
+            cached = self._keys.get(entry_id)
+        elif cached is not None:
+            self._keys.move_to_end(entry_id)
+        return cached[1] if cached else None
+
+    def code(self, entry_id: int, now: Optional[float] = None) -> str:
+        """Return the current code of one entry, computing it if needed."""
+        key = self._key(entry_id)
+        if key is None:
+            return ""
+        if now is None:
+            now = time.time()
+        counter = int(now) // key.period
+        current = self._codes.get(entry_id)
+        if current is None or current[0] != counter:
+            current = (counter, _hotp(key, counter))
+            self._codes[entry_id] = current
+        return current[1]
 
+    def period(self, entry_id: int) -> int:
+        key = self._key(entry_id)
+        return key.period if key else 30
 
+    def refresh(self, now: Optional[float] = None) -> list:
+        """Return ids of entries whose period rolled over since the previous refresh."""
+        if now is None:
+            now = time.time()
+        seconds = int(now)
+        changed = []
+        for period, entry_ids in self._by_period.items():
+            counter = seconds // period
+            if self._counters.get(period) != counter:
+                self._counters[period] = counter
+                changed.extend(entry_ids)
+        return changed
@@ -1,5 +1,8 @@
 import re
 
+from password_manager.core.strength import MIN_SCORE, estimate_strength
+from password_manager.core.totp import parse_totp_key
+
 
 def validate_url(url: str) -> bool:
     pattern = r'^https?://[^\s/$.?#].[^\s]*$|^[a-zA-Z0-9][-a-zA-Z0-9]*(\.[a-zA-Z]{2,})+$'
@@ -17,13 +20,22 @@ def validate_password(password: str) -> bool:
     has_lower = bool(re.search(r'[a-z]', password))
     has_digit = bool(re.search(r'\d', password))
     has_special = bool(re.search(r'[!@#$%^&*(),.?":{}|<>]', password))
-    return has_upper and has_lower and has_digit and has_special
+    if not (has_upper and has_lower and has_digit and has_special):
+        return False
+    # Rules alone pass "Password1!"; also require it to be hard to guess
+    return estimate_strength(password).score >= MIN_SCORE
 
 
 def validate_totp_key(key: str) -> bool:
-    """Validate that a TOTP key is a valid base32 string."""
+    """Validate that a TOTP key is a valid base32 string or otpauth://totp/ URI."""
     if not key:
         return True  # Empty is valid (optional field)
+    if key.strip().lower().startswith("otpauth://"):
+        try:
+            parse_totp_key(key)
+            return True
+        except ValueError:
+            return False
     # Remove spaces and convert to uppercase
     key = key.replace(" ", "").upper()
     # Base32 only allows A-Z and 2-7
@@ -1,5 +1,12 @@
+import hashlib
+import hmac
 import json
+import shutil
+import stat
+import struct
+import threading
 import zipfile
+from concurrent.futures import Future
 import os
 import tempfile
 from pathlib import Path
@@ -7,45 +14,141 @@ from typing import Optional
 
 import sqlcipher3
 
+from password_manager.core.audit import (
+    AuditReport, audit_key, build_report, count_unscored, index_entry, index_in_sync,
+    mark_in_sync, reset_outdated_scores, store_scores, sync_index, unscored_entries
+)
+from password_manager.core.cipher import CipherSettings, SALT_SIZE, raw_key
+from password_manager.core.db_actor import DatabaseActor, on_actor
+from password_manager.core.metrics import SIZE_BOUNDS_BYTES, metrics
+from password_manager.core.migrations import migrate
+from password_manager.core.save_scheduler import SaveScheduler
+from password_manager.core.strength import estimate_strength
 
 VAULT_INFO_FILE = "vault.json"
 VAULT_DB_FILE = "vault.db"
-VAULT_VERSION = "1.0"
+# 1.0 deflated vault.db; 2.0 stores it uncompressed, since an SQLCipher
+# database is encrypted and does not compress. Both are read, 2.0 is written.
+VAULT_VERSION = "2.0"
+COPY_CHUNK_SIZE = 1024 * 1024
+# Passwords strength-scored per batch; other requests run in between
+SCORE_BATCH_SIZE = 500
+# SQLite VM steps between progress reports while a re-encrypted copy is written
+REKEY_PROGRESS_STEPS = 20000
+# Logins looked up per query, two parameters each, under SQLite's older 999 limit
+LOGIN_LOOKUP_BATCH = 400
+
+# The journal is a sidecar file next to the vault ("<name>.vault-journal") that
+# mirrors the SQLite WAL of the working database. Each save appends only the
+# newly committed WAL frames; the journal is folded back into the ZIP container
+# (checkpointed) once it grows past JOURNAL_CHECKPOINT_BYTES or the vault closes.
+VAULT_JOURNAL_SUFFIX = "-journal"
+JOURNAL_MAGIC = b"PMVJ"
+JOURNAL_HEADER = struct.Struct(">4sQ")  # magic, container generation
+JOURNAL_CHECKPOINT_BYTES = 4 * 1024 * 1024
+
+
+SEARCH_MIN_FTS_LENGTH = 3
+
+
+def _fsync_dir(path: Path) -> None:
+    """Flush a directory entry so a rename or new file survives a crash."""
+    if os.name != "posix":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
 
 
 class VaultManager:
-    def __init__(self):
+    def __init__(self, save_delay: Optional[float] = None):
+        """Create a vault manager.
+
+        With ``save_delay`` (seconds) edits are committed immediately but
+        written to disk by a background SaveScheduler once no further edits
+        arrive within the window. Without it every edit is saved synchronously.
+        """
         self.vault_path: Optional[Path] = None
-        self.master_password: Optional[str] = None
         self.vault_name: Optional[str] = None
         self.vault_version: Optional[str] = None
+        self.generation = 0
+        # None for vaults created before cipher settings were recorded;
+        # those use the SQLCipher defaults
+        self.cipher: Optional[CipherSettings] = None
+        self.last_save_bytes = 0
+        self.total_save_bytes = 0
         self._db_path: Optional[Path] = None
         self._conn: Optional[sqlcipher3.Connection] = None
+        # Number of WAL bytes already mirrored to the journal, None if the
+        # journal is out of sync and the next save must checkpoint.
+        self._wal_offset: Optional[int] = 0
+        # The connection and journal are only used on this thread, so callers,
+        # background jobs and the save scheduler never touch them concurrently
+        self._actor = DatabaseActor(after_batch=self._save_batch)
+        self._dirty = False
+        self._info_dirty = False
+        self.save_scheduler: Optional[SaveScheduler] = None
+        if save_delay:
+            self.save_scheduler = SaveScheduler(self.flush, save_delay)
+        # The raw SQLCipher key derived from the master password. It outlives
+        # lock() so unlock() can skip the KDF; the password itself is not kept.
+        self._key: Optional[bytearray] = None
+        # Keyed hash of the master password, to check it without the KDF
+        self._check_secret = os.urandom(32)
+        self._password_check: Optional[bytes] = None
+        # Container (mtime, size) at lock(), to detect changes made meanwhile
+        self._locked_stat: Optional[tuple] = None
+        # Key of the password audit hashes, read from the database
+        self._audit_key: Optional[bytes] = None
+
+    @property
+    def dirty(self) -> bool:
+        """True when edits have not been written to disk yet."""
+        return self._dirty or self._info_dirty
+
+    @property
+    def is_open(self) -> bool:
+        return self._conn is not None
+
+    @property
+    def locked(self) -> bool:
+        """True between lock() and unlock(), while the key is still held."""
+        return self._conn is None and self._key is not None
 
     @staticmethod
     def exists(path: Path) -> bool:
         return path.exists() and zipfile.is_zipfile(path)
 
-    def create(self, path: Path, name: str, master_password: str) -> None:
+    @on_actor
+    def create(self, path: Path, name: str, master_password: str, cipher: Optional[CipherSettings] = None) -> None:
+        """Create a vault. Without ``cipher`` the KDF is calibrated for this machine."""
+        if self.locked:
+            self.close()
         self.vault_path = path
         self.vault_name = name
         self.vault_version = VAULT_VERSION
-        self.master_password = master_password
+        self.cipher = cipher or CipherSettings.calibrated()
 
         # Create temporary encrypted database
         fd, tmp_path = tempfile.mkstemp(suffix=".db")
         os.close(fd)
         self._db_path = Path(tmp_path)
-        self._conn = sqlcipher3.connect(str(self._db_path), check_same_thread=False)
-        self._conn.execute(f"PRAGMA key = '{master_password}'")
+        salt = os.urandom(SALT_SIZE)
+        self._set_key(self.cipher.derive_key(master_password, salt), master_password)
+        self._connect(salt)
         self._init_database()
 
-        # Save vault
-        self._save()
+        # Write the initial container
+        self.generation = 0
+        self._checkpoint()
 
+    @on_actor
     def open(self, path: Path, master_password: str) -> bool:
+        if self.locked:
+            self.close()
         self.vault_path = path
-        self.master_password = master_password
 
         try:
             with zipfile.ZipFile(path, 'r') as zf:
@@ -53,55 +156,310 @@ class VaultManager:
                 vault_info = json.loads(zf.read(VAULT_INFO_FILE))
                 self.vault_name = vault_info.get("name", "Unknown")
                 self.vault_version = vault_info.get("version", "1.0")
+                self.generation = vault_info.get("generation", 0)
+                cipher = vault_info.get("cipher")
+                self.cipher = CipherSettings.from_dict(cipher) if cipher else None
 
-                # Extract encrypted database to temp file
+                # Stream the encrypted database to a temp file in fixed-size
+                # chunks, so memory use does not grow with the vault size
                 fd, tmp_path = tempfile.mkstemp(suffix=".db")
-                os.close(fd)
                 self._db_path = Path(tmp_path)
-                self._db_path.write_bytes(zf.read(VAULT_DB_FILE))
+                with os.fdopen(fd, 'wb') as dst, zf.open(VAULT_DB_FILE) as src:
+                    shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
 
-            # Open with SQLCipher
-            self._conn = sqlcipher3.connect(str(self._db_path), check_same_thread=False)
-            self._conn.execute(f"PRAGMA key = '{master_password}'")
+            # Replay changes saved after the last checkpoint. SQLite recovers
+            # the WAL itself and discards a torn tail from an interrupted save.
+            replayed = self._restore_journal()
+
+            # Open with SQLCipher. The key is derived here rather than by
+            # SQLCipher so it can be held for a later unlock().
+            cipher = self.cipher or CipherSettings()
+            self._set_key(cipher.derive_key(master_password, self._read_salt()), master_password)
+            self._connect()
 
             # Verify password by attempting a query
             self._conn.execute("SELECT count(*) FROM sqlite_master").fetchone()
 
             # Run migrations for existing vaults
             self._migrate_database()
+
+            # Older containers are upgraded by the checkpoint on close
+            if self.vault_version != VAULT_VERSION:
+                self._info_dirty = True
+
+            if replayed:
+                self._checkpoint()
+            else:
+                self._journal_path.unlink(missing_ok=True)
             return True
         except Exception:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
             self.vault_path = None
-            self.master_password = None
+            self._wipe_key()
             self.vault_name = None
             self.vault_version = None
-            if self._db_path and self._db_path.exists():
-                os.remove(self._db_path)
-                self._db_path = None
+            self.cipher = None
+            self._remove_db_files()
             return False
 
+    @on_actor
     def close(self):
+        # Pending edits are folded into the container below
+        if self.save_scheduler:
+            self.save_scheduler.cancel()
+        self._close_connection()
+        self._remove_db_files()
+        self._wipe_key()
+        self._locked_stat = None
+        self._audit_key = None
+
+    @on_actor
+    def lock(self):
+        """Save and close the database, but keep the key for a quick unlock().
+
+        The working copy stays on disk; it is encrypted, and identical to the
+        container once the connection is closed. close() discards both.
+        """
+        if self.save_scheduler:
+            self.save_scheduler.cancel()
+        if not self._conn:
+            return
+        self._close_connection()
+        stat_result = self.vault_path.stat()
+        self._locked_stat = (stat_result.st_mtime_ns, stat_result.st_size)
+
+    @on_actor
+    def unlock(self, master_password: str) -> bool:
+        """Reopen a locked vault with the held key, without the KDF or extraction.
+
+        Returns False if the password is wrong (the vault stays locked) or if
+        the container changed since lock() (the vault is closed, so it has to
+        be opened again).
+        """
+        if not self.locked or not self.verify_password(master_password):
+            return False
+        try:
+            stat_result = self.vault_path.stat()
+            if (stat_result.st_mtime_ns, stat_result.st_size) != self._locked_stat:
+                raise ValueError("Vault changed while locked")
+            self._connect()
+            self._conn.execute("SELECT count(*) FROM sqlite_master").fetchone()
+        except Exception:
+            self.close()
+            return False
+        self._locked_stat = None
+        return True
+
+    @metrics.timed()
+    def verify_password(self, master_password: str) -> bool:
+        """Check the master password against the held key's password, without the KDF."""
+        return self._password_check is not None and hmac.compare_digest(
+            self._password_check, self._password_digest(master_password)
+        )
+
+    def _password_digest(self, master_password: str) -> bytes:
+        return hmac.new(self._check_secret, master_password.encode(), hashlib.sha256).digest()
+
+    def _set_key(self, key: bytearray, master_password: str):
+        self._wipe_key()
+        self._key = key
+        self._password_check = self._password_digest(master_password)
+
+    def _wipe_key(self):
+        if self._key is not None:
+            self._key[:] = bytes(len(self._key))
+        self._key = None
+        self._password_check = None
+
+    def _read_salt(self) -> bytes:
+        with open(self._db_path, 'rb') as f:
+            return f.read(SALT_SIZE)
+
+    def _close_connection(self):
         if self._conn:
-            self._save()
+            self._conn.commit()
+            # Skip the rewrite when the container is already up to date
+            if self._info_dirty or self._wal_offset is None or self._wal_size() > 0:
+                self._checkpoint()
             self._conn.close()
             self._conn = None
-        if self._db_path and self._db_path.exists():
-            os.remove(self._db_path)
+        self._dirty = False
+        self._info_dirty = False
+
+    @on_actor
+    def flush(self):
+        """Write pending edits to disk now."""
+        if self._conn and self.dirty:
+            self._save()
+
+    def _connect(self, salt: Optional[bytes] = None):
+        """Connect to the working copy with the held key; ``salt`` only for a new database."""
+        # Only the database thread uses the connection, but that thread is
+        # replaced after an idle period, so it cannot be tied to one thread
+        self._conn = sqlcipher3.connect(str(self._db_path), check_same_thread=False)
+        self._conn.execute(f'PRAGMA key = "{raw_key(self._key, salt)}"')
+        # Cipher parameters must be set before the database is first read
+        if self.cipher:
+            for statement in self.cipher.pragmas():
+                self._conn.execute(statement)
+        # Exclusive locking keeps the WAL index in memory (no -shm file) and
+        # disabling auto-checkpoints keeps the WAL append-only between our
+        # own checkpoints, so it can be mirrored to the journal byte for byte.
+        self._conn.execute("PRAGMA locking_mode = EXCLUSIVE")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA wal_autocheckpoint = 0")
+        # The working copy is scratch space; durability comes from the journal
+        # fsync, so commits never wait for the disk.
+        self._conn.execute("PRAGMA synchronous = OFF")
+        self._wal_offset = 0
+
+    @property
+    def _journal_path(self) -> Path:
+        return self.vault_path.with_name(self.vault_path.name + VAULT_JOURNAL_SUFFIX)
+
+    @property
+    def _wal_path(self) -> Path:
+        return Path(f"{self._db_path}-wal")
+
+    def _wal_size(self) -> int:
+        try:
+            return self._wal_path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def _remove_db_files(self):
+        if self._db_path:
+            for suffix in ("", "-wal", "-shm"):
+                Path(f"{self._db_path}{suffix}").unlink(missing_ok=True)
             self._db_path = None
 
+    def _restore_journal(self) -> bool:
+        """Place a journal matching the container next to the extracted database as its WAL."""
+        try:
+            with open(self._journal_path, 'rb') as f:
+                header = f.read(JOURNAL_HEADER.size)
+                if len(header) < JOURNAL_HEADER.size:
+                    return False
+                magic, generation = JOURNAL_HEADER.unpack(header)
+                if magic != JOURNAL_MAGIC or generation != self.generation:
+                    return False
+                self._wal_path.write_bytes(f.read())
+            return True
+        except FileNotFoundError:
+            return False
+
+    @metrics.timed("VaultManager.save")
     def _save(self):
+        """Commit and persist only the pages changed since the previous save."""
         if not self._conn or not self.vault_path:
             return
 
         self._conn.commit()
 
-        # Create vault info
-        vault_info = {"name": self.vault_name, "version": VAULT_VERSION}
+        if self._info_dirty or self._wal_offset is None or self._wal_offset >= JOURNAL_CHECKPOINT_BYTES:
+            self._checkpoint()
+        else:
+            self._record_save(self._append_journal())
+            self._dirty = False
+
+    def _mark_dirty(self):
+        """Persist an edit now, or hand it to the save scheduler."""
+        self._dirty = True
+        if self.save_scheduler:
+            self.save_scheduler.schedule()
+        elif not self._actor.batching:
+            self._save()
+
+    def _save_batch(self):
+        # Without a scheduler, edits queued together are saved once, after all of them
+        if not self.save_scheduler:
+            self.flush()
+
+    def submit(self, method, *args, **kwargs) -> Future:
+        """Queue a call of one of this vault's methods and return a Future for its result.
+
+        For example ``vault.submit(vault.add_password, website, username, password)``.
+        Calling the methods directly instead blocks until the database thread has run them.
+        """
+        return self._actor.submit(method, *args, **kwargs)
+
+    def _record_save(self, written: int):
+        metrics.observe("VaultManager.save_bytes", written, SIZE_BOUNDS_BYTES)
+        self.last_save_bytes = written
+        self.total_save_bytes += written
+
+    def _append_journal(self) -> int:
+        """Append newly committed WAL frames to the journal. Returns bytes written."""
+        wal_size = self._wal_size()
+        if wal_size <= self._wal_offset:
+            return 0
+
+        with open(self._wal_path, 'rb') as src:
+            src.seek(self._wal_offset)
+            frames = src.read(wal_size - self._wal_offset)
+
+        new_journal = self._wal_offset == 0
+        written = 0
+        with open(self._journal_path, 'wb' if new_journal else 'ab') as f:
+            if new_journal:
+                written += f.write(JOURNAL_HEADER.pack(JOURNAL_MAGIC, self.generation))
+            written += f.write(frames)
+            f.flush()
+            os.fsync(f.fileno())
+        if new_journal:
+            _fsync_dir(self._journal_path.parent)
+
+        self._wal_offset = wal_size
+        return written
+
+    @metrics.timed("VaultManager.checkpoint")
+    def _checkpoint(self) -> int:
+        """Fold the WAL into the database and atomically rewrite the container."""
+        self._conn.commit()
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+        # The WAL is now empty, so the journal no longer mirrors it
+        self._wal_offset = None
+
+        generation = self.generation + 1
+        written = self._write_container(generation)
+        self.generation = generation
+
+        self._journal_path.unlink(missing_ok=True)
+        self._wal_offset = 0
+        self._dirty = False
+        self._info_dirty = False
+        self._record_save(written)
+        return written
+
+    def _write_container(self, generation: int) -> int:
+        """Write the ZIP container to a temp file, fsync it and rename it over the vault."""
+        vault_info = {"name": self.vault_name, "version": VAULT_VERSION, "generation": generation}
+        if self.cipher:
+            vault_info["cipher"] = self.cipher.to_dict()
 
-        # Write zip file with encrypted database
-        with zipfile.ZipFile(self.vault_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-            zf.writestr(VAULT_INFO_FILE, json.dumps(vault_info, indent=2))
-            zf.write(self._db_path, VAULT_DB_FILE)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.vault_path.parent, prefix=f".{self.vault_path.name}.", suffix=".tmp"
+        )
+        try:
+            # Keep the permissions of the vault being replaced
+            if self.vault_path.exists():
+                os.chmod(tmp_path, stat.S_IMODE(self.vault_path.stat().st_mode))
+            with os.fdopen(fd, 'wb') as f:
+                with zipfile.ZipFile(f, 'w', zipfile.ZIP_DEFLATED) as zf:
+                    zf.writestr(VAULT_INFO_FILE, json.dumps(vault_info, indent=2))
+                    zf.write(self._db_path, VAULT_DB_FILE, compress_type=zipfile.ZIP_STORED)
+                f.flush()
+                os.fsync(f.fileno())
+                written = f.tell()
+            os.replace(tmp_path, self.vault_path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        _fsync_dir(self.vault_path.parent)
+        self.vault_version = VAULT_VERSION
+        return written
 
     def _init_database(self):
         cursor = self._conn.cursor()
@@ -120,31 +478,186 @@ class VaultManager:
         self._migrate_database()
 
     def _migrate_database(self):
-        """Add missing columns for existing vaults."""
-        cursor = self._conn.cursor()
-        cursor.execute("PRAGMA table_info(passwords)")
-        columns = [col[1] for col in cursor.fetchall()]
-        if 'totp_key' not in columns:
-            cursor.execute("ALTER TABLE passwords ADD COLUMN totp_key TEXT DEFAULT ''")
-        if 'favorite' not in columns:
-            cursor.execute("ALTER TABLE passwords ADD COLUMN favorite INTEGER DEFAULT 0")
-        self._conn.commit()
+        """Bring the schema up to date; an up-to-date vault is read, not written."""
+        migrate(self._conn)
+        cursor = self._conn.cursor()
+        # Not a numbered migration: a STRENGTH_VERSION bump has to reset the
+        # stored scores of vaults at any schema version
+        reset_outdated_scores(cursor)
+        self._audit_key = audit_key(cursor)
+        # Builds the index on first open and repairs it after older versions
+        # added entries; from then on every write keeps it current
+        if not index_in_sync(cursor):
+            sync_index(cursor, self._audit_key)
+        if self._conn.in_transaction:
+            self._conn.commit()
 
+    @on_actor
     def add_password(self, website: str, username: str, password: str, totp_key: str = "") -> int:
         cursor = self._conn.cursor()
         cursor.execute(
             "INSERT INTO passwords (website, username, password, totp_key) VALUES (?, ?, ?, ?)",
             (website, username, password, totp_key)
         )
+        entry_id = cursor.lastrowid
+        index_entry(cursor, self._audit_key, entry_id, password)
+        mark_in_sync(cursor)
         self._conn.commit()
-        self._save()
-        return cursor.lastrowid
+        self._mark_dirty()
+        return entry_id
+
+    @on_actor
+    def add_passwords(self, entries: list) -> int:
+        """Insert (website, username, password, totp_key, favorite) rows in one transaction.
 
+        The vault is saved once for the whole batch. Returns the number of rows added.
+        """
+        try:
+            self._conn.executemany(
+                "INSERT INTO passwords (website, username, password, totp_key, favorite) "
+                "VALUES (?, ?, ?, ?, ?)",
+                entries
+            )
+            sync_index(self._conn.cursor(), self._audit_key)
+            self._conn.commit()
+        except BaseException:
+            self._conn.rollback()
+            raise
+        self._mark_dirty()
+        return len(entries)
+
+    @on_actor
+    def existing_logins(self, logins) -> set:
+        """Return the (website, username) pairs of ``logins`` that already have an entry."""
+        cursor = self._conn.cursor()
+        logins = list(logins)
+        found = set()
+        for start in range(0, len(logins), LOGIN_LOOKUP_BATCH):
+            batch = logins[start:start + LOGIN_LOOKUP_BATCH]
+            values = ", ".join(["(?, ?)"] * len(batch))
+            # Joined from the values, so each login is one passwords_login lookup
+            cursor.execute(
+                f"SELECT p.website, p.username FROM (VALUES {values}) AS v "
+                "JOIN passwords p ON p.website = v.column1 AND p.username = v.column2",
+                [field for login in batch for field in login]
+            )
+            found.update(cursor.fetchall())
+        return found
+
+    @on_actor
     def get_all_passwords(self) -> list:
         cursor = self._conn.cursor()
         cursor.execute("SELECT id, website, username, password, totp_key, favorite FROM passwords")
         return cursor.fetchall()
 
+    def iter_passwords(self, batch_size: int = 1000):
+        """Yield (id, website, username, password, totp_key, favorite) rows in id order.
+
+        Rows are read ``batch_size`` at a time, each batch as one request to
+        the database thread, so edits and saves can go on in between.
+        """
+        last_id = 0
+        while True:
+            rows = self._read_rows(last_id, batch_size)
+            yield from rows
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1][0]
+
+    @on_actor
+    def _read_rows(self, after_id: int, limit: int) -> list:
+        if self._conn is None:
+            raise ValueError("Vault was closed")
+        cursor = self._conn.cursor()
+        cursor.execute(
+            "SELECT id, website, username, password, totp_key, favorite FROM passwords "
+            "WHERE id > ? ORDER BY id LIMIT ?",
+            (after_id, limit)
+        )
+        return cursor.fetchall()
+
+    @on_actor
+    def get_entry_summaries(self, after_id: int = 0, limit: int = -1) -> list:
+        """Return (id, website, username, has_totp, favorite) rows without secrets.
+
+        Rows come in id order starting after ``after_id``, so pages are read
+        with keyset pagination: pass the last id of the previous page.
+        """
+        cursor = self._conn.cursor()
+        cursor.execute(
+            "SELECT id, website, username, totp_key != '', favorite FROM passwords "
+            "WHERE id > ? ORDER BY id LIMIT ?",
+            (after_id, limit)
+        )
+        return cursor.fetchall()
+
+    @on_actor
+    def get_logins(self, ids: list) -> dict:
+        """Return {id: (website, username)} for the given entry ids."""
+        if not ids:
+            return {}
+        cursor = self._conn.cursor()
+        placeholders = ",".join("?" * len(ids))
+        cursor.execute(f"SELECT id, website, username FROM passwords WHERE id IN ({placeholders})", ids)
+        return {row[0]: row[1:] for row in cursor.fetchall()}
+
+    @on_actor
+    def search_summaries(self, query: str, limit: int = 100) -> list:
+        """Return the search() matches as get_entry_summaries() rows, best match first."""
+        ids = self.search(query, limit)
+        if not ids:
+            return []
+        cursor = self._conn.cursor()
+        placeholders = ",".join("?" * len(ids))
+        cursor.execute(
+            f"SELECT id, website, username, totp_key != '', favorite FROM passwords WHERE id IN ({placeholders})",
+            ids
+        )
+        rows = {row[0]: row for row in cursor.fetchall()}
+        return [rows[i] for i in ids if i in rows]
+
+    @on_actor
+    def count_entries(self) -> tuple:
+        """Return (total, favorites) entry counts."""
+        cursor = self._conn.cursor()
+        # The favorites count reads the partial index rather than every row
+        cursor.execute("SELECT (SELECT count(*) FROM passwords), (SELECT count(*) FROM passwords WHERE favorite)")
+        return cursor.fetchone()
+
+    @on_actor
+    def get_secret(self, password_id: int) -> Optional[tuple]:
+        """Return (password, totp_key) of one entry, or None if it does not exist."""
+        cursor = self._conn.cursor()
+        cursor.execute("SELECT password, totp_key FROM passwords WHERE id = ?", (password_id,))
+        return cursor.fetchone()
+
+    @on_actor
+    def search(self, query: str, limit: int = 100, offset: int = 0) -> list:
+        """Return ids of entries whose website or username contains query, best match first."""
+        query = query.strip()
+        if not query:
+            return []
+        cursor = self._conn.cursor()
+        if len(query) >= SEARCH_MIN_FTS_LENGTH:
+            # Quote as a phrase so the query is matched literally; website
+            # hits weigh twice as much as username hits
+            phrase = '"' + query.replace('"', '""') + '"'
+            cursor.execute(
+                "SELECT rowid FROM passwords_fts WHERE passwords_fts MATCH ? "
+                "ORDER BY bm25(passwords_fts, 2.0, 1.0), rowid LIMIT ? OFFSET ?",
+                (phrase, limit, offset)
+            )
+        else:
+            # Too short for a trigram, fall back to scanning the table
+            pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            cursor.execute(
+                "SELECT id FROM passwords WHERE website LIKE ? ESCAPE '\\' OR username LIKE ? ESCAPE '\\' "
+                "ORDER BY website LIKE ? ESCAPE '\\' DESC, id LIMIT ? OFFSET ?",
+                (pattern, pattern, pattern, limit, offset)
+            )
+        return [row[0] for row in cursor.fetchall()]
+
+    @on_actor
     def toggle_favorite(self, password_id: int):
         """Toggle favorite status and return new status."""
         cursor = self._conn.cursor()
@@ -154,41 +667,215 @@ class VaultManager:
             new_status = 0 if result[0] else 1
             cursor.execute("UPDATE passwords SET favorite = ? WHERE id = ?", (new_status, password_id))
             self._conn.commit()
-            self._save()
+            self._mark_dirty()
             return bool(new_status)
         return False
 
+    @on_actor
+    def record_use(self, password_id: int):
+        """Count a copy or open of an entry; a trigger stamps its last_used_at."""
+        cursor = self._conn.cursor()
+        cursor.execute("UPDATE passwords SET use_count = use_count + 1 WHERE id = ?", (password_id,))
+        self._conn.commit()
+        self._mark_dirty()
+
+    @on_actor
     def delete_password(self, password_id: int):
         cursor = self._conn.cursor()
+        # The passwords_audit_delete trigger drops its index row
         cursor.execute("DELETE FROM passwords WHERE id = ?", (password_id,))
         self._conn.commit()
-        self._save()
+        self._mark_dirty()
 
+    @on_actor
     def update_password(self, password_id: int, website: str, username: str, password: str, totp_key: str = ""):
         cursor = self._conn.cursor()
         cursor.execute(
             "UPDATE passwords SET website = ?, username = ?, password = ?, totp_key = ? WHERE id = ?",
             (website, username, password, totp_key, password_id)
         )
+        if cursor.rowcount:
+            index_entry(cursor, self._audit_key, password_id, password)
         self._conn.commit()
-        self._save()
+        self._mark_dirty()
 
+    @on_actor
+    def audit(self) -> AuditReport:
+        """Report reused, weak, TOTP-less and stale entries from the audit index."""
+        return build_report(self._conn.cursor())
+
+    @metrics.timed()
+    def score_passwords(self, progress=None, cancel: Optional[threading.Event] = None) -> Optional[int]:
+        """Estimate the strength of entries not scored yet, for the audit.
+
+        Passwords are scored in batches on the calling thread, so the
+        database thread stays free for other requests meanwhile; each
+        password shared by several entries of a batch is scored once.
+        ``progress`` is called with (done, total). Returns the number of
+        entries scored, or None if ``cancel`` was set.
+        """
+        total = self._actor.call(lambda: count_unscored(self._open_cursor()))
+        done = 0
+        try:
+            while True:
+                if cancel is not None and cancel.is_set():
+                    return None
+                rows = self._actor.call(lambda: unscored_entries(self._open_cursor(), SCORE_BATCH_SIZE))
+                if not rows:
+                    return done
+                scores = {password: None for _, password in rows}
+                for password in scores:
+                    scores[password] = estimate_strength(password).score
+                self._store_scores([(entry_id, scores[password]) for entry_id, password in rows])
+                done += len(rows)
+                if progress is not None:
+                    progress(min(done, total), total)
+        finally:
+            if done:
+                self._actor.call(lambda: self._conn is not None and self._mark_dirty())
+
+    def _open_cursor(self):
+        if self._conn is None:
+            raise ValueError("Vault was closed")
+        return self._conn.cursor()
+
+    @on_actor
+    def _store_scores(self, scores: list):
+        store_scores(self._open_cursor(), scores)
+        self._conn.commit()
+
+    @on_actor
     def change_vault_name(self, new_name: str):
         """Change the vault name."""
         self.vault_name = new_name
-        self._save()
+        # vault.json lives in the container, so this save needs a checkpoint
+        self._info_dirty = True
+        self._mark_dirty()
+
+    @metrics.timed()
+    def change_master_password(self, current_password: str, new_password: str,
+                               cipher: Optional[CipherSettings] = None, progress=None) -> bool:
+        """Re-encrypt the vault under a new master password.
 
-    def change_master_password(self, current_password: str, new_password: str) -> bool:
-        """Change the master password. Returns True if successful."""
-        if current_password != self.master_password:
+        Returns False if ``current_password`` is wrong. ``cipher`` changes
+        the KDF and page settings at the same time; by default they are kept.
+        See _reencrypt() for how the vault is replaced and for ``progress``.
+        """
+        if not self.verify_password(current_password):
             return False
+        self._reencrypt(new_password, cipher or self.cipher or CipherSettings(), progress)
+        return True
 
-        try:
-            # Re-key the database with the new password
-            self._conn.execute(f"PRAGMA rekey = '{new_password}'")
-            self.master_password = new_password
-            self._save()
-            return True
-        except Exception as e:
-            print(f"Error changing password: {e}")
+    @metrics.timed()
+    def retune(self, master_password: str, cipher: Optional[CipherSettings] = None, progress=None) -> bool:
+        """Re-encrypt the vault with new cipher settings. Returns False if the password is wrong.
+
+        The master password is needed to derive the key for the new KDF
+        settings. Without ``cipher`` the KDF is re-calibrated for this machine
+        and the page size is kept.
+        """
+        if not self.verify_password(master_password):
             return False
+        if cipher is None:
+            page_size = self.cipher.page_size if self.cipher else CipherSettings().page_size
+            cipher = CipherSettings.calibrated(page_size=page_size)
+        self._reencrypt(master_password, cipher, progress)
+        return True
+
+    def _reencrypt(self, master_password: str, cipher: CipherSettings, progress=None):
+        """Replace the database with a copy keyed from ``master_password`` and ``cipher``.
+
+        SQLCipher cannot change the KDF or page size in place, and PRAGMA
+        rekey rewrites the working copy page by page with no way back, so a
+        new database is exported with sqlcipher_export, checked, and only
+        then swapped in by the atomic rewrite of the container. If anything
+        fails an exception is raised and the vault, open and on disk, is left
+        as it was. ``progress`` is called with (done, total) bytes copied.
+        """
+        # The KDF runs on the calling thread; the database thread stays free meanwhile
+        salt = os.urandom(SALT_SIZE)
+        key = cipher.derive_key(master_password, salt)
+        try:
+            self._actor.call(self._swap_in_copy, master_password, cipher, key, salt, progress)
+        except BaseException:
+            key[:] = bytes(len(key))
+            raise
+
+    def _swap_in_copy(self, master_password: str, cipher: CipherSettings, key: bytearray, salt: bytes, progress):
+        if self._conn is None:
+            raise ValueError("Vault is not open")
+        new_path = self._export_copy(cipher, key, salt, progress)
+        old = (self._conn, self._db_path, self.cipher, self._key, self._password_check, self._wal_offset)
+        self._conn = None
+        self._db_path = new_path
+        self.cipher = cipher
+        self._key = key
+        self._password_check = self._password_digest(master_password)
+        try:
+            self._connect()
+            # vault.json records the new settings
+            self._checkpoint()
+        except BaseException:
+            if self._conn:
+                self._conn.close()
+            self._remove_db_files()
+            self._conn, self._db_path, self.cipher, self._key, self._password_check, self._wal_offset = old
+            raise
+
+        old_conn, old_db_path, _, old_key, _, _ = old
+        old_conn.close()
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{old_db_path}{suffix}").unlink(missing_ok=True)
+        if old_key is not None:
+            old_key[:] = bytes(len(old_key))
+
+    def _export_copy(self, cipher: CipherSettings, key: bytearray, salt: bytes, progress) -> Path:
+        """Export the database into a new file with the given key and settings, and verify it."""
+        fd, tmp_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        new_path = Path(tmp_path)
+        try:
+            self._conn.commit()
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if progress is not None:
+                # The copy ends up about as large as the working copy and its WAL
+                total = self._db_path.stat().st_size + self._wal_size()
+                self._conn.set_progress_handler(
+                    lambda: progress(min(new_path.stat().st_size, total), total) or 0, REKEY_PROGRESS_STEPS
+                )
+            self._conn.execute("ATTACH DATABASE ? AS rekeyed KEY ?", (str(new_path), raw_key(key, salt)))
+            try:
+                for statement in cipher.pragmas("rekeyed"):
+                    self._conn.execute(statement)
+                self._conn.execute("SELECT sqlcipher_export('rekeyed')").fetchone()
+                # sqlcipher_export copies the schema and rows but not the header
+                self._conn.execute(f"PRAGMA rekeyed.user_version = {version}")
+            finally:
+                self._conn.set_progress_handler(None, 0)
+                self._conn.execute("DETACH DATABASE rekeyed")
+
+            entries = self._conn.execute("SELECT count(*) FROM passwords").fetchone()[0]
+            copy = sqlcipher3.connect(str(new_path))
+            try:
+                copy.execute(f'PRAGMA key = "{raw_key(key)}"')
+                for statement in cipher.pragmas():
+                    copy.execute(statement)
+                # Every page decrypts and authenticates, the b-trees are sound
+                # and no entry went missing
+                if copy.execute("PRAGMA cipher_integrity_check").fetchall():
+                    raise ValueError("Re-encrypted copy failed the integrity check")
+                if copy.execute("PRAGMA quick_check").fetchone()[0] != "ok":
+                    raise ValueError("Re-encrypted copy is corrupt")
+                if copy.execute("SELECT count(*) FROM passwords").fetchone()[0] != entries:
+                    raise ValueError("Re-encrypted copy is incomplete")
+                if copy.execute("PRAGMA user_version").fetchone()[0] != version:
+                    raise ValueError("Re-encrypted copy lost its schema version")
+            finally:
+                copy.close()
+            if progress is not None:
+                progress(1, 1)
+            return new_path
+        except BaseException:
+            for suffix in ("", "-wal", "-shm"):
+                Path(f"{new_path}{suffix}").unlink(missing_ok=True)
+            raise
@@ -0,0 +1,89 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import zip_longest
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from password_manager.core.vault import VaultManager
+
+# Matches taken from each vault before merging
+SEARCH_LIMIT_PER_VAULT = 200
+
+
+class SearchHit(NamedTuple):
+    vault_path: Path
+    vault_name: str
+    entry_id: int
+    website: str
+    username: str
+
+
+class VaultSet:
+    """The vaults unlocked at the same time, in the order they were opened.
+
+    Every vault keeps its own connection, database thread and save
+    scheduler, so work on one never waits for another; that also lets a
+    search run in all of them at once.
+    """
+
+    def __init__(self):
+        self._vaults: list = []
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_size = 0
+
+    def __len__(self) -> int:
+        return len(self._vaults)
+
+    def __iter__(self):
+        return iter(list(self._vaults))
+
+    def __getitem__(self, index: int) -> VaultManager:
+        return self._vaults[index]
+
+    def index(self, vault: VaultManager) -> int:
+        return self._vaults.index(vault)
+
+    def find(self, path: Path) -> Optional[VaultManager]:
+        """Return the open vault stored at ``path``, if any."""
+        path = Path(path).resolve()
+        for vault in self._vaults:
+            if vault.vault_path is not None and vault.vault_path.resolve() == path:
+                return vault
+        return None
+
+    def add(self, vault: VaultManager):
+        if vault not in self._vaults:
+            self._vaults.append(vault)
+
+    def remove(self, vault: VaultManager):
+        if vault in self._vaults:
+            self._vaults.remove(vault)
+
+    def search(self, query: str, limit: int = SEARCH_LIMIT_PER_VAULT) -> list:
+        """Search every open vault in parallel and merge the hits.
+
+        Relevance scores are not comparable between databases, so the best
+        hit of each vault comes first, then the second best of each, and so
+        on, in vault order.
+        """
+        vaults = [vault for vault in self._vaults if vault.is_open]
+        if not query.strip() or not vaults:
+            return []
+
+        def search_vault(vault: VaultManager) -> list:
+            ids = vault.search(query, limit)
+            logins = vault.get_logins(ids)
+            return [
+                SearchHit(vault.vault_path, vault.vault_name, i, *logins[i]) for i in ids if i in logins
+            ]
+
+        if len(vaults) == 1:
+            per_vault = [search_vault(vaults[0])]
+        else:
+            # Kept between searches; searching runs on every keystroke
+            if self._pool_size < len(vaults):
+                if self._pool is not None:
+                    self._pool.shutdown(wait=False)
+                self._pool = ThreadPoolExecutor(max_workers=len(vaults), thread_name_prefix="vault-search")
+                self._pool_size = len(vaults)
+            per_vault = list(self._pool.map(search_vault, vaults))
+        return [hit for rank in zip_longest(*per_vault) for hit in rank if hit is not None]
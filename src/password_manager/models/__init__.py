@@ -1,2 +1,3 @@
 from password_manager.models.password_model import PasswordListModel
 from password_manager.models.recent_vaults_model import RecentVaultsModel
+from password_manager.models.password_filter_model import PasswordFilterModel
@@ -0,0 +1,393 @@
+import bisect
+import re
+import unicodedata
+from typing import Callable, Optional
+
+from PyQt6.QtCore import QAbstractProxyModel, QModelIndex, pyqtSignal, pyqtSlot, pyqtProperty
+
+from password_manager.core.metrics import track_resets
+from password_manager.models.password_model import PasswordListModel
+
+
+def normalize(text: str) -> str:
+    """Case-fold and strip accents so "Café" matches "cafe"."""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+class PasswordFilterModel(QAbstractProxyModel):
+    """Search and favorites filter over PasswordListModel.
+
+    Keeps a normalized (website, username, favorite) index per source row so
+    a keystroke never touches the source model. Rows are ranked: website
+    prefix, website substring, username substring, then fuzzy (subsequence)
+    matches, each ordered by how early or how tightly they match. Extending
+    the query only rescans the previous matches.
+
+    With a search provider installed (see set_search_provider) and a source
+    of at least ``min_rows`` rows, searches are answered by the provider,
+    e.g. the vault's full-text index, instead of scanning the index. The
+    provider answers asynchronously; the previous results stay until it
+    does. Its hits that are in unloaded pages are added to the source,
+    which stays paged.
+
+    Otherwise the remaining pages of a paged source are requested before a
+    search or the favorites filter is applied, and are filtered as they
+    arrive, so matches are never missed in unloaded pages.
+    """
+
+    searchQueryChanged = pyqtSignal()
+    favoritesOnlyChanged = pyqtSignal()
+    countChanged = pyqtSignal()
+
+    # Inserted matches beyond this are merged with a reset rather than inserted one by one
+    MERGE_RESET_ROWS = 64
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        track_resets(self)
+        self._query = ""
+        self._raw_query = ""
+        self._fuzzy: Optional[re.Pattern] = None
+        self._favorites_only = False
+        self._index = []  # per source row: (website, username, favorite)
+        self._rows = []  # source rows in display order
+        self._keys = []  # sort key per entry in self._rows
+        self._proxy_rows: Optional[dict] = None  # lazy source row -> proxy row
+        self._id_rows: Optional[dict] = None  # lazy entry id -> source row
+        self._search_provider: Optional[Callable[[str, Callable], None]] = None
+        self._search_provider_min_rows = 0
+        self._hits: list = []  # entry ids the provider returned for the query
+        self._loading_hits = False
+
+    def setSourceModel(self, source: PasswordListModel):
+        self.beginResetModel()
+        super().setSourceModel(source)
+        source.modelReset.connect(self._on_source_reset)
+        source.layoutChanged.connect(self._on_source_reset)
+        source.rowsInserted.connect(self._on_rows_inserted)
+        source.rowsRemoved.connect(self._on_rows_removed)
+        source.dataChanged.connect(self._on_data_changed)
+        self._rebuild_index()
+        self._refilter(self._candidates_all())
+        self.endResetModel()
+        self.countChanged.emit()
+        self._request_hits()
+
+    def set_search_provider(self, provider: Optional[Callable[[str, Callable], None]], min_rows: int = 0):
+        """Answer searches for large sources with provider(query, callback).
+
+        The provider calls callback, on this thread, with the matches as
+        ranked (id, website, username, has_totp, favorite) summary rows.
+        """
+        self._search_provider = provider
+        self._search_provider_min_rows = min_rows
+
+    # QAbstractProxyModel interface
+
+    def index(self, row, column=0, parent=QModelIndex()):
+        if parent.isValid() or not 0 <= row < len(self._rows) or column != 0:
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 1
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid() or not 0 <= proxy_index.row() < len(self._rows):
+            return QModelIndex()
+        return self.sourceModel().index(self._rows[proxy_index.row()], 0)
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        row = self._proxy_row(source_index.row())
+        return self.index(row, 0) if row >= 0 else QModelIndex()
+
+    def roleNames(self):
+        return self.sourceModel().roleNames() if self.sourceModel() else {}
+
+    # Properties exposed to QML
+
+    @pyqtProperty(str, notify=searchQueryChanged)
+    def searchQuery(self) -> str:
+        return self._raw_query
+
+    @searchQuery.setter
+    def searchQuery(self, query: str):
+        if query == self._raw_query:
+            return
+        self._raw_query = query
+        previous = self._query
+        self._query = normalize(query.strip())
+        self._fuzzy = re.compile(".*?".join(map(re.escape, self._query))) if self._query else None
+        if self._query != previous:
+            if self._use_search_provider():
+                # The current results stay until the provider answers
+                self._request_hits()
+            else:
+                self._hits = []
+                if self._query:
+                    self._load_all()
+                # Every match for "abc" also matches "ab", so an extended query
+                # only needs to look at the rows that matched before.
+                if previous and self._query.startswith(previous):
+                    candidates = sorted(self._rows)
+                else:
+                    candidates = self._candidates_all()
+                self.beginResetModel()
+                self._refilter(candidates)
+                self.endResetModel()
+                self.countChanged.emit()
+        self.searchQueryChanged.emit()
+
+    @pyqtProperty(bool, notify=favoritesOnlyChanged)
+    def favoritesOnly(self) -> bool:
+        return self._favorites_only
+
+    @favoritesOnly.setter
+    def favoritesOnly(self, value: bool):
+        if value == self._favorites_only:
+            return
+        if value and not self._use_search_provider():
+            self._load_all()
+        self._favorites_only = value
+        candidates = sorted(self._rows) if value else self._candidates_all()
+        self.beginResetModel()
+        self._refilter(candidates)
+        self.endResetModel()
+        self.countChanged.emit()
+        self.favoritesOnlyChanged.emit()
+
+    @pyqtProperty(int, notify=countChanged)
+    def count(self) -> int:
+        return len(self._rows)
+
+    @pyqtSlot(int, result=int)
+    def mapToSourceRow(self, row: int) -> int:
+        if 0 <= row < len(self._rows):
+            return self._rows[row]
+        return -1
+
+    # Filtering
+
+    def _entry_for(self, source_row: int):
+        source = self.sourceModel()
+        index = source.index(source_row, 0)
+        return (
+            normalize(source.data(index, PasswordListModel.WebsiteRole) or ""),
+            normalize(source.data(index, PasswordListModel.UsernameRole) or ""),
+            bool(source.data(index, PasswordListModel.FavoriteRole)),
+        )
+
+    def _rebuild_index(self):
+        source = self.sourceModel()
+        self._index = [self._entry_for(row) for row in range(source.rowCount())]
+        self._id_rows = None
+
+    def _load_all(self):
+        source = self.sourceModel()
+        if source is not None and source.canFetchMore(QModelIndex()):
+            source.fetch_all()
+
+    def _use_search_provider(self) -> bool:
+        return (self._search_provider is not None and bool(self._query)
+                and self.sourceModel().count >= self._search_provider_min_rows)
+
+    def _request_hits(self):
+        """Ask the provider for the query's hits; _on_hits() applies them."""
+        if not self._use_search_provider():
+            self._hits = []
+            return
+        query = self._raw_query.strip()
+        self._search_provider(query, lambda rows: self._on_hits(query, rows))
+
+    def _on_hits(self, query: str, rows: list):
+        """Show the provider's hits, adding those in unloaded pages to the source."""
+        if query != self._raw_query.strip() or not self._use_search_provider():
+            return  # A later query replaced it
+        self._loading_hits = True
+        try:
+            self.sourceModel().ensure_entries(rows)
+        finally:
+            self._loading_hits = False
+        self.beginResetModel()
+        self._hits = [row[0] for row in rows]
+        self._refilter(())
+        self.endResetModel()
+        self.countChanged.emit()
+
+    def _provider_keys(self) -> list:
+        if self._id_rows is None:
+            source = self.sourceModel()
+            self._id_rows = {
+                source.data(source.index(row, 0), PasswordListModel.IdRole): row
+                for row in range(source.rowCount())
+            }
+        keys = []
+        for rank, entry_id in enumerate(self._hits):
+            row = self._id_rows.get(entry_id)
+            if row is None or (self._favorites_only and not self._index[row][2]):
+                continue
+            keys.append((0, rank, row))
+        return keys
+
+    def _candidates_all(self):
+        return range(len(self._index))
+
+    def _score(self, source_row: int):
+        """Return a sort key for a matching row, or None if it is filtered out."""
+        website, username, favorite = self._index[source_row]
+        if self._favorites_only and not favorite:
+            return None
+        query = self._query
+        if not query:
+            return (0, 0, source_row)
+        pos = website.find(query)
+        if pos == 0:
+            return (0, len(website), source_row)
+        if pos > 0:
+            return (1, pos, source_row)
+        pos = username.find(query)
+        if pos >= 0:
+            return (2, pos, source_row)
+        match = self._fuzzy.search(website)
+        if match:
+            return (3, match.end() - match.start(), source_row)
+        match = self._fuzzy.search(username)
+        if match:
+            return (4, match.end() - match.start(), source_row)
+        return None
+
+    def _refilter(self, candidates):
+        if self._use_search_provider():
+            scored = self._provider_keys()
+        else:
+            scored = []
+            for row in candidates:
+                key = self._score(row)
+                if key is not None:
+                    scored.append(key)
+            scored.sort()
+        self._keys = scored
+        self._rows = [key[2] for key in scored]
+        self._proxy_rows = None
+
+    def _proxy_row(self, source_row: int) -> int:
+        if self._proxy_rows is None:
+            self._proxy_rows = {row: i for i, row in enumerate(self._rows)}
+        return self._proxy_rows.get(source_row, -1)
+
+    def _shift(self, first: int, delta: int):
+        """Renumber mapped source rows at or after ``first`` by ``delta``."""
+        for i, row in enumerate(self._rows):
+            if row >= first:
+                tier, rank, _ = self._keys[i]
+                self._rows[i] = row + delta
+                self._keys[i] = (tier, rank, row + delta)
+        self._proxy_rows = None
+        self._id_rows = None
+
+    def _insert_row(self, key):
+        pos = bisect.bisect_left(self._keys, key)
+        self.beginInsertRows(QModelIndex(), pos, pos)
+        self._keys.insert(pos, key)
+        self._rows.insert(pos, key[2])
+        self._proxy_rows = None
+        self.endInsertRows()
+
+    def _remove_row(self, pos: int):
+        self.beginRemoveRows(QModelIndex(), pos, pos)
+        del self._keys[pos]
+        del self._rows[pos]
+        self._proxy_rows = None
+        self.endRemoveRows()
+
+    # Source model changes
+
+    def _on_source_reset(self):
+        self.beginResetModel()
+        self._rebuild_index()
+        self._refilter(self._candidates_all())
+        self.endResetModel()
+        self.countChanged.emit()
+        self._request_hits()
+
+    def _on_rows_inserted(self, parent, first: int, last: int):
+        count = last - first + 1
+        self._index[first:first] = [self._entry_for(row) for row in range(first, last + 1)]
+        self._shift(first, count)
+        if self._loading_hits:
+            # Search hits; the reset in _on_hits() maps them
+            return
+        keys = [key for key in map(self._score, range(first, last + 1)) if key is not None]
+        keys.sort()
+        if keys and (not self._keys or keys[0] > self._keys[-1]):
+            # A page appended after every current match, e.g. from fetchMore()
+            pos = len(self._keys)
+            self.beginInsertRows(QModelIndex(), pos, pos + len(keys) - 1)
+            self._keys.extend(keys)
+            self._rows.extend(key[2] for key in keys)
+            self._proxy_rows = None
+            self.endInsertRows()
+        elif len(keys) > self.MERGE_RESET_ROWS:
+            # E.g. every remaining page at once: one reset instead of an insert per row
+            self.beginResetModel()
+            self._keys = sorted(self._keys + keys)
+            self._rows = [key[2] for key in self._keys]
+            self._proxy_rows = None
+            self.endResetModel()
+        else:
+            for key in keys:
+                self._insert_row(key)
+        self.countChanged.emit()
+
+    def _on_rows_removed(self, parent, first: int, last: int):
+        for row in range(first, last + 1):
+            pos = self._proxy_row(row)
+            if pos >= 0:
+                self._remove_row(pos)
+        del self._index[first:last + 1]
+        self._shift(last + 1, -(last - first + 1))
+        self.countChanged.emit()
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()):
+        indexed_roles = {PasswordListModel.WebsiteRole, PasswordListModel.UsernameRole, PasswordListModel.FavoriteRole}
+        source_rows = range(top_left.row(), bottom_right.row() + 1)
+        if roles and not indexed_roles.intersection(roles):
+            # e.g. a TOTP rollover: nothing moves in or out of the filter
+            self._proxy_row(0)  # builds the map
+            mapped = map(self._proxy_rows.get, source_rows)
+            self._emit_changed([pos for pos in mapped if pos is not None], roles)
+            return
+        changed = []
+        for row in source_rows:
+            self._index[row] = self._entry_for(row)
+            pos = self._proxy_row(row)
+            key = self._score(row)
+            if pos >= 0 and key is not None:
+                # Keep the row where it is so an edit doesn't make it jump
+                changed.append(row)
+            elif pos >= 0:
+                self._remove_row(pos)
+                self.countChanged.emit()
+            elif key is not None:
+                self._insert_row(key)
+                self.countChanged.emit()
+        # Mapped only now, after the inserts and removals above
+        self._emit_changed([self._proxy_row(row) for row in changed], roles)
+
+    def _emit_changed(self, positions: list, roles):
+        """Emit dataChanged once per contiguous run of the given proxy rows."""
+        positions.sort()
+        start = 0
+        for i in range(1, len(positions) + 1):
+            if i == len(positions) or positions[i] != positions[i - 1] + 1:
+                self.dataChanged.emit(self.index(positions[start], 0), self.index(positions[i - 1], 0), roles)
+                start = i
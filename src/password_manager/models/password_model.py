@@ -1,5 +1,24 @@
+from collections import OrderedDict
+from typing import Callable, Optional
+
 from PyQt6.QtCore import QAbstractListModel, Qt, QModelIndex, pyqtSlot, pyqtSignal, pyqtProperty, QByteArray
 
+from password_manager.core.metrics import metrics, track_resets
+from password_manager.core.totp import TotpCodeCache
+
+
+class PasswordEntry:
+    """The resident part of a vault entry; secrets are fetched on demand."""
+    __slots__ = ('id', 'website', 'username', 'has_totp', 'favorite', 'visible')
+
+    def __init__(self, entry_id: int, website: str, username: str, has_totp: bool, favorite: bool):
+        self.id = entry_id
+        self.website = website
+        self.username = username
+        self.has_totp = has_totp
+        self.favorite = favorite
+        self.visible = False
+
 
 class PasswordListModel(QAbstractListModel):
     IdRole = Qt.ItemDataRole.UserRole + 1
@@ -10,12 +29,113 @@ class PasswordListModel(QAbstractListModel):
     TotpKeyRole = Qt.ItemDataRole.UserRole + 6
     HasTotpRole = Qt.ItemDataRole.UserRole + 7
     FavoriteRole = Qt.ItemDataRole.UserRole + 8
+    TotpCodeRole = Qt.ItemDataRole.UserRole + 9
+    TotpPeriodRole = Qt.ItemDataRole.UserRole + 10
+
+    # Number of recently used (password, totp_key) pairs kept in memory
+    SECRET_CACHE_SIZE = 32
+    # Rows loaded per fetchMore() when paging through a vault
+    PAGE_SIZE = 500
 
     favoriteCountChanged = pyqtSignal()
+    countChanged = pyqtSignal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        track_resets(self)
         self._entries = []
+        self._secret_loader: Optional[Callable[[int, Callable], None]] = None
+        self._secrets = OrderedDict()  # entry id -> (password, totp_key)
+        self._secret_requests: dict = {}  # entry id -> callbacks waiting for its secret
+        self._totp = TotpCodeCache(loader=self._load_totp_key)
+        # Paging state: page_loader(after_id, limit, callback) passes summary rows in id order to callback
+        self._page_loader: Optional[Callable[[int, int, Callable], None]] = None
+        self._page_pending = False
+        self._fetch_all_requested = False
+        # Bumped by every reset, so replies to requests made before it are dropped
+        self._generation = 0
+        self._cursor = 0  # last id read from the page loader
+        self._added_ids = set()  # rows added locally that a later page will repeat
+        self._total_count = 0
+        self._favorite_count = 0
+
+    def set_secret_loader(self, loader: Optional[Callable[[int, Callable], None]]):
+        """Set the callable that loads the secret of an entry id without blocking.
+
+        loader(entry_id, callback) calls callback, on this thread, with
+        (password, totp_key), or with None if the entry is gone or the read failed.
+        """
+        self._secret_loader = loader
+        self._secrets.clear()
+        self._totp.clear()
+        self._generation += 1
+        self._secret_requests.clear()
+
+    def request_secret(self, entry_id: int, callback: Callable[[tuple], None]):
+        """Call callback with the (password, totp_key) of an entry, ("", "") if it has none.
+
+        Runs callback right away if the secret is cached, else once it is loaded.
+        """
+        secret = self._secrets.get(entry_id)
+        if secret is not None:
+            self._secrets.move_to_end(entry_id)
+            callback(secret)
+            return
+        self._load_secret(entry_id, lambda secret: callback(self._cache_secret(entry_id, secret)))
+
+    def _load_secret(self, entry_id: int, callback: Callable[[Optional[tuple]], None]):
+        callbacks = self._secret_requests.get(entry_id)
+        if callbacks is not None:
+            callbacks.append(callback)
+            return
+        if self._secret_loader is None:
+            callback(None)
+            return
+        self._secret_requests[entry_id] = [callback]
+        generation = self._generation
+        self._secret_loader(entry_id, lambda secret: self._on_secret_loaded(generation, entry_id, secret))
+
+    def _on_secret_loaded(self, generation: int, entry_id: int, secret: Optional[tuple]):
+        if generation != self._generation:
+            return
+        for callback in self._secret_requests.pop(entry_id, []):
+            callback(secret)
+        row = next((row for row, entry in enumerate(self._entries) if entry.id == entry_id), -1)
+        if row >= 0:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [self.PasswordRole, self.TotpKeyRole,
+                                                 self.TotpCodeRole, self.TotpPeriodRole])
+
+    def _cache_secret(self, entry_id: int, secret: Optional[tuple]) -> tuple:
+        if secret is None:
+            return ("", "")
+        self._secrets[entry_id] = secret
+        if len(self._secrets) > self.SECRET_CACHE_SIZE:
+            self._secrets.popitem(last=False)
+        return secret
+
+    def _secret(self, entry_id: int) -> tuple:
+        """The cached secret, or ("", "") while it is loaded; views are told by dataChanged."""
+        secret = self._secrets.get(entry_id)
+        if secret is not None:
+            self._secrets.move_to_end(entry_id)
+            return secret
+        self._load_secret(entry_id, lambda secret: self._cache_secret(entry_id, secret))
+        return ("", "")
+
+    def _load_totp_key(self, entry_id: int) -> str:
+        # Not added to the secret cache: visible TOTP rows would evict revealed passwords.
+        # Until the key arrives the code is empty; it is registered with the
+        # TOTP cache then, and dataChanged redraws the row.
+        secret = self._secrets.get(entry_id)
+        if secret is not None:
+            return secret[1] or ""
+        self._load_secret(entry_id, lambda secret: secret and self._totp.set_key(entry_id, secret[1] or ""))
+        return ""
+
+    def _forget_secret(self, entry_id: int):
+        self._secrets.pop(entry_id, None)
+        self._totp.invalidate(entry_id)
 
     def rowCount(self, parent=QModelIndex()):
         return len(self._entries)
@@ -27,21 +147,26 @@ class PasswordListModel(QAbstractListModel):
         entry = self._entries[index.row()]
 
         if role == self.IdRole:
-            return entry['id']
+            return entry.id
         elif role == self.WebsiteRole:
-            return entry['website']
+            return entry.website
         elif role == self.UsernameRole:
-            return entry['username']
+            return entry.username
         elif role == self.PasswordRole:
-            return entry['password']
+            # Only revealed passwords are decrypted for display
+            return self._secret(entry.id)[0] if entry.visible else ""
         elif role == self.VisibleRole:
-            return entry['visible']
+            return entry.visible
         elif role == self.TotpKeyRole:
-            return entry['totp_key']
+            return self._secret(entry.id)[1] if entry.has_totp else ""
         elif role == self.HasTotpRole:
-            return bool(entry['totp_key'])
+            return entry.has_totp
         elif role == self.FavoriteRole:
-            return entry['favorite']
+            return entry.favorite
+        elif role == self.TotpCodeRole:
+            return self._totp.code(entry.id) if entry.has_totp else ""
+        elif role == self.TotpPeriodRole:
+            return self._totp.period(entry.id) if entry.has_totp else 30
 
         return None
 
@@ -55,101 +180,203 @@ class PasswordListModel(QAbstractListModel):
             self.TotpKeyRole: QByteArray(b'totpKey'),
             self.HasTotpRole: QByteArray(b'hasTotp'),
             self.FavoriteRole: QByteArray(b'favorite'),
+            self.TotpCodeRole: QByteArray(b'totpCode'),
+            self.TotpPeriodRole: QByteArray(b'totpPeriod'),
         }
 
     def load_entries(self, entries: list):
+        """Load (id, website, username, has_totp, favorite) rows."""
         self.beginResetModel()
-        self._entries = []
-        for entry_id, website, username, password, totp_key, favorite in entries:
-            self._entries.append({
-                'id': entry_id,
-                'website': website,
-                'username': username,
-                'password': password,
-                'totp_key': totp_key or '',
-                'favorite': bool(favorite),
-                'visible': False
-            })
+        self._reset_state()
+        self._entries = self._make_entries(entries)
+        self._total_count = len(self._entries)
+        self._favorite_count = sum(1 for entry in self._entries if entry.favorite)
         self.endResetModel()
         self.favoriteCountChanged.emit()
+        self.countChanged.emit()
+
+    def load_pages(self, page_loader: Callable[[int, int, Callable], None], total_count: int, favorite_count: int):
+        """Request the first page now and the rest as views call fetchMore()."""
+        self.beginResetModel()
+        self._reset_state()
+        self._page_loader = page_loader
+        self._total_count = total_count
+        self._favorite_count = favorite_count
+        self.endResetModel()
+        self.favoriteCountChanged.emit()
+        self.countChanged.emit()
+        self._request_page(self.PAGE_SIZE)
+
+    def _reset_state(self):
+        self._secrets.clear()
+        self._totp.clear()
+        self._secret_requests.clear()
+        self._generation += 1
+        self._page_loader = None
+        self._page_pending = False
+        self._fetch_all_requested = False
+        self._added_ids.clear()
+        self._cursor = 0
+        self._entries = []
+
+    @staticmethod
+    def _make_entries(rows) -> list:
+        return [
+            PasswordEntry(entry_id, website, username, bool(has_totp), bool(favorite))
+            for entry_id, website, username, has_totp, favorite in rows
+        ]
+
+    def _request_page(self, limit: int):
+        """Ask the page loader for the next ``limit`` rows (-1: all the rest); one request at a time."""
+        if self._page_loader is None or self._page_pending:
+            return
+        self._page_pending = True
+        generation = self._generation
+        self._page_loader(self._cursor, limit, lambda rows: self._on_page(generation, limit, rows))
+
+    def _on_page(self, generation: int, limit: int, rows: Optional[list]):
+        if generation != self._generation:
+            return
+        self._page_pending = False
+        if rows is None:
+            # The read failed; a later fetchMore() asks again
+            return
+        if limit < 0 or len(rows) < limit:
+            self._page_loader = None
+        if rows:
+            self._cursor = rows[-1][0]
+        if self._added_ids:
+            rows = [row for row in rows if row[0] not in self._added_ids]
+        self._append(self._make_entries(rows))
+        if self._fetch_all_requested:
+            self._request_page(-1)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._page_loader is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        if self.canFetchMore(parent):
+            self._request_page(self.PAGE_SIZE)
+
+    def fetch_all(self):
+        """Request every remaining page in one go, e.g. before filtering; the rows arrive as inserts."""
+        if self._page_loader is not None:
+            self._fetch_all_requested = True
+            self._request_page(-1)
+
+    def ensure_entries(self, rows: list):
+        """Append the given summary rows that are not loaded yet, e.g. search hits in unread pages.
+
+        Pages read later skip them, as they do entries added with add_entry().
+        """
+        if self._page_loader is None:
+            return
+        missing = [row for row in rows if row[0] > self._cursor and row[0] not in self._added_ids]
+        self._added_ids.update(row[0] for row in missing)
+        self._append(self._make_entries(missing))
+
+    def _append(self, entries: list):
+        if not entries:
+            return
+        first = len(self._entries)
+        self.beginInsertRows(QModelIndex(), first, first + len(entries) - 1)
+        self._entries.extend(entries)
+        self.endInsertRows()
 
     def add_entry(self, entry_id: int, website: str, username: str, password: str, totp_key: str = "", favorite: bool = False):
+        if self._page_loader is not None:
+            # The new id sorts after every unread page; skip it when that page arrives
+            self._added_ids.add(entry_id)
         self.beginInsertRows(QModelIndex(), len(self._entries), len(self._entries))
-        self._entries.append({
-            'id': entry_id,
-            'website': website,
-            'username': username,
-            'password': password,
-            'totp_key': totp_key,
-            'favorite': favorite,
-            'visible': False
-        })
+        self._entries.append(PasswordEntry(entry_id, website, username, bool(totp_key), favorite))
         self.endInsertRows()
+        self._total_count += 1
+        self.countChanged.emit()
+        if favorite:
+            self._favorite_count += 1
+            self.favoriteCountChanged.emit()
 
     @pyqtSlot(int)
     def toggleVisibility(self, row: int):
         if 0 <= row < len(self._entries):
-            self._entries[row]['visible'] = not self._entries[row]['visible']
+            self._entries[row].visible = not self._entries[row].visible
             index = self.index(row)
-            self.dataChanged.emit(index, index, [self.VisibleRole])
+            self.dataChanged.emit(index, index, [self.VisibleRole, self.PasswordRole])
 
     def toggleFavorite(self, row: int):
         if 0 <= row < len(self._entries):
-            self._entries[row]['favorite'] = not self._entries[row]['favorite']
+            self._entries[row].favorite = not self._entries[row].favorite
+            self._favorite_count += 1 if self._entries[row].favorite else -1
             index = self.index(row)
             self.dataChanged.emit(index, index, [self.FavoriteRole])
             self.favoriteCountChanged.emit()
-            return self._entries[row]['favorite']
+            return self._entries[row].favorite
         return False
 
+    @pyqtProperty(int, notify=countChanged)
+    def count(self) -> int:
+        """Number of entries in the vault, including pages not loaded yet."""
+        return self._total_count
+
     @pyqtProperty(int, notify=favoriteCountChanged)
     def favoriteCount(self) -> int:
-        return sum(1 for entry in self._entries if entry.get('favorite', False))
+        return self._favorite_count
 
     @pyqtSlot(int, result=str)
-    def getPassword(self, row: int) -> str:
-        if 0 <= row < len(self._entries):
-            return self._entries[row]['password']
+    def getTotpCode(self, row: int) -> str:
+        if 0 <= row < len(self._entries) and self._entries[row].has_totp:
+            return self._totp.code(self._entries[row].id)
         return ""
 
+    @metrics.timed("totp.tick")
+    def refresh_totp_codes(self):
+        """Notify views of TOTP codes whose period rolled over, with a single dataChanged."""
+        changed = set(self._totp.refresh())
+        metrics.count("totp.codes_refreshed", len(changed))
+        if not changed:
+            return
+        rows = [row for row, entry in enumerate(self._entries) if entry.id in changed]
+        if rows:
+            self.dataChanged.emit(self.index(rows[0]), self.index(rows[-1]), [self.TotpCodeRole])
+
     @pyqtSlot(int, result=int)
     def getEntryId(self, row: int) -> int:
         if 0 <= row < len(self._entries):
-            return self._entries[row]['id']
+            return self._entries[row].id
         return -1
 
     @pyqtSlot(int, result=str)
     def getWebsite(self, row: int) -> str:
         if 0 <= row < len(self._entries):
-            return self._entries[row]['website']
+            return self._entries[row].website
         return ""
 
     @pyqtSlot(int, result=str)
     def getUsername(self, row: int) -> str:
         if 0 <= row < len(self._entries):
-            return self._entries[row]['username']
-        return ""
-
-    @pyqtSlot(int, result=str)
-    def getTotpKey(self, row: int) -> str:
-        if 0 <= row < len(self._entries):
-            return self._entries[row]['totp_key']
+            return self._entries[row].username
         return ""
 
     def remove_entry(self, row: int):
         if 0 <= row < len(self._entries):
-            was_favorite = self._entries[row].get('favorite', False)
+            was_favorite = self._entries[row].favorite
+            self._forget_secret(self._entries[row].id)
             self.beginRemoveRows(QModelIndex(), row, row)
             self._entries.pop(row)
             self.endRemoveRows()
+            self._total_count -= 1
+            self.countChanged.emit()
             if was_favorite:
+                self._favorite_count -= 1
                 self.favoriteCountChanged.emit()
 
     def update_entry(self, row: int, website: str, username: str, password: str, totp_key: str = ""):
         if 0 <= row < len(self._entries):
-            self._entries[row]['website'] = website
-            self._entries[row]['username'] = username
-            self._entries[row]['password'] = password
-            self._entries[row]['totp_key'] = totp_key
+            entry = self._entries[row]
+            entry.website = website
+            entry.username = username
+            entry.has_totp = bool(totp_key)
+            self._forget_secret(entry.id)
             index = self.index(row)
-            self.dataChanged.emit(index, index, [self.WebsiteRole, self.UsernameRole, self.PasswordRole, self.TotpKeyRole, self.HasTotpRole])
+            self.dataChanged.emit(index, index, [self.WebsiteRole, self.UsernameRole, self.PasswordRole, self.TotpKeyRole, self.HasTotpRole,
+                                                 self.TotpCodeRole, self.TotpPeriodRole])
@@ -1,5 +1,7 @@
 from PyQt6.QtCore import QAbstractListModel, Qt, QModelIndex, QByteArray
 
+from password_manager.core.metrics import track_resets
+
 
 class RecentVaultsModel(QAbstractListModel):
     PathRole = Qt.ItemDataRole.UserRole + 1
@@ -7,6 +9,7 @@ class RecentVaultsModel(QAbstractListModel):
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        track_resets(self)
         self._vaults = []
 
     def rowCount(self, parent=QModelIndex()):
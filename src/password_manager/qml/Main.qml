@@ -3,6 +3,7 @@ import QtQuick.Controls
 import QtQuick.Layouts
 import QtQuick.Controls.Material
 import "views"
+import "components"
 
 ApplicationWindow {
     id: root
@@ -17,6 +18,8 @@ ApplicationWindow {
     Material.accent: "#1976D2"
 
     property bool vaultUnlocked: false
+    // Unlocking a further vault while others stay open
+    property bool addingVault: false
 
     color: "#1a1a1a"
 
@@ -30,8 +33,9 @@ ApplicationWindow {
             id: unlockLoader
             anchors.fill: parent
             sourceComponent: unlockComponent
-            active: !vaultUnlocked
-            opacity: vaultUnlocked ? 0 : 1
+            active: !vaultUnlocked || addingVault
+            opacity: vaultUnlocked && !addingVault ? 0 : 1
+            z: addingVault ? 1 : 0
 
             Behavior on opacity {
                 NumberAnimation {
@@ -47,7 +51,8 @@ ApplicationWindow {
             anchors.fill: parent
             sourceComponent: mainViewComponent
             active: vaultUnlocked
-            opacity: vaultUnlocked ? 1 : 0
+            opacity: vaultUnlocked && !addingVault ? 1 : 0
+            enabled: !addingVault
 
             Behavior on opacity {
                 NumberAnimation {
@@ -61,9 +66,12 @@ ApplicationWindow {
     Component {
         id: unlockComponent
         UnlockDialog {
+            canCancel: addingVault
             onUnlockSuccessful: {
                 vaultUnlocked = true
+                addingVault = false
             }
+            onCancelled: addingVault = false
             onCreateNewVault: {
                 setupWizardDialog.open()
             }
@@ -72,13 +80,47 @@ ApplicationWindow {
 
     Component {
         id: mainViewComponent
-        MainView {}
+        MainView {
+            onOpenAnotherVault: addingVault = true
+        }
     }
 
-    SetupWizard {
+    DialogLoader {
         id: setupWizardDialog
-        onVaultCreated: {
-            vaultUnlocked = true
+        sourceComponent: Component {
+            SetupWizard {
+                onVaultCreated: {
+                    vaultUnlocked = true
+                    addingVault = false
+                }
+            }
+        }
+    }
+
+    // Hidden diagnostics panel, available on every view
+    DialogLoader {
+        id: diagnosticsDialog
+        sourceComponent: Component {
+            DiagnosticsDialog {}
+        }
+    }
+
+    Shortcut {
+        sequence: "Ctrl+Shift+D"
+        enabled: diagnosticsController !== null
+        onActivated: diagnosticsDialog.opened ? diagnosticsDialog.close() : diagnosticsDialog.open()
+    }
+
+    // Locking, by hand or after idle time, returns to the unlock view
+    Connections {
+        target: vaultController
+        function onVaultLocked() {
+            vaultUnlocked = false
+            addingVault = false
+        }
+        function onVaultClosed() {
+            vaultUnlocked = false
+            addingVault = false
         }
     }
 
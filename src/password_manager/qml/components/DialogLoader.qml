@@ -0,0 +1,21 @@
+import QtQuick
+
+// Creates its dialog on the first open() instead of when the enclosing view loads
+Loader {
+    id: loader
+    anchors.fill: parent
+    active: false
+
+    readonly property bool opened: item !== null && item.visible
+
+    function open() {
+        active = true
+        item.open()
+    }
+
+    function close() {
+        if (item) {
+            item.close()
+        }
+    }
+}
@@ -0,0 +1,41 @@
+import QtQuick
+
+// Five-segment meter for a PasswordController.passwordStrength() result
+Column {
+    id: meter
+    property string password: ""
+    readonly property var strength: passwordController && password !== ""
+        ? passwordController.passwordStrength(password) : null
+    readonly property var colors: ["#ef5350", "#FF7043", "#FF9800", "#8BC34A", "#4CAF50"]
+
+    spacing: 4
+    visible: strength !== null
+
+    Row {
+        width: parent.width
+        spacing: 4
+
+        Repeater {
+            model: 5
+
+            Rectangle {
+                required property int index
+                width: (meter.width - 16) / 5
+                height: 4
+                radius: 2
+                color: meter.strength && index <= meter.strength.score ? meter.colors[meter.strength.score] : "#3a3a3a"
+            }
+        }
+    }
+
+    Text {
+        width: parent.width
+        text: meter.strength
+            ? meter.strength.label + " · ~" + Math.round(meter.strength.bits) + " bits"
+              + (meter.strength.warning !== "" ? " — " + meter.strength.warning : "")
+            : ""
+        font.pixelSize: 11
+        color: meter.strength ? meter.colors[meter.strength.score] : "#606060"
+        wrapMode: Text.Wrap
+    }
+}
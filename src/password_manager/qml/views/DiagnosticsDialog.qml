@@ -0,0 +1,167 @@
+import QtQuick
+import QtQuick.Controls
+import QtQuick.Layouts
+import "../components"
+
+// Hidden panel (Ctrl+Shift+D) showing the metrics recorded by core/metrics.py
+AppDialog {
+    id: diagnosticsDialog
+    width: 640
+    height: 560
+    headerIcon: "\ue868"
+    headerTitle: "Diagnostics"
+
+    property var metricsData: ({ counters: [], histograms: [], seconds: 0 })
+    property string status: ""
+    property int captureSeconds: 10
+
+    function refresh() {
+        if (diagnosticsController) {
+            metricsData = diagnosticsController.snapshot()
+        }
+    }
+
+    function formatValue(value) {
+        return value === null || value === undefined ? "-" : value.toFixed(value < 10 ? 2 : 0)
+    }
+
+    onOpened: refresh()
+
+    Timer {
+        interval: 1000
+        repeat: true
+        running: diagnosticsDialog.visible && diagnosticsController && diagnosticsController.enabled
+        onTriggered: diagnosticsDialog.refresh()
+    }
+
+    Connections {
+        target: diagnosticsController
+        function onCaptureFinished(paths) {
+            diagnosticsDialog.status = paths.length ? "Capture written to " + paths.join(", ") : "Capture could not be written"
+        }
+    }
+
+    ColumnLayout {
+        anchors.fill: parent
+        anchors.margins: 20
+        spacing: 12
+
+        RowLayout {
+            Layout.fillWidth: true
+            spacing: 8
+
+            CheckBox {
+                text: "Record metrics"
+                checked: diagnosticsController ? diagnosticsController.enabled : false
+                onToggled: diagnosticsController.enabled = checked
+            }
+
+            Item { Layout.fillWidth: true }
+
+            Button {
+                text: "Reset"
+                flat: true
+                onClicked: {
+                    diagnosticsController.reset()
+                    diagnosticsDialog.refresh()
+                }
+            }
+
+            Button {
+                text: "Save JSON"
+                flat: true
+                onClicked: {
+                    var path = diagnosticsController.dumpJson("")
+                    diagnosticsDialog.status = path ? "Saved to " + path : "Metrics could not be saved"
+                }
+            }
+
+            Button {
+                text: diagnosticsController && diagnosticsController.capturing
+                      ? "Stop profile" : "Profile " + diagnosticsDialog.captureSeconds + " s"
+                highlighted: diagnosticsController && diagnosticsController.capturing
+                onClicked: {
+                    if (diagnosticsController.capturing) {
+                        diagnosticsController.stopCapture()
+                    } else {
+                        diagnosticsDialog.status = "Profiling the GUI thread..."
+                        diagnosticsController.startCapture(diagnosticsDialog.captureSeconds)
+                    }
+                }
+            }
+        }
+
+        Text {
+            Layout.fillWidth: true
+            text: diagnosticsDialog.status !== "" ? diagnosticsDialog.status
+                  : "Times in ms, sizes in bytes, over the last " + diagnosticsDialog.metricsData.seconds + " s"
+            font.pixelSize: 11
+            color: "#808080"
+            elide: Text.ElideMiddle
+        }
+
+        // Histograms: name, count, mean, p50, p95, max
+        ListView {
+            id: histogramList
+            Layout.fillWidth: true
+            Layout.fillHeight: true
+            clip: true
+            model: diagnosticsDialog.metricsData.histograms
+
+            ScrollBar.vertical: ScrollBar {}
+
+            header: Row {
+                height: 24
+                Repeater {
+                    model: ["Operation", "Count", "Mean", "p50", "p95", "Max"]
+                    Text {
+                        width: index === 0 ? histogramList.width - 5 * 70 : 70
+                        text: modelData
+                        font.pixelSize: 11
+                        font.weight: Font.Medium
+                        color: "#a0a0a0"
+                        horizontalAlignment: index === 0 ? Text.AlignLeft : Text.AlignRight
+                    }
+                }
+            }
+
+            delegate: Row {
+                height: 22
+                Repeater {
+                    model: [modelData.name, modelData.count, diagnosticsDialog.formatValue(modelData.mean),
+                            diagnosticsDialog.formatValue(modelData.p50), diagnosticsDialog.formatValue(modelData.p95),
+                            diagnosticsDialog.formatValue(modelData.max)]
+                    Text {
+                        width: index === 0 ? histogramList.width - 5 * 70 : 70
+                        text: modelData
+                        font.pixelSize: 12
+                        font.family: index === 0 ? "" : "monospace"
+                        color: "#e0e0e0"
+                        elide: Text.ElideRight
+                        horizontalAlignment: index === 0 ? Text.AlignLeft : Text.AlignRight
+                    }
+                }
+            }
+        }
+
+        Rectangle {
+            Layout.fillWidth: true
+            height: 1
+            color: "#3a3a3a"
+        }
+
+        Flow {
+            Layout.fillWidth: true
+            spacing: 16
+
+            Repeater {
+                model: diagnosticsDialog.metricsData.counters
+                Text {
+                    text: modelData.name + ": " + modelData.value
+                    font.pixelSize: 11
+                    color: "#b0b0b0"
+                }
+            }
+        }
+    }
+}
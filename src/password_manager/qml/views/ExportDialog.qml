@@ -15,6 +15,8 @@ AppDialog {
     property string selectedFormat: "csv"
     property bool exportSuccess: false
     property string locationError: ""
+    property bool exporting: passwordController ? passwordController.exporting : false
+    property real exportProgress: 0
 
     // Success view
     ColumnLayout {
@@ -112,7 +114,8 @@ AppDialog {
                         anchors.fill: parent
                         hoverEnabled: true
                         cursorShape: Qt.PointingHandCursor
-                        onClicked: exportDialog.selectedFormat = "csv"
+                        enabled: !exportDialog.exporting
+                    onClicked: exportDialog.selectedFormat = "csv"
                     }
                 }
 
@@ -140,7 +143,8 @@ AppDialog {
                         anchors.fill: parent
                         hoverEnabled: true
                         cursorShape: Qt.PointingHandCursor
-                        onClicked: exportDialog.selectedFormat = "json"
+                        enabled: !exportDialog.exporting
+                    onClicked: exportDialog.selectedFormat = "json"
                     }
                 }
             }
@@ -171,6 +175,7 @@ AppDialog {
                     id: exportBrowseButton
                     text: "Browse"
                     flat: true
+                    enabled: !exportDialog.exporting
                     onClicked: exportFileDialog.open()
                 }
             }
@@ -182,30 +187,51 @@ AppDialog {
 
         Item { Layout.fillHeight: true }
 
+        ProgressBar {
+            Layout.fillWidth: true
+            visible: exportDialog.exporting
+            value: exportDialog.exportProgress
+        }
+
         Button {
-            text: "Export"
+            text: exportDialog.exporting ? "Cancel" : "Export"
             Layout.fillWidth: true
             Layout.preferredHeight: 44
-            highlighted: true
+            highlighted: !exportDialog.exporting
             font.weight: Font.Medium
             font.pixelSize: 14
             onClicked: {
+                if (exportDialog.exporting) {
+                    passwordController.cancelExport()
+                    return
+                }
                 if (exportLocationField.text.trim() === "") {
                     exportDialog.locationError = "Please choose a location"
                     return
                 }
                 exportDialog.locationError = ""
+                exportDialog.exportProgress = 0
 
-                var success = false
+                // Runs in the background; exportFinished reports the result
                 if (exportDialog.selectedFormat === "csv") {
-                    success = passwordController.exportToCsv(exportLocationField.text)
+                    passwordController.exportToCsv(exportLocationField.text)
                 } else {
-                    success = passwordController.exportToJson(exportLocationField.text)
+                    passwordController.exportToJson(exportLocationField.text)
                 }
+            }
+        }
+    }
 
-                if (success) {
-                    exportDialog.exportSuccess = true
-                }
+    Connections {
+        target: passwordController
+        function onExportProgress(done, total) {
+            exportDialog.exportProgress = total > 0 ? done / total : 1
+        }
+        function onExportFinished(success, error) {
+            if (success) {
+                exportDialog.exportSuccess = true
+            } else if (error !== "") {
+                exportDialog.locationError = error
             }
         }
     }
@@ -231,6 +257,9 @@ AppDialog {
     }
 
     onClosed: {
+        if (exporting) {
+            passwordController.cancelExport()
+        }
         exportSuccess = false
         locationError = ""
         exportLocationField.text = ""
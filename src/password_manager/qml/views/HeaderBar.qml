@@ -51,6 +51,15 @@ Rectangle {
             color: "#ffffff"
         }
 
+        // Background save status
+        Text {
+            property string status: vaultController ? vaultController.saveStatus : ""
+            text: status === "saving" ? "Saving..." : status === "failed" ? "Save failed" : status === "saved" ? "All changes saved" : ""
+            visible: text !== ""
+            font.pixelSize: 12
+            color: status === "failed" ? "#f44336" : "#808080"
+        }
+
         Item { Layout.fillWidth: true }
 
         // Search bar
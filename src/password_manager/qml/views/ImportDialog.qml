@@ -0,0 +1,232 @@
+import QtQuick
+import QtQuick.Controls
+import QtQuick.Layouts
+import "../components"
+
+AppDialog {
+    id: importDialog
+    width: 462
+    height: 400
+    headerIcon: importSuccess ? "\ue86c" : "\ue2c6"
+    headerIconColor: importSuccess ? "#4CAF50" : "#1976D2"
+    headerTitle: importSuccess ? "Import Successful" : "Import Data"
+
+    property bool importSuccess: false
+    property bool importing: passwordController ? passwordController.importing : false
+    property real importProgress: 0
+    property string importError: ""
+    // Summary of the last preview or import, see ImportResult
+    property var summary: null
+
+    // Success view
+    ColumnLayout {
+        anchors.fill: parent
+        anchors.margins: 20
+        spacing: 16
+        visible: importDialog.importSuccess
+
+        Item { Layout.fillHeight: true }
+
+        ColumnLayout {
+            Layout.alignment: Qt.AlignHCenter
+            spacing: 16
+
+            Text {
+                text: "\ue86c"
+                font.family: "Material Icons"
+                font.pixelSize: 56
+                color: "#4CAF50"
+                Layout.alignment: Qt.AlignHCenter
+            }
+
+            Text {
+                text: importDialog.summary
+                    ? importDialog.summary.new + (importDialog.summary.new === 1 ? " entry was" : " entries were") + " imported"
+                    : ""
+                font.pixelSize: 14
+                color: "#c0c0c0"
+                Layout.alignment: Qt.AlignHCenter
+            }
+
+            Text {
+                text: importDialog.summary
+                    ? importDialog.summary.duplicates + " duplicates and " + importDialog.summary.invalid + " invalid entries skipped"
+                    : ""
+                font.pixelSize: 12
+                color: "#808080"
+                Layout.alignment: Qt.AlignHCenter
+                visible: importDialog.summary && (importDialog.summary.duplicates > 0 || importDialog.summary.invalid > 0)
+            }
+        }
+
+        Item { Layout.fillHeight: true }
+
+        Button {
+            text: "Done"
+            Layout.fillWidth: true
+            Layout.preferredHeight: 44
+            highlighted: true
+            font.weight: Font.Medium
+            font.pixelSize: 14
+            onClicked: importDialog.close()
+        }
+    }
+
+    // Import form view
+    ColumnLayout {
+        anchors.fill: parent
+        anchors.margins: 20
+        spacing: 12
+        visible: !importDialog.importSuccess
+
+        Column {
+            Layout.fillWidth: true
+            spacing: 6
+
+            SectionHeader {
+                icon: "\ue2c8"
+                label: "Import File"
+            }
+
+            BrowseFileRow {
+                id: importFileRow
+                placeholderText: "Choose an export to import..."
+                dialogTitle: "Import Passwords"
+                nameFilters: ["Exports (*.csv *.json)", "All Files (*)"]
+                enabled: !importDialog.importing
+                onFileSelected: {
+                    importDialog.summary = null
+                    importDialog.importError = ""
+                }
+            }
+
+            Text {
+                text: "CSV or JSON exports from this app, Bitwarden, KeePass or a browser"
+                font.pixelSize: 11
+                color: "#606060"
+            }
+
+            ErrorText {
+                errorMessage: importDialog.importError
+            }
+        }
+
+        // Preview of what an import would do
+        Rectangle {
+            Layout.fillWidth: true
+            Layout.preferredHeight: previewColumn.implicitHeight + 24
+            radius: 8
+            color: "#2a2a2a"
+            border.color: "#404040"
+            border.width: 1
+            visible: importDialog.summary !== null
+
+            Column {
+                id: previewColumn
+                anchors.fill: parent
+                anchors.margins: 12
+                spacing: 4
+
+                Text {
+                    text: importDialog.summary ? importDialog.summary.source + " with " + importDialog.summary.total + " entries" : ""
+                    font.pixelSize: 13
+                    font.weight: Font.Medium
+                    color: "#c0c0c0"
+                }
+
+                Text {
+                    text: importDialog.summary
+                        ? importDialog.summary.new + " new, " + importDialog.summary.duplicates + " duplicates, " + importDialog.summary.invalid + " invalid"
+                        : ""
+                    font.pixelSize: 12
+                    color: "#a0a0a0"
+                }
+
+                Text {
+                    width: parent.width
+                    text: importDialog.summary ? importDialog.summary.errors.slice(0, 3).join("\n") : ""
+                    font.pixelSize: 11
+                    color: "#f44336"
+                    elide: Text.ElideRight
+                    visible: text !== ""
+                }
+            }
+        }
+
+        Item { Layout.fillHeight: true }
+
+        ProgressBar {
+            Layout.fillWidth: true
+            visible: importDialog.importing
+            value: importDialog.importProgress
+        }
+
+        RowLayout {
+            Layout.fillWidth: true
+            spacing: 10
+
+            Button {
+                text: "Preview"
+                Layout.fillWidth: true
+                Layout.preferredHeight: 44
+                flat: true
+                font.pixelSize: 14
+                enabled: !importDialog.importing
+                onClicked: importDialog.startImport(true)
+            }
+
+            Button {
+                text: importDialog.importing ? "Cancel" : "Import"
+                Layout.fillWidth: true
+                Layout.preferredHeight: 44
+                highlighted: !importDialog.importing
+                font.weight: Font.Medium
+                font.pixelSize: 14
+                onClicked: {
+                    if (importDialog.importing) {
+                        passwordController.cancelImport()
+                    } else {
+                        importDialog.startImport(false)
+                    }
+                }
+            }
+        }
+    }
+
+    Connections {
+        target: passwordController
+        function onImportProgress(done, total) {
+            importDialog.importProgress = total > 0 ? done / total : 1
+        }
+        function onImportFinished(success, error, summary) {
+            if (!success) {
+                importDialog.importError = error
+                return
+            }
+            importDialog.summary = summary
+            if (!summary.dryRun) {
+                importDialog.importSuccess = true
+            }
+        }
+    }
+
+    function startImport(dryRun) {
+        if (importFileRow.text.trim() === "") {
+            importError = "Please choose a file"
+            return
+        }
+        importError = ""
+        importProgress = 0
+        passwordController.importFile(importFileRow.text, dryRun)
+    }
+
+    onClosed: {
+        if (importing) {
+            passwordController.cancelImport()
+        }
+        importSuccess = false
+        importError = ""
+        summary = null
+        importFileRow.text = ""
+    }
+}
@@ -19,6 +19,12 @@ Item {
     // View switching
     property string currentView: "passwords"
 
+    signal openAnotherVault()
+
+    // Switching to another open vault drops an edit of the previous one
+    property int activeVault: vaultController ? vaultController.activeVaultIndex : -1
+    onActiveVaultChanged: cancelEdit()
+
     // Click outside to unfocus search
     MouseArea {
         anchors.fill: parent
@@ -27,9 +33,8 @@ Item {
         z: -1
     }
 
-    // TOTP refresh trigger (changes every 30 seconds)
-    property int totpRefreshTrigger: 0
-    property int totpRemainingSeconds: 30 - (Math.floor(Date.now() / 1000) % 30)
+    // TOTP clock (unix seconds); codes are refreshed in Python when a period rolls over
+    property int totpClock: Math.floor(Date.now() / 1000)
 
     Timer {
         id: totpTimer
@@ -37,11 +42,10 @@ Item {
         running: true
         repeat: true
         onTriggered: {
-            var currentPeriod = Math.floor(Date.now() / 1000 / 30)
-            if (currentPeriod !== totpRefreshTrigger) {
-                totpRefreshTrigger = currentPeriod
+            totpClock = Math.floor(Date.now() / 1000)
+            if (passwordController) {
+                passwordController.refreshTotpCodes()
             }
-            totpRemainingSeconds = 30 - (Math.floor(Date.now() / 1000) % 30)
         }
     }
 
@@ -53,10 +57,7 @@ Item {
         anchors.top: parent.top
         sidebarExpanded: mainView.sidebarExpanded
         onToggleSidebar: mainView.sidebarExpanded = !mainView.sidebarExpanded
-        onLockVault: {
-            vaultController.closeVault()
-            root.vaultUnlocked = false
-        }
+        onLockVault: vaultController.lockVault()
         onSearchChanged: function(query) { mainView.searchQuery = query }
     }
 
@@ -72,28 +73,30 @@ Item {
             expanded: mainView.sidebarExpanded
             showFavoritesOnly: mainView.showFavoritesOnly
             currentView: mainView.currentView
-            totalCount: passwordListPanel.count
+            totalCount: passwordController ? passwordController.passwordModel.count : 0
             favoriteCount: passwordController ? passwordController.passwordModel.favoriteCount : 0
             onShowAllClicked: { mainView.currentView = "passwords"; mainView.showFavoritesOnly = false }
             onShowFavoritesClicked: { mainView.currentView = "passwords"; mainView.showFavoritesOnly = true }
             onOpenTotpQrGenerator: mainView.currentView = "totpQrGenerator"
             onOpenGenerator: generatorDialog.open()
+            onOpenImport: importDialog.open()
             onOpenExport: exportDialog.open()
             onOpenSecurity: mainView.currentView = "security"
             onOpenShortcuts: mainView.currentView = "shortcuts"
             onOpenAbout: aboutDialog.open()
+            onOpenAnotherVault: mainView.openAnotherVault()
+            onOpenVaultSearch: mainView.currentView = "vaultSearch"
         }
 
         PasswordListPanel {
             id: passwordListPanel
             visible: mainView.currentView === "passwords"
-            model: passwordController ? passwordController.passwordModel : null
+            model: passwordController ? passwordController.filterModel : null
             searchQuery: mainView.searchQuery
             showFavoritesOnly: mainView.showFavoritesOnly
             editMode: mainView.editMode
             editingRow: mainView.editingRow
-            totpRefreshTrigger: mainView.totpRefreshTrigger
-            totpRemainingSeconds: mainView.totpRemainingSeconds
+            totpClock: mainView.totpClock
             onEditRequested: function(row) { startEdit(row) }
             onDeleteRequested: function(row) { passwordController.deleteEntry(row) }
             onToggleFavoriteRequested: function(row) { passwordController.toggleFavorite(row) }
@@ -140,32 +143,81 @@ Item {
             visible: active
             source: "settings/KeyboardShortcutsView.qml"
         }
+
+        Loader {
+            id: vaultSearchLoader
+            Layout.fillWidth: true
+            Layout.fillHeight: true
+            active: mainView.currentView === "vaultSearch"
+            visible: active
+            source: "VaultSearchView.qml"
+        }
+
+        Binding {
+            target: vaultSearchLoader.item
+            property: "query"
+            value: mainView.searchQuery
+            when: vaultSearchLoader.status === Loader.Ready
+        }
+
+        // A chosen match opens its vault, filtered to the entry's website
+        Connections {
+            target: vaultSearchLoader.item
+            function onEntryChosen(vaultIndex, website) {
+                vaultController.switchVault(vaultIndex)
+                mainView.showFavoritesOnly = false
+                mainView.currentView = "passwords"
+                headerBar.searchText = website
+            }
+        }
     }
 
-    // Dialogs
-    PasswordGeneratorDialog {
+    // Dialogs, created on first use
+    DialogLoader {
         id: generatorDialog
-        onPasswordGenerated: function(pw) { entryForm.setPassword(pw) }
+        sourceComponent: Component {
+            PasswordGeneratorDialog {
+                onPasswordGenerated: function(pw) { entryForm.setPassword(pw) }
+            }
+        }
     }
 
-    AboutDialog {
+    DialogLoader {
         id: aboutDialog
+        sourceComponent: Component {
+            AboutDialog {}
+        }
     }
 
-    ExportDialog {
+    DialogLoader {
+        id: importDialog
+        sourceComponent: Component {
+            ImportDialog {}
+        }
+    }
+
+    DialogLoader {
         id: exportDialog
+        sourceComponent: Component {
+            ExportDialog {}
+        }
+    }
+
+    Connections {
+        target: passwordController
+        function onEntryLoaded(row, website, username, password, totpKey) {
+            if (mainView.editMode && row === mainView.editingRow) {
+                entryForm.loadEntry(website, username, password, totpKey)
+            }
+        }
     }
 
     // Orchestration functions
+    // The form is filled once the entry's secrets are read, see onEntryLoaded
     function startEdit(row) {
         editMode = true
         editingRow = row
-        entryForm.loadEntry(
-            passwordController.getWebsite(row),
-            passwordController.getUsername(row),
-            passwordController.getPassword(row),
-            passwordController.getTotpKey(row)
-        )
+        passwordController.loadEntry(row)
     }
 
     function cancelEdit() {
@@ -203,10 +255,7 @@ Item {
 
     Shortcut {
         sequence: "Ctrl+L"
-        onActivated: {
-            vaultController.closeVault()
-            root.vaultUnlocked = false
-        }
+        onActivated: vaultController.lockVault()
     }
 
     Shortcut {
@@ -222,9 +271,10 @@ Item {
     Shortcut {
         sequence: "Escape"
         onActivated: {
-            if (generatorDialog.visible) generatorDialog.close()
-            else if (aboutDialog.visible) aboutDialog.close()
-            else if (exportDialog.visible) exportDialog.close()
+            if (generatorDialog.opened) generatorDialog.close()
+            else if (aboutDialog.opened) aboutDialog.close()
+            else if (importDialog.opened) importDialog.close()
+            else if (exportDialog.opened) exportDialog.close()
             else if (editMode) cancelEdit()
             else headerBar.clearSearch()
         }
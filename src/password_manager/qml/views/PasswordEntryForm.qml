@@ -105,6 +105,24 @@ Rectangle {
             field.onAccepted: totpField.forceActiveFocus()
         }
 
+        StrengthMeter {
+            Layout.fillWidth: true
+            Layout.topMargin: -8
+            password: passwordField.text
+        }
+
+        // Looked up in the local breach corpus as the password is typed
+        Text {
+            property int timesSeen: passwordController ? passwordController.breachCount(passwordField.text) : -1
+            Layout.fillWidth: true
+            Layout.topMargin: -8
+            text: "Seen " + timesSeen.toLocaleString(Qt.locale(), 'f', 0) + (timesSeen === 1 ? " time" : " times") + " in data breaches"
+            font.pixelSize: 11
+            color: "#FF9800"
+            wrapMode: Text.Wrap
+            visible: timesSeen > 0
+        }
+
         // TOTP field
         Column {
             Layout.fillWidth: true
@@ -132,7 +150,7 @@ Rectangle {
             }
 
             Text {
-                text: "Base32 secret for 2FA codes"
+                text: "Base32 secret or otpauth:// URI for 2FA codes"
                 font.pixelSize: 10
                 color: "#606060"
                 visible: !passwordController || passwordController.totpError === ""
@@ -6,29 +6,43 @@ import "../components"
 AppDialog {
     id: generatorDialog
     width: 462
-    height: 440
+    height: 520
     headerIcon: "\ue73c"
     headerTitle: "Password Generator"
 
     signal passwordGenerated(string password)
 
-    function generateRandomPassword(length, useUppercase, useLowercase, useNumbers, useSymbols) {
-        var chars = ""
-        if (useLowercase) chars += "abcdefghijklmnopqrstuvwxyz"
-        if (useUppercase) chars += "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
-        if (useNumbers) chars += "0123456789"
-        if (useSymbols) chars += "!@#$%^&*()_+-=[]{}|;:,.<>?"
-        if (chars === "") chars = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
-
-        var password = ""
-        for (var i = 0; i < length; i++) {
-            password += chars.charAt(Math.floor(Math.random() * chars.length))
-        }
-        return password
+    readonly property bool passphraseMode: modeBar.currentIndex === 1
+    readonly property var separators: ["-", " ", ".", "_"]
+    readonly property real entropyBits: {
+        if (!generatorController) return 0
+        if (passphraseMode) return generatorController.passphraseEntropy(genWordsSlider.value, genIncludeNumber.checked)
+        return generatorController.passwordEntropy(genLengthSlider.value, genUppercase.checked, genLowercase.checked, genNumbers.checked, genSymbols.checked)
     }
 
+    // Generated in Python from the OS CSPRNG; see GeneratorController
     function regenerate() {
-        generatedPasswordText.text = generateRandomPassword(genLengthSlider.value, genUppercase.checked, genLowercase.checked, genNumbers.checked, genSymbols.checked)
+        if (!generatorController) return
+        if (passphraseMode) {
+            generatedPasswordText.text = generatorController.generatePassphrase(
+                genWordsSlider.value, separators[genSeparator.currentIndex], genCapitalize.checked, genIncludeNumber.checked)
+        } else {
+            generatedPasswordText.text = generatorController.generatePassword(
+                genLengthSlider.value, genUppercase.checked, genLowercase.checked, genNumbers.checked, genSymbols.checked)
+        }
+    }
+
+    // Options changes regenerate once after the slider or checkbox settles
+    function scheduleRegenerate() {
+        regenerateTimer.restart()
+    }
+
+    onAboutToShow: regenerate()
+
+    Timer {
+        id: regenerateTimer
+        interval: 150
+        onTriggered: generatorDialog.regenerate()
     }
 
     ColumnLayout {
@@ -39,7 +53,6 @@ AppDialog {
         // Generated password display
         Rectangle {
             Layout.fillWidth: true
-            Layout.bottomMargin: 8
             height: 48
             color: "#1e1e1e"
             radius: 8
@@ -53,7 +66,6 @@ AppDialog {
 
                 Text {
                     id: generatedPasswordText
-                    text: generatorDialog.generateRandomPassword(genLengthSlider.value, genUppercase.checked, genLowercase.checked, genNumbers.checked, genSymbols.checked)
                     font.pixelSize: 15
                     font.family: "Menlo"
                     color: "#ffffff"
@@ -87,87 +99,182 @@ AppDialog {
             }
         }
 
-        // Length slider
-        Column {
+        Text {
+            Layout.bottomMargin: 4
+            text: "~" + Math.round(generatorDialog.entropyBits) + " bits of entropy"
+            font.pixelSize: 11
+            color: "#606060"
+        }
+
+        TabBar {
+            id: modeBar
             Layout.fillWidth: true
-            spacing: 6
+            onCurrentIndexChanged: generatorDialog.regenerate()
 
-            Row {
-                width: parent.width
-                spacing: 8
+            TabButton { text: "Password" }
+            TabButton { text: "Passphrase" }
+        }
+
+        StackLayout {
+            Layout.fillWidth: true
+            currentIndex: modeBar.currentIndex
+
+            // Password options
+            Column {
+                spacing: 12
 
-                SectionHeader {
-                    icon: "\ue8ff"
-                    label: "Length"
+                Column {
+                    width: parent.width
+                    spacing: 6
+
+                    Row {
+                        width: parent.width
+                        spacing: 8
+
+                        SectionHeader {
+                            icon: "\ue8ff"
+                            label: "Length"
+                        }
+
+                        Item { width: parent.width - 180 }
+
+                        Text {
+                            text: genLengthSlider.value + " characters"
+                            font.pixelSize: 13
+                            color: "#808080"
+                        }
+                    }
+
+                    Slider {
+                        id: genLengthSlider
+                        width: parent.width
+                        from: 8
+                        to: 64
+                        value: 16
+                        stepSize: 1
+                        onValueChanged: generatorDialog.scheduleRegenerate()
+                    }
                 }
 
-                Item { width: parent.width - 180 }
+                Column {
+                    width: parent.width
+                    spacing: 6
 
-                Text {
-                    text: genLengthSlider.value + " characters"
-                    font.pixelSize: 13
-                    color: "#808080"
+                    SectionHeader {
+                        icon: "\ue8d3"
+                        label: "Character Types"
+                    }
+
+                    GridLayout {
+                        width: parent.width
+                        columns: 2
+                        rowSpacing: 4
+                        columnSpacing: 8
+
+                        CheckBox {
+                            id: genUppercase
+                            text: "Uppercase (A-Z)"
+                            checked: true
+                            onCheckedChanged: generatorDialog.scheduleRegenerate()
+                        }
+
+                        CheckBox {
+                            id: genLowercase
+                            text: "Lowercase (a-z)"
+                            checked: true
+                            onCheckedChanged: generatorDialog.scheduleRegenerate()
+                        }
+
+                        CheckBox {
+                            id: genNumbers
+                            text: "Numbers (0-9)"
+                            checked: true
+                            onCheckedChanged: generatorDialog.scheduleRegenerate()
+                        }
+
+                        CheckBox {
+                            id: genSymbols
+                            text: "Symbols (!@#$)"
+                            checked: true
+                            onCheckedChanged: generatorDialog.scheduleRegenerate()
+                        }
+                    }
                 }
             }
 
-            Slider {
-                id: genLengthSlider
-                width: parent.width
-                from: 8
-                to: 64
-                value: 16
-                stepSize: 1
-                onValueChanged: generatorDialog.regenerate()
-            }
-        }
+            // Passphrase options
+            Column {
+                spacing: 12
 
-        // Character options
-        Column {
-            Layout.fillWidth: true
-            spacing: 6
+                Column {
+                    width: parent.width
+                    spacing: 6
 
-            SectionHeader {
-                icon: "\ue8d3"
-                label: "Character Types"
-            }
+                    Row {
+                        width: parent.width
+                        spacing: 8
 
-            GridLayout {
-                width: parent.width
-                columns: 2
-                rowSpacing: 4
-                columnSpacing: 8
-
-                CheckBox {
-                    id: genUppercase
-                    text: "Uppercase (A-Z)"
-                    checked: true
-                    onCheckedChanged: generatorDialog.regenerate()
-                }
+                        SectionHeader {
+                            icon: "\ue264"
+                            label: "Words"
+                        }
 
-                CheckBox {
-                    id: genLowercase
-                    text: "Lowercase (a-z)"
-                    checked: true
-                    onCheckedChanged: generatorDialog.regenerate()
-                }
+                        Item { width: parent.width - 160 }
+
+                        Text {
+                            text: genWordsSlider.value + " words"
+                            font.pixelSize: 13
+                            color: "#808080"
+                        }
+                    }
 
-                CheckBox {
-                    id: genNumbers
-                    text: "Numbers (0-9)"
-                    checked: true
-                    onCheckedChanged: generatorDialog.regenerate()
+                    Slider {
+                        id: genWordsSlider
+                        width: parent.width
+                        from: 3
+                        to: 12
+                        value: 5
+                        stepSize: 1
+                        onValueChanged: generatorDialog.scheduleRegenerate()
+                    }
                 }
 
-                CheckBox {
-                    id: genSymbols
-                    text: "Symbols (!@#$)"
-                    checked: true
-                    onCheckedChanged: generatorDialog.regenerate()
+                GridLayout {
+                    width: parent.width
+                    columns: 2
+                    rowSpacing: 4
+                    columnSpacing: 8
+
+                    CheckBox {
+                        id: genCapitalize
+                        text: "Capitalize words"
+                        onCheckedChanged: generatorDialog.scheduleRegenerate()
+                    }
+
+                    CheckBox {
+                        id: genIncludeNumber
+                        text: "Include a number"
+                        onCheckedChanged: generatorDialog.scheduleRegenerate()
+                    }
+
+                    Text {
+                        text: "Separator"
+                        font.pixelSize: 13
+                        color: "#c0c0c0"
+                        Layout.leftMargin: 8
+                    }
+
+                    ComboBox {
+                        id: genSeparator
+                        Layout.fillWidth: true
+                        model: ["Hyphen ( - )", "Space", "Period ( . )", "Underscore ( _ )"]
+                        onCurrentIndexChanged: generatorDialog.scheduleRegenerate()
+                    }
                 }
             }
         }
 
-        Item { Layout.preferredHeight: 12 }
+        Item { Layout.fillHeight: true }
 
         Button {
             text: "Use This Password"
@@ -17,8 +17,7 @@ Rectangle {
     property bool showFavoritesOnly: false
     property bool editMode: false
     property int editingRow: -1
-    property int totpRefreshTrigger: 0
-    property int totpRemainingSeconds: 30
+    property int totpClock: 0
 
     readonly property int count: passwordList.count
 
@@ -31,6 +30,21 @@ Rectangle {
     signal openWebsiteRequested(int row)
     signal toggleVisibilityRequested(int row)
 
+    // Filtering happens in the Python proxy model; the list only sees matching rows
+    Binding {
+        target: listPanel.model
+        property: "searchQuery"
+        value: listPanel.searchQuery
+        when: listPanel.model !== null
+    }
+
+    Binding {
+        target: listPanel.model
+        property: "favoritesOnly"
+        value: listPanel.showFavoritesOnly
+        when: listPanel.model !== null
+    }
+
     layer.enabled: true
     layer.effect: MultiEffect {
         shadowEnabled: true
@@ -161,21 +175,13 @@ Rectangle {
             delegate: Rectangle {
                 id: delegateItem
                 width: passwordList.width
-                height: matchesSearch ? 56 : 0
-                visible: matchesSearch
+                height: 56
                 clip: true
-                color: listPanel.editMode && listPanel.editingRow === index ? "#1976D230" : (mouseArea.containsMouse ? "#2f2f2f" : "#002f2f2f")
-
-                property bool matchesSearch: {
-                    if (listPanel.showFavoritesOnly && !model.favorite) return false
-                    if (listPanel.searchQuery === "") return true
-                    var query = listPanel.searchQuery.toLowerCase()
-                    return model.website.toLowerCase().indexOf(query) !== -1 ||
-                           model.username.toLowerCase().indexOf(query) !== -1
-                }
+                color: listPanel.editMode && listPanel.editingRow === sourceRow() ? "#1976D230" : (mouseArea.containsMouse ? "#2f2f2f" : "#002f2f2f")
 
-                Behavior on height {
-                    NumberAnimation { duration: 150 }
+                // Controller slots take rows of the unfiltered model
+                function sourceRow() {
+                    return listPanel.model.mapToSourceRow(index)
                 }
 
                 Behavior on color {
@@ -209,7 +215,7 @@ Rectangle {
                             anchors.fill: parent
                             hoverEnabled: true
                             cursorShape: Qt.PointingHandCursor
-                            onClicked: listPanel.openWebsiteRequested(index)
+                            onClicked: listPanel.openWebsiteRequested(sourceRow())
                         }
                     }
 
@@ -218,7 +224,7 @@ Rectangle {
                         Layout.fillWidth: true
                         Layout.preferredWidth: 1
                         displayText: model.username
-                        onCopyClicked: listPanel.copyUsernameRequested(index)
+                        onCopyClicked: listPanel.copyUsernameRequested(sourceRow())
                     }
 
                     // Password - clickable to copy
@@ -227,7 +233,7 @@ Rectangle {
                         Layout.preferredWidth: 1
                         displayText: model.password
                         masked: !model.visible
-                        onCopyClicked: listPanel.copyPasswordRequested(index)
+                        onCopyClicked: listPanel.copyPasswordRequested(sourceRow())
                     }
 
                     // TOTP code display with timer
@@ -246,10 +252,7 @@ Rectangle {
 
                             Text {
                                 anchors.verticalCenter: parent.verticalCenter
-                                text: {
-                                    var trigger = listPanel.totpRefreshTrigger
-                                    return model.hasTotp ? passwordController.generateTotp(index) : ""
-                                }
+                                text: model.totpCode
                                 font.pixelSize: 14
                                 font.weight: Font.Medium
                                 font.family: "Menlo"
@@ -262,8 +265,9 @@ Rectangle {
                                 height: 18
                                 anchors.verticalCenter: parent.verticalCenter
 
-                                property real progress: listPanel.totpRemainingSeconds / 30.0
-                                property color circleColor: listPanel.totpRemainingSeconds <= 5 ? "#ef5350" : "#4CAF50"
+                                property int remainingSeconds: model.totpPeriod - (listPanel.totpClock % model.totpPeriod)
+                                property real progress: remainingSeconds / model.totpPeriod
+                                property color circleColor: remainingSeconds <= 5 ? "#ef5350" : "#4CAF50"
 
                                 onProgressChanged: requestPaint()
                                 onCircleColorChanged: requestPaint()
@@ -296,7 +300,7 @@ Rectangle {
                             anchors.fill: parent
                             hoverEnabled: true
                             cursorShape: Qt.PointingHandCursor
-                            onClicked: listPanel.copyTotpRequested(index)
+                            onClicked: listPanel.copyTotpRequested(sourceRow())
                         }
 
                         ToolTip {
@@ -338,7 +342,7 @@ Rectangle {
                             iconSize: 16
                             iconColor: model.favorite ? "#FFC107" : "#e0e0e0"
                             tooltip: model.favorite ? "Remove from favorites" : "Add to favorites"
-                            onClicked: listPanel.toggleFavoriteRequested(index)
+                            onClicked: listPanel.toggleFavoriteRequested(sourceRow())
                         }
                         IconButton {
                             width: 32
@@ -347,7 +351,7 @@ Rectangle {
                             iconSize: 16
                             iconColor: "#1976D2"
                             tooltip: "Edit"
-                            onClicked: listPanel.editRequested(index)
+                            onClicked: listPanel.editRequested(sourceRow())
                         }
                         IconButton {
                             width: 32
@@ -355,7 +359,7 @@ Rectangle {
                             materialIcon: model.visible ? "\ue8f4" : "\ue8f5"
                             iconSize: 16
                             tooltip: model.visible ? "Hide password" : "Show password"
-                            onClicked: listPanel.toggleVisibilityRequested(index)
+                            onClicked: listPanel.toggleVisibilityRequested(sourceRow())
                         }
                         IconButton {
                             width: 32
@@ -364,7 +368,7 @@ Rectangle {
                             iconSize: 16
                             iconColor: "#ef5350"
                             tooltip: "Delete"
-                            onClicked: listPanel.deleteRequested(index)
+                            onClicked: listPanel.deleteRequested(sourceRow())
                         }
                     }
                 }
@@ -399,7 +403,7 @@ Rectangle {
                     }
 
                     Text {
-                        text: "No passwords yet"
+                        text: listPanel.searchQuery !== "" || listPanel.showFavoritesOnly ? "No matching passwords" : "No passwords yet"
                         font.pixelSize: 16
                         font.weight: Font.Medium
                         color: "#606060"
@@ -408,6 +412,7 @@ Rectangle {
 
                     Text {
                         text: "Add your first password using the form"
+                        visible: listPanel.searchQuery === "" && !listPanel.showFavoritesOnly
                         font.pixelSize: 13
                         color: "#505050"
                         anchors.horizontalCenter: parent.horizontalCenter
@@ -61,6 +61,11 @@ AppDialog {
                 echoMode: TextInput.Password
             }
 
+            StrengthMeter {
+                width: parent.width
+                password: passwordField.text
+            }
+
             ErrorText {
                 errorMessage: setupDialog.passwordError
             }
@@ -88,7 +93,7 @@ AppDialog {
                 }
 
                 Text {
-                    text: "Min 8 chars with upper, lower, digit & special"
+                    text: "Min 8 chars with upper, lower, digit & special, rated Strong"
                     font.pixelSize: 11
                     color: "#606060"
                 }
@@ -21,10 +21,13 @@ Rectangle {
     signal showFavoritesClicked()
     signal openTotpQrGenerator()
     signal openGenerator()
+    signal openImport()
     signal openExport()
     signal openSecurity()
     signal openShortcuts()
     signal openAbout()
+    signal openAnotherVault()
+    signal openVaultSearch()
 
     Behavior on Layout.preferredWidth {
         NumberAnimation { duration: 200; easing.type: Easing.OutQuad }
@@ -71,6 +74,70 @@ Rectangle {
             color: "#3a3a3a"
         }
 
+        Text {
+            text: "VAULTS"
+            font.pixelSize: 10
+            font.weight: Font.Medium
+            font.letterSpacing: 1
+            color: "#606060"
+            visible: sidebar.expanded
+            Layout.leftMargin: 12
+            Layout.bottomMargin: 4
+        }
+
+        // Every unlocked vault; the selected one is shown in the list
+        Repeater {
+            model: vaultController ? vaultController.openVaults : []
+
+            SidebarItem {
+                id: vaultItem
+                icon: "\ue2c7"
+                label: modelData.name ? modelData.name.charAt(0).toUpperCase() + modelData.name.slice(1) : "Vault"
+                expanded: sidebar.expanded
+                selected: index === vaultController.activeVaultIndex
+                onClicked: vaultController.switchVault(index)
+
+                IconButton {
+                    anchors.right: parent.right
+                    anchors.verticalCenter: parent.verticalCenter
+                    width: 28
+                    height: 28
+                    materialIcon: "\ue5cd"
+                    iconSize: 14
+                    iconColor: "#808080"
+                    tooltip: "Close vault"
+                    visible: sidebar.expanded && (vaultItem.hovered || hovered)
+                    onClicked: vaultController.closeOpenVault(index)
+                }
+            }
+        }
+
+        SidebarItem {
+            icon: "\ue145"
+            label: "Open Another Vault"
+            expanded: sidebar.expanded
+            onClicked: sidebar.openAnotherVault()
+        }
+
+        SidebarItem {
+            icon: "\ue8b6"
+            label: "Search All Vaults"
+            expanded: sidebar.expanded
+            visible: vaultController && vaultController.openVaults.length > 1
+            selected: sidebar.currentView === "vaultSearch"
+            onClicked: sidebar.openVaultSearch()
+        }
+
+        Rectangle {
+            Layout.fillWidth: true
+            Layout.topMargin: 8
+            Layout.bottomMargin: 8
+            Layout.leftMargin: 8
+            Layout.rightMargin: 8
+            height: 1
+            color: "#3a3a3a"
+        }
+
         Text {
             text: "TOOLS"
             font.pixelSize: 10
@@ -89,6 +156,13 @@ Rectangle {
             onClicked: sidebar.openGenerator()
         }
 
+        SidebarItem {
+            icon: "\ue2c6"
+            label: "Import Data"
+            expanded: sidebar.expanded
+            onClicked: sidebar.openImport()
+        }
+
         SidebarItem {
             icon: "\ue2c4"
             label: "Export Data"
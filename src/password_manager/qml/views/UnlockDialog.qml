@@ -10,10 +10,15 @@ Item {
 
     signal unlockSuccessful()
     signal createNewVault()
+    signal cancelled()
+
+    // Set while other vaults stay open, to go back to them
+    property bool canCancel: false
 
     property string fileError: ""
     property string passwordError: ""
-    property string selectedVaultPath: ""
+    // A locked vault is preselected; it unlocks without the key derivation
+    property string selectedVaultPath: vaultController ? vaultController.lockedVaultPath : ""
     property int missingVaultIndex: -1
 
     Rectangle {
@@ -269,7 +274,7 @@ Item {
                     spacing: 8
 
                     Text {
-                        text: "Welcome Back"
+                        text: unlockView.canCancel ? "Open Another Vault" : "Welcome Back"
                         font.pixelSize: 26
                         font.weight: Font.DemiBold
                         color: "#ffffff"
@@ -277,7 +282,7 @@ Item {
                     }
 
                     Text {
-                        text: "Enter your credentials to unlock your vault"
+                        text: unlockView.canCancel ? "It opens alongside the vaults already unlocked" : "Enter your credentials to unlock your vault"
                         font.pixelSize: 14
                         color: "#808080"
                         anchors.horizontalCenter: parent.horizontalCenter
@@ -392,34 +397,52 @@ Item {
                         flat: true
                         onClicked: createNewVault()
                     }
+
+                    Button {
+                        width: parent.width
+                        height: 44
+                        text: "Back to Open Vaults"
+                        flat: true
+                        visible: unlockView.canCancel
+                        onClicked: cancelled()
+                    }
                 }
             }
         }
     }
 
-    MissingVaultDialog {
+    // Dialogs, created on first use
+    DialogLoader {
         id: missingVaultDialog
-        onRemoveRequested: {
-            vaultController.removeRecentVault(missingVaultIndex)
-            missingVaultIndex = -1
+        sourceComponent: Component {
+            MissingVaultDialog {
+                onRemoveRequested: {
+                    vaultController.removeRecentVault(missingVaultIndex)
+                    missingVaultIndex = -1
+                }
+            }
         }
     }
 
-    FileDialog {
+    DialogLoader {
         id: openFileDialog
-        title: "Open Vault File"
-        fileMode: FileDialog.OpenFile
-        nameFilters: ["Vault Files (*.vault)"]
-        onAccepted: {
-            var path = selectedFile.toString()
-            if (path.startsWith("file:///")) {
-                path = path.substring(8)
-                if (path.length > 1 && path.charAt(1) !== ':') {
-                    path = "/" + path
+        sourceComponent: Component {
+            FileDialog {
+                title: "Open Vault File"
+                fileMode: FileDialog.OpenFile
+                nameFilters: ["Vault Files (*.vault)"]
+                onAccepted: {
+                    var path = selectedFile.toString()
+                    if (path.startsWith("file:///")) {
+                        path = path.substring(8)
+                        if (path.length > 1 && path.charAt(1) !== ':') {
+                            path = "/" + path
+                        }
+                    }
+                    selectedVaultPath = path
+                    fileField.text = path
                 }
             }
-            selectedVaultPath = path
-            fileField.text = path
         }
     }
 
@@ -433,6 +456,12 @@ Item {
         }
     }
 
+    Component.onCompleted: {
+        if (selectedVaultPath !== "") {
+            passwordField.forceActiveFocus()
+        }
+    }
+
     function unlock() {
         var valid = true
 
@@ -0,0 +1,162 @@
+import QtQuick
+import QtQuick.Controls
+import QtQuick.Layouts
+import QtQuick.Effects
+import "../components"
+
+Rectangle {
+    id: vaultSearchView
+    Layout.fillWidth: true
+    Layout.fillHeight: true
+    color: "#252525"
+    radius: 12
+
+    // Text of the header search field
+    property string query: ""
+    // See VaultController.searchAllVaults()
+    property var results: []
+
+    signal entryChosen(int vaultIndex, string website)
+
+    function refresh() {
+        results = vaultController ? vaultController.searchAllVaults(query) : []
+    }
+
+    // Searches once typing pauses; every vault is searched on each run
+    onQueryChanged: searchTimer.restart()
+    Component.onCompleted: refresh()
+
+    Timer {
+        id: searchTimer
+        interval: 150
+        onTriggered: vaultSearchView.refresh()
+    }
+
+    Connections {
+        target: vaultController
+        function onOpenVaultsChanged() {
+            vaultSearchView.refresh()
+        }
+    }
+
+    layer.enabled: true
+    layer.effect: MultiEffect {
+        shadowEnabled: true
+        shadowColor: "#40000000"
+        shadowBlur: 0.5
+        shadowVerticalOffset: 2
+    }
+
+    ColumnLayout {
+        anchors.fill: parent
+        anchors.margins: 24
+        spacing: 16
+
+        // Header
+        Row {
+            spacing: 10
+
+            Text {
+                text: "\ue8b6"
+                font.family: "Material Icons"
+                font.pixelSize: 28
+                color: "#b0b0b0"
+                anchors.verticalCenter: parent.verticalCenter
+            }
+
+            Text {
+                text: "Search All Vaults"
+                font.pixelSize: 20
+                font.weight: Font.Medium
+                color: "#e0e0e0"
+                anchors.verticalCenter: parent.verticalCenter
+            }
+        }
+
+        Text {
+            text: vaultSearchView.query.trim() === ""
+                ? "Type in the search bar to find entries in every open vault"
+                : vaultSearchView.results.length + (vaultSearchView.results.length === 1 ? " match" : " matches")
+                  + " in " + (vaultController ? vaultController.openVaults.length : 0) + " vaults"
+            font.pixelSize: 12
+            color: "#a0a0a0"
+        }
+
+        Rectangle {
+            Layout.fillWidth: true
+            height: 1
+            color: "#3a3a3a"
+        }
+
+        ListView {
+            id: resultList
+            Layout.fillWidth: true
+            Layout.fillHeight: true
+            clip: true
+            spacing: 2
+            model: vaultSearchView.results
+
+            ScrollBar.vertical: ScrollBar {}
+
+            delegate: Rectangle {
+                width: resultList.width
+                height: 48
+                radius: 8
+                color: resultMouse.containsMouse ? "#2f2f2f" : "#002f2f2f"
+
+                Behavior on color {
+                    ColorAnimation { duration: 150 }
+                }
+
+                MouseArea {
+                    id: resultMouse
+                    anchors.fill: parent
+                    hoverEnabled: true
+                    cursorShape: Qt.PointingHandCursor
+                    onClicked: vaultSearchView.entryChosen(modelData.vaultIndex, modelData.website)
+                }
+
+                RowLayout {
+                    anchors.fill: parent
+                    anchors.leftMargin: 12
+                    anchors.rightMargin: 12
+                    spacing: 12
+
+                    Rectangle {
+                        Layout.preferredWidth: vaultLabel.width + 16
+                        height: 22
+                        radius: 11
+                        color: "#1976D230"
+
+                        Text {
+                            id: vaultLabel
+                            anchors.centerIn: parent
+                            text: modelData.vaultName ? modelData.vaultName.charAt(0).toUpperCase() + modelData.vaultName.slice(1) : "Vault"
+                            font.pixelSize: 11
+                            font.weight: Font.Medium
+                            color: "#1976D2"
+                        }
+                    }
+
+                    Text {
+                        text: modelData.website
+                        font.pixelSize: 13
+                        color: "#e0e0e0"
+                        elide: Text.ElideRight
+                        Layout.fillWidth: true
+                        Layout.preferredWidth: 1
+                    }
+
+                    Text {
+                        text: modelData.username
+                        font.pixelSize: 13
+                        color: "#a0a0a0"
+                        elide: Text.ElideRight
+                        Layout.fillWidth: true
+                        Layout.preferredWidth: 1
+                    }
+                }
+            }
+        }
+    }
+}
@@ -0,0 +1,117 @@
+import QtQuick
+import QtQuick.Controls
+import "../../components"
+
+Column {
+    id: breachCheck
+    spacing: 12
+
+    property bool checking: passwordController ? passwordController.breachChecking : false
+    property real checkProgress: 0
+    property string checkError: ""
+    // See PasswordController.breachCheckFinished
+    property var result: null
+
+    SectionHeader {
+        icon: "\ue002"
+        label: "Breached Passwords"
+    }
+
+    BrowseFileRow {
+        placeholderText: "Choose a breach corpus..."
+        dialogTitle: "Breach Corpus"
+        nameFilters: ["Breach corpus (*.bin)", "All Files (*)"]
+        text: passwordController ? passwordController.breachCorpusPath : ""
+        enabled: !breachCheck.checking
+        onFileSelected: function(path) {
+            breachCheck.result = null
+            passwordController.setBreachCorpus(path)
+        }
+    }
+
+    Text {
+        width: parent.width
+        text: passwordController && passwordController.breachCorpusPath !== ""
+            ? passwordController.breachCorpusSize.toLocaleString(Qt.locale(), 'f', 0) + " breached password hashes, checked offline"
+            : "Convert a Have I Been Pwned SHA-1 download with tools/build_breach_corpus.py"
+        font.pixelSize: 11
+        color: "#606060"
+        wrapMode: Text.Wrap
+    }
+
+    ErrorText {
+        errorMessage: breachCheck.checkError !== "" ? breachCheck.checkError
+            : (passwordController ? passwordController.breachCorpusError : "")
+    }
+
+    Row {
+        width: parent.width
+        spacing: 10
+
+        Button {
+            id: checkButton
+            text: breachCheck.checking ? "Cancel" : "Check Vault"
+            highlighted: !breachCheck.checking
+            enabled: passwordController && passwordController.breachCorpusPath !== ""
+            onClicked: {
+                if (breachCheck.checking) {
+                    passwordController.cancelBreachCheck()
+                    return
+                }
+                breachCheck.checkError = ""
+                breachCheck.checkProgress = 0
+                passwordController.checkBreaches()
+            }
+        }
+
+        ProgressBar {
+            width: parent.width - checkButton.width - 10
+            anchors.verticalCenter: parent.verticalCenter
+            visible: breachCheck.checking
+            value: breachCheck.checkProgress
+        }
+
+        Text {
+            anchors.verticalCenter: parent.verticalCenter
+            visible: !breachCheck.checking && breachCheck.result !== null
+            text: breachCheck.result
+                ? (breachCheck.result.count === 0 ? "No passwords found in breaches"
+                   : breachCheck.result.count + (breachCheck.result.count === 1 ? " entry uses" : " entries use") + " a breached password")
+                : ""
+            font.pixelSize: 13
+            color: breachCheck.result && breachCheck.result.count > 0 ? "#FF9800" : "#4CAF50"
+        }
+    }
+
+    ListView {
+        width: parent.width
+        height: Math.min(contentHeight, 80)
+        clip: true
+        model: breachCheck.result ? breachCheck.result.entries : []
+        visible: count > 0
+        ScrollBar.vertical: ScrollBar {}
+
+        delegate: Text {
+            required property var modelData
+            width: ListView.view.width
+            text: modelData.website + "  ·  " + modelData.username + "  —  seen " + modelData.seen.toLocaleString(Qt.locale(), 'f', 0) + " times"
+            font.pixelSize: 12
+            color: "#909090"
+            elide: Text.ElideRight
+            height: 20
+        }
+    }
+
+    Connections {
+        target: passwordController
+        function onBreachCheckProgress(done, total) {
+            breachCheck.checkProgress = total > 0 ? done / total : 1
+        }
+        function onBreachCheckFinished(success, error, result) {
+            breachCheck.checkError = error
+            if (success) {
+                breachCheck.result = result
+            }
+        }
+    }
+}
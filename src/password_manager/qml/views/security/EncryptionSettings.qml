@@ -0,0 +1,116 @@
+import QtQuick
+import QtQuick.Controls
+import QtQuick.Layouts
+import "../../components"
+
+Column {
+    id: encryptionSettings
+    spacing: 12
+
+    property string retuneError: ""
+    property bool retuneSuccess: false
+    property bool retuning: false
+    property real retuneProgress: 0
+
+    SectionHeader {
+        icon: ""
+        label: "Encryption"
+    }
+
+    Text {
+        width: parent.width
+        text: "Key derivation: " + (vaultController ? vaultController.kdfIterations.toLocaleString(Qt.locale(), 'f', 0) : "") +
+              " PBKDF2 iterations\nPage size: " + (vaultController ? vaultController.cipherPageSize : "") + " bytes"
+        font.pixelSize: 13
+        color: "#b0b0b0"
+        lineHeight: 1.3
+    }
+
+    TextField {
+        id: retunePasswordField
+        width: parent.width
+        placeholderText: "Master password"
+        echoMode: TextInput.Password
+    }
+
+    Row {
+        width: parent.width
+        spacing: 10
+
+        ComboBox {
+            id: pageSizeBox
+            width: parent.width - retuneButton.width - 10
+            model: vaultController ? vaultController.cipherPageSizes : []
+            displayText: currentText + " byte pages"
+            currentIndex: vaultController ? model.indexOf(vaultController.cipherPageSize) : -1
+        }
+
+        Button {
+            id: retuneButton
+            text: vaultController && vaultController.loading ? "Re-tuning..." : "Re-tune"
+            highlighted: true
+            enabled: vaultController && !vaultController.loading
+            onClicked: {
+                encryptionSettings.retuneError = ""
+                encryptionSettings.retuneSuccess = false
+                if (retunePasswordField.text === "") {
+                    encryptionSettings.retuneError = "Master password is required"
+                    return
+                }
+                encryptionSettings.retuneProgress = 0
+                encryptionSettings.retuning = true
+                vaultController.retuneVault(retunePasswordField.text, pageSizeBox.currentValue)
+            }
+        }
+    }
+
+    Row {
+        spacing: 6
+
+        Text {
+            text: ""
+            font.family: "Material Icons"
+            font.pixelSize: 14
+            color: "#606060"
+        }
+
+        Text {
+            text: "Calibrates unlocking to take about half a second on this computer"
+            font.pixelSize: 11
+            color: "#606060"
+        }
+    }
+
+    ProgressBar {
+        width: parent.width
+        visible: encryptionSettings.retuning
+        value: encryptionSettings.retuneProgress
+    }
+
+    ErrorText {
+        errorMessage: encryptionSettings.retuneError
+    }
+
+    Text {
+        text: "Vault encryption re-tuned successfully"
+        color: "#4CAF50"
+        font.pixelSize: 11
+        visible: encryptionSettings.retuneSuccess
+    }
+
+    Connections {
+        target: vaultController
+        function onReencryptProgress(done, total) {
+            encryptionSettings.retuneProgress = total > 0 ? done / total : 1
+        }
+        function onVaultRetuned() {
+            encryptionSettings.retuning = false
+            encryptionSettings.retuneSuccess = true
+            retunePasswordField.text = ""
+        }
+        function onVaultError(error) {
+            encryptionSettings.retuning = false
+            encryptionSettings.retuneError = error
+        }
+    }
+}
@@ -0,0 +1,147 @@
+import QtQuick
+import QtQuick.Controls
+import "../../components"
+
+Column {
+    id: passwordAudit
+    spacing: 12
+
+    // See PasswordController.requestAudit()
+    property var report: ({})
+    property string selectedFinding: "reused"
+    property bool auditing: passwordController ? passwordController.auditing : false
+    property real auditProgress: 0
+    property string auditError: ""
+
+    readonly property var selectedEntries: {
+        var findings = report.findings || []
+        for (var i = 0; i < findings.length; i++) {
+            if (findings[i].key === selectedFinding) return findings[i].entries
+        }
+        return []
+    }
+
+    // Shows the indexed findings at once, then scores new passwords in the background
+    function refresh() {
+        if (passwordController) passwordController.requestAudit()
+    }
+
+    Component.onCompleted: refresh()
+    onVisibleChanged: if (visible) refresh()
+
+    SectionHeader {
+        icon: "\ue8e8"
+        label: "Password Audit"
+    }
+
+    Text {
+        text: report.total !== undefined
+            ? report.total + " entries checked" + (report.reusedGroups > 0 ? ", " + report.reusedGroups + (report.reusedGroups === 1 ? " password" : " passwords") + " used more than once" : "")
+            : ""
+        font.pixelSize: 12
+        color: "#a0a0a0"
+    }
+
+    Row {
+        width: parent.width
+        spacing: 10
+        visible: passwordAudit.auditing
+
+        Text {
+            id: scoringLabel
+            anchors.verticalCenter: parent.verticalCenter
+            text: "Scoring password strength..."
+            font.pixelSize: 11
+            color: "#606060"
+        }
+
+        ProgressBar {
+            width: parent.width - scoringLabel.width - 10
+            anchors.verticalCenter: parent.verticalCenter
+            value: passwordAudit.auditProgress
+        }
+    }
+
+    ErrorText {
+        errorMessage: passwordAudit.auditError
+    }
+
+    Repeater {
+        model: passwordAudit.report.findings || []
+
+        Rectangle {
+            required property var modelData
+            width: passwordAudit.width
+            height: 32
+            radius: 6
+            color: passwordAudit.selectedFinding === modelData.key ? "#2f3b4a" : (findingMouseArea.containsMouse ? "#303030" : "transparent")
+
+            Text {
+                anchors.left: parent.left
+                anchors.leftMargin: 10
+                anchors.verticalCenter: parent.verticalCenter
+                text: modelData.label
+                font.pixelSize: 13
+                color: "#c0c0c0"
+            }
+
+            Text {
+                anchors.right: parent.right
+                anchors.rightMargin: 10
+                anchors.verticalCenter: parent.verticalCenter
+                text: modelData.count
+                font.pixelSize: 13
+                font.weight: Font.Medium
+                color: modelData.count > 0 ? "#FF9800" : "#4CAF50"
+            }
+
+            MouseArea {
+                id: findingMouseArea
+                anchors.fill: parent
+                hoverEnabled: true
+                cursorShape: Qt.PointingHandCursor
+                onClicked: passwordAudit.selectedFinding = modelData.key
+            }
+        }
+    }
+
+    ListView {
+        width: parent.width
+        height: 96
+        clip: true
+        model: passwordAudit.selectedEntries
+        visible: count > 0
+        ScrollBar.vertical: ScrollBar {}
+
+        delegate: Text {
+            required property var modelData
+            width: ListView.view.width
+            text: modelData.website + "  ·  " + modelData.username
+            font.pixelSize: 12
+            color: "#909090"
+            elide: Text.ElideRight
+            height: 20
+        }
+    }
+
+    Connections {
+        target: passwordController
+        function onAuditProgress(done, total) {
+            passwordAudit.auditProgress = total > 0 ? done / total : 1
+        }
+        function onAuditReady(result) {
+            passwordAudit.report = result
+            if (result.unscored > 0) {
+                passwordAudit.auditError = ""
+                passwordAudit.auditProgress = 0
+                passwordController.runAudit()
+            }
+        }
+        function onAuditFinished(success, error, result) {
+            passwordAudit.auditError = error
+            if (success) {
+                passwordAudit.report = result
+            }
+        }
+    }
+}
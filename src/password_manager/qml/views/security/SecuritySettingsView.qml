@@ -17,6 +17,9 @@ Rectangle {
     property string confirmPasswordError: ""
     property bool nameSuccess: false
     property bool passwordSuccess: false
+    // The vault is re-encrypted under the new password in the background
+    property bool changingPassword: false
+    property real reencryptProgress: 0
 
     layer.enabled: true
     layer.effect: MultiEffect {
@@ -58,179 +61,277 @@ Rectangle {
             color: "#3a3a3a"
         }
 
-        // Change Vault Name Section
-        Column {
+        // The sections are taller than small windows
+        ScrollView {
+            id: settingsScroll
             Layout.fillWidth: true
-            Layout.maximumWidth: 480
-            spacing: 12
-
-            SectionHeader {
-                icon: "\ue8d3"
-                label: "Vault Name"
-            }
+            Layout.fillHeight: true
+            contentWidth: availableWidth
+            clip: true
+
+            RowLayout {
+                width: settingsScroll.availableWidth
+                spacing: 48
+
+                ColumnLayout {
+                    Layout.alignment: Qt.AlignTop
+                    Layout.fillWidth: true
+                    Layout.maximumWidth: 480
+                    spacing: 16
+
+                    // Change Vault Name Section
+                    Column {
+                        Layout.fillWidth: true
+                        Layout.maximumWidth: 480
+                        spacing: 12
+
+                        SectionHeader {
+                            icon: "\ue8d3"
+                            label: "Vault Name"
+                        }
 
-            Row {
-                width: parent.width
-                spacing: 10
+                        Row {
+                            width: parent.width
+                            spacing: 10
+
+                            TextField {
+                                id: vaultNameField
+                                width: parent.width - changeNameButton.width - 10
+                                placeholderText: "Enter new vault name"
+                                text: vaultController ? vaultController.vaultName : ""
+                            }
+
+                            Button {
+                                id: changeNameButton
+                                text: "Save"
+                                highlighted: true
+                                onClicked: {
+                                    if (vaultNameField.text.trim() === "") {
+                                        securityView.nameError = "Vault name cannot be empty"
+                                        securityView.nameSuccess = false
+                                        return
+                                    }
+                                    if (vaultController.changeVaultName(vaultNameField.text)) {
+                                        securityView.nameError = ""
+                                        securityView.nameSuccess = true
+                                    } else {
+                                        securityView.nameError = "Failed to change vault name"
+                                        securityView.nameSuccess = false
+                                    }
+                                }
+                            }
+                        }
 
-                TextField {
-                    id: vaultNameField
-                    width: parent.width - changeNameButton.width - 10
-                    placeholderText: "Enter new vault name"
-                    text: vaultController ? vaultController.vaultName : ""
-                }
+                        ErrorText {
+                            errorMessage: securityView.nameError
+                        }
 
-                Button {
-                    id: changeNameButton
-                    text: "Save"
-                    highlighted: true
-                    onClicked: {
-                        if (vaultNameField.text.trim() === "") {
-                            securityView.nameError = "Vault name cannot be empty"
-                            securityView.nameSuccess = false
-                            return
-                        }
-                        if (vaultController.changeVaultName(vaultNameField.text)) {
-                            securityView.nameError = ""
-                            securityView.nameSuccess = true
-                        } else {
-                            securityView.nameError = "Failed to change vault name"
-                            securityView.nameSuccess = false
+                        Text {
+                            text: "Vault name changed successfully"
+                            color: "#4CAF50"
+                            font.pixelSize: 11
+                            visible: securityView.nameSuccess
                         }
                     }
-                }
-            }
 
-            ErrorText {
-                errorMessage: securityView.nameError
-            }
+                    Rectangle {
+                        Layout.fillWidth: true
+                        Layout.maximumWidth: 480
+                        height: 1
+                        color: "#3a3a3a"
+                    }
 
-            Text {
-                text: "Vault name changed successfully"
-                color: "#4CAF50"
-                font.pixelSize: 11
-                visible: securityView.nameSuccess
-            }
-        }
+                    // Change Master Password Section
+                    Column {
+                        Layout.fillWidth: true
+                        Layout.maximumWidth: 480
+                        spacing: 12
 
-        Rectangle {
-            Layout.fillWidth: true
-            Layout.maximumWidth: 480
-            height: 1
-            color: "#3a3a3a"
-        }
-
-        // Change Master Password Section
-        Column {
-            Layout.fillWidth: true
-            Layout.maximumWidth: 480
-            spacing: 12
+                        SectionHeader {
+                            icon: "\ue899"
+                            label: "Change Master Password"
+                        }
 
-            SectionHeader {
-                icon: "\ue899"
-                label: "Change Master Password"
-            }
+                        TextField {
+                            id: currentPasswordField
+                            width: parent.width
+                            placeholderText: "Current password"
+                            echoMode: TextInput.Password
+                        }
 
-            TextField {
-                id: currentPasswordField
-                width: parent.width
-                placeholderText: "Current password"
-                echoMode: TextInput.Password
-            }
+                        ErrorText {
+                            errorMessage: securityView.currentPasswordError
+                        }
 
-            ErrorText {
-                errorMessage: securityView.currentPasswordError
-            }
+                        TextField {
+                            id: newPasswordField
+                            width: parent.width
+                            placeholderText: "New password"
+                            echoMode: TextInput.Password
+                        }
 
-            TextField {
-                id: newPasswordField
-                width: parent.width
-                placeholderText: "New password"
-                echoMode: TextInput.Password
-            }
+                        StrengthMeter {
+                            width: parent.width
+                            password: newPasswordField.text
+                        }
 
-            ErrorText {
-                errorMessage: securityView.newPasswordError
-            }
+                        ErrorText {
+                            errorMessage: securityView.newPasswordError
+                        }
 
-            TextField {
-                id: confirmNewPasswordField
-                width: parent.width
-                placeholderText: "Confirm new password"
-                echoMode: TextInput.Password
-            }
+                        TextField {
+                            id: confirmNewPasswordField
+                            width: parent.width
+                            placeholderText: "Confirm new password"
+                            echoMode: TextInput.Password
+                        }
 
-            ErrorText {
-                errorMessage: securityView.confirmPasswordError
-            }
+                        ErrorText {
+                            errorMessage: securityView.confirmPasswordError
+                        }
 
-            Row {
-                spacing: 6
+                        Row {
+                            spacing: 6
+
+                            Text {
+                                text: "\ue88e"
+                                font.family: "Material Icons"
+                                font.pixelSize: 14
+                                color: "#606060"
+                            }
+
+                            Text {
+                                text: "Min 8 chars with upper, lower, digit && special, rated Strong"
+                                font.pixelSize: 11
+                                color: "#606060"
+                            }
+                        }
 
-                Text {
-                    text: "\ue88e"
-                    font.family: "Material Icons"
-                    font.pixelSize: 14
-                    color: "#606060"
-                }
+                        Row {
+                            width: parent.width
+                            spacing: 10
+                            visible: securityView.changingPassword
+
+                            Text {
+                                id: reencryptLabel
+                                anchors.verticalCenter: parent.verticalCenter
+                                text: "Re-encrypting vault..."
+                                font.pixelSize: 11
+                                color: "#606060"
+                            }
+
+                            ProgressBar {
+                                width: parent.width - reencryptLabel.width - 10
+                                anchors.verticalCenter: parent.verticalCenter
+                                value: securityView.reencryptProgress
+                            }
+                        }
 
-                Text {
-                    text: "Min 8 chars with upper, lower, digit && special"
-                    font.pixelSize: 11
-                    color: "#606060"
-                }
-            }
+                        Text {
+                            text: "Password changed successfully"
+                            color: "#4CAF50"
+                            font.pixelSize: 11
+                            visible: securityView.passwordSuccess
+                        }
 
-            Text {
-                text: "Password changed successfully"
-                color: "#4CAF50"
-                font.pixelSize: 11
-                visible: securityView.passwordSuccess
-            }
+                        Button {
+                            text: securityView.changingPassword ? "Changing Password..." : "Change Password"
+                            width: parent.width
+                            height: 44
+                            highlighted: true
+                            enabled: vaultController && !vaultController.loading
+                            font.weight: Font.Medium
+                            font.pixelSize: 14
+                            onClicked: {
+                                var valid = true
+                                securityView.currentPasswordError = ""
+                                securityView.newPasswordError = ""
+                                securityView.confirmPasswordError = ""
+                                securityView.passwordSuccess = false
+
+                                if (currentPasswordField.text === "") {
+                                    securityView.currentPasswordError = "Current password is required"
+                                    valid = false
+                                }
+
+                                if (!vaultController.validateMasterPassword(newPasswordField.text)) {
+                                    securityView.newPasswordError = "Password doesn't meet requirements"
+                                    valid = false
+                                }
+
+                                if (newPasswordField.text !== confirmNewPasswordField.text) {
+                                    securityView.confirmPasswordError = "Passwords do not match"
+                                    valid = false
+                                }
+
+                                if (!valid) return
+
+                                securityView.reencryptProgress = 0
+                                securityView.changingPassword = true
+                                vaultController.changeMasterPassword(currentPasswordField.text, newPasswordField.text)
+                            }
+                        }
+                    }
 
-            Button {
-                text: "Change Password"
-                width: parent.width
-                height: 44
-                highlighted: true
-                font.weight: Font.Medium
-                font.pixelSize: 14
-                onClicked: {
-                    var valid = true
-                    securityView.currentPasswordError = ""
-                    securityView.newPasswordError = ""
-                    securityView.confirmPasswordError = ""
-                    securityView.passwordSuccess = false
-
-                    if (currentPasswordField.text === "") {
-                        securityView.currentPasswordError = "Current password is required"
-                        valid = false
+                    Rectangle {
+                        Layout.fillWidth: true
+                        Layout.maximumWidth: 480
+                        height: 1
+                        color: "#3a3a3a"
                     }
 
-                    if (!vaultController.validateMasterPassword(newPasswordField.text)) {
-                        securityView.newPasswordError = "Password doesn't meet requirements"
-                        valid = false
+                    // Breached Passwords Section
+                    BreachCheck {
+                        Layout.fillWidth: true
+                        Layout.maximumWidth: 480
                     }
+                }
+
+                ColumnLayout {
+                    Layout.alignment: Qt.AlignTop
+                    Layout.fillWidth: true
+                    Layout.maximumWidth: 480
+                    spacing: 16
 
-                    if (newPasswordField.text !== confirmNewPasswordField.text) {
-                        securityView.confirmPasswordError = "Passwords do not match"
-                        valid = false
+                    // Encryption Section
+                    EncryptionSettings {
+                        Layout.fillWidth: true
                     }
 
-                    if (!valid) return
+                    Rectangle {
+                        Layout.fillWidth: true
+                        height: 1
+                        color: "#3a3a3a"
+                    }
 
-                    if (vaultController.changeMasterPassword(currentPasswordField.text, newPasswordField.text)) {
-                        securityView.passwordSuccess = true
-                        currentPasswordField.text = ""
-                        newPasswordField.text = ""
-                        confirmNewPasswordField.text = ""
-                    } else {
-                        securityView.currentPasswordError = "Current password is incorrect"
+                    // Password Audit Section
+                    PasswordAudit {
+                        Layout.fillWidth: true
                     }
                 }
             }
         }
+    }
 
-        Item { Layout.fillHeight: true }
+    Connections {
+        target: vaultController
+        function onReencryptProgress(done, total) {
+            securityView.reencryptProgress = total > 0 ? done / total : 1
+        }
+        function onMasterPasswordChanged() {
+            securityView.changingPassword = false
+            securityView.passwordSuccess = true
+            currentPasswordField.text = ""
+            newPasswordField.text = ""
+            confirmNewPasswordField.text = ""
+        }
+        function onMasterPasswordChangeFailed(error) {
+            securityView.changingPassword = false
+            securityView.currentPasswordError = error
+        }
+        function onVaultNameChangeFailed(error) {
+            securityView.nameSuccess = false
+            securityView.nameError = error
+        }
     }
 }
@@ -0,0 +1,19 @@
+import pytest
+
+from password_manager.core.cipher import CipherSettings
+from password_manager.core.vault import VaultManager
+
+MASTER_PASSWORD = "Test-Master-1!"
+# One KDF iteration keeps vault creation and unlocking fast
+FAST_CIPHER = CipherSettings(kdf_iter=1)
+
+
+@pytest.fixture
+def vault_path(tmp_path):
+    path = tmp_path / "test.vault"
+    vault = VaultManager()
+    vault.create(path, "Test", MASTER_PASSWORD, FAST_CIPHER)
+    vault.add_password("mail.example.com", "alice", "correct horse battery", "JBSWY3DPEHPK3PXP")
+    vault.add_password("shop.example.org", "bob", "hunter2")
+    vault.close()
+    return path
@@ -0,0 +1,99 @@
+import pytest
+
+from password_manager.core import audit
+from password_manager.core.audit import build_report
+from password_manager.core.vault import VaultManager
+
+from conftest import MASTER_PASSWORD
+
+
+@pytest.fixture
+def vault(vault_path):
+    # Entry 1 is strong with a TOTP key; 2 and 3 share a weak password
+    vault = VaultManager()
+    assert vault.open(vault_path, MASTER_PASSWORD)
+    vault.add_password("forum.example.net", "carol", "hunter2")
+    yield vault
+    vault.close()
+
+
+def _sql(vault, statement: str, params=()) -> list:
+    return vault._actor.call(lambda: vault._conn.execute(statement, params).fetchall())
+
+
+def _reuse(vault) -> list:
+    return sorted(uses for (uses,) in _sql(vault, "SELECT uses FROM password_reuse"))
+
+
+def _age(vault, entry_id: int, days: int):
+    _sql(vault, "UPDATE password_audit SET changed_at = datetime('now', ?) WHERE id = ?", (f"-{days} days", entry_id))
+
+
+def test_report_lists_reused_weak_totp_less_and_stale_entries(vault):
+    _age(vault, 1, audit.STALE_DAYS + 10)
+    _age(vault, 3, audit.STALE_DAYS - 10)
+    report = vault.audit()
+    assert report.total == 3
+    assert (report.reused_groups, report.reused_count, report.reused) == (1, 2, [2, 3])
+    assert (report.weak_count, report.weak) == (2, [2, 3])
+    assert (report.without_totp_count, report.without_totp) == (2, [2, 3])
+    assert (report.stale_count, report.stale) == (1, [1])
+    assert report.unscored == 0
+
+
+def test_stale_entries_are_listed_oldest_first(vault):
+    _age(vault, 3, 800)
+    _age(vault, 1, 400)
+    report = vault._actor.call(lambda: build_report(vault._conn.cursor(), stale_days=100))
+    assert report.stale == [3, 1]
+    report = vault._actor.call(lambda: build_report(vault._conn.cursor(), stale_days=1000))
+    assert report.stale_count == 0
+
+
+def test_lists_are_capped_but_counts_are_not(vault, monkeypatch):
+    monkeypatch.setattr(audit, "REPORT_LIST_LIMIT", 1)
+    report = vault.audit()
+    assert (report.reused_count, report.reused) == (2, [2])
+    assert (report.weak_count, report.weak) == (2, [2])
+
+
+def test_unscored_entries_are_counted(vault):
+    vault.add_passwords([("bulk.example.com", "dave", "hunter2", "", 0)])
+    report = vault.audit()
+    assert report.unscored == 1
+    assert report.reused_count == 3
+    assert vault.score_passwords() == 1
+    assert vault.audit().unscored == 0
+
+
+def test_reuse_counts_follow_password_changes(vault):
+    assert _reuse(vault) == [1, 2]
+
+    vault.update_password(3, "forum.example.net", "carol", "Another-Long-Passphrase-42")
+    assert _reuse(vault) == [1, 1, 1]
+    assert vault.audit().reused_groups == 0
+
+    # Back to the shared password; a rename keeps the digest and its count
+    vault.update_password(3, "forum.example.net", "carol", "hunter2")
+    vault.update_password(3, "renamed.example.net", "carol", "hunter2")
+    assert _reuse(vault) == [1, 2]
+    assert vault.audit().reused == [2, 3]
+
+
+def test_changed_at_moves_only_with_the_password(vault):
+    _age(vault, 3, 500)
+    vault.update_password(3, "renamed.example.net", "carol", "hunter2")
+    assert vault.audit().stale == [3]
+    vault.update_password(3, "renamed.example.net", "carol", "Another-Long-Passphrase-42")
+    assert vault.audit().stale == []
+
+
+def test_deletes_leave_the_index_and_reuse_counts(vault):
+    vault.delete_password(2)
+    assert _reuse(vault) == [1, 1]
+    assert _sql(vault, "SELECT id FROM password_audit ORDER BY id") == [(1,), (3,)]
+    report = vault.audit()
+    assert (report.total, report.reused_groups, report.weak) == (2, 0, [3])
+
+    vault.delete_password(3)
+    assert _reuse(vault) == [1]
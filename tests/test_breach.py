@@ -0,0 +1,113 @@
+import hashlib
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from password_manager.core.breach import BreachCorpus, build_corpus, find_breached
+from password_manager.core.vault import VaultManager
+
+from conftest import MASTER_PASSWORD
+
+TOOL = Path(__file__).resolve().parent.parent / "tools" / "build_breach_corpus.py"
+FIRST = bytes(20)  # in the first prefix bucket
+LAST = b"\xff" * 20  # in the last one
+BREACHED = {"hunter2": 17043, "password": 9545824, "letmein": 3}
+
+
+def _sha1(password: str) -> bytes:
+    return hashlib.sha1(password.encode()).digest()
+
+
+def _source(path: Path, extra=()) -> Path:
+    seen = {_sha1(password): count for password, count in BREACHED.items()}
+    seen[FIRST] = 1
+    seen[LAST] = 2
+    lines = [f"{digest.hex().upper()}:{count}" for digest, count in sorted(seen.items())]
+    path.write_text("\n".join([*lines, *extra]) + "\n")
+    return path
+
+
+@pytest.fixture(scope="module")
+def corpus(tmp_path_factory):
+    # Built once: the converter allocates a 64 MiB prefix table
+    directory = tmp_path_factory.mktemp("corpus")
+    target = directory / "breached.bin"
+    assert build_corpus(_source(directory / "pwned.txt"), target) == len(BREACHED) + 2
+    with BreachCorpus(target) as corpus:
+        yield corpus
+
+
+def test_breached_passwords_are_found(corpus):
+    for password, count in BREACHED.items():
+        assert corpus.times_seen(password) == count
+    assert len(corpus) == len(BREACHED) + 2
+
+
+def test_unknown_password_is_not_found(corpus):
+    assert corpus.times_seen("correct horse battery") == 0
+    assert corpus.times_seen("") == 0
+
+
+def test_first_and_last_prefix_buckets(corpus):
+    assert corpus.digest_times_seen(FIRST) == 1
+    assert corpus.digest_times_seen(LAST) == 2
+    # Their neighbours fall in the same buckets but are not listed
+    assert corpus.digest_times_seen(bytes(19) + b"\x01") == 0
+    assert corpus.digest_times_seen(b"\xff" * 19 + b"\xfe") == 0
+
+
+def test_repeated_hashes_are_written_once(tmp_path):
+    line = f"{_sha1('hunter2').hex().upper()}:5"
+    source = tmp_path / "pwned.txt"
+    source.write_text(f"{line}\n{line}\n\n")
+    assert build_corpus(source, tmp_path / "breached.bin") == 1
+
+
+@pytest.mark.parametrize("lines, message", [
+    ([f"{LAST.hex()}:1", f"{FIRST.hex()}:1"], "not sorted"),
+    (["not-a-hash:1"], "expected a SHA-1 hash"),
+])
+def test_bad_source_is_rejected(tmp_path, lines, message):
+    source = tmp_path / "pwned.txt"
+    source.write_text("\n".join(lines))
+    target = tmp_path / "breached.bin"
+    with pytest.raises(ValueError, match=message):
+        build_corpus(source, target)
+    assert list(tmp_path.iterdir()) == [source]
+
+
+def test_other_files_are_not_opened_as_a_corpus(tmp_path, corpus):
+    other = tmp_path / "other.bin"
+    other.write_bytes(b"PK\x03\x04" + bytes(60))
+    with pytest.raises(ValueError, match="Not a breached password corpus"):
+        BreachCorpus(other)
+    truncated = tmp_path / "truncated.bin"
+    truncated.write_bytes(corpus.path.read_bytes()[:-8])
+    with pytest.raises(ValueError, match="truncated"):
+        BreachCorpus(truncated)
+
+
+def test_vault_check_lists_breached_entries(vault_path, corpus):
+    vault = VaultManager()
+    assert vault.open(vault_path, MASTER_PASSWORD)
+    try:
+        vault.add_password("forum.example.net", "carol", "letmein")
+        vault.add_password("other.example.net", "carol", "hunter2")
+        # Most seen first
+        assert find_breached(vault, corpus) == [(2, 17043), (4, 17043), (3, 3)]
+    finally:
+        vault.close()
+
+
+def test_build_tool(tmp_path):
+    target = tmp_path / "breached.bin"
+    result = subprocess.run(
+        [sys.executable, str(TOOL), str(_source(tmp_path / "pwned.txt")), str(target)],
+        capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    assert "5 hashes written" in result.stderr
+    with BreachCorpus(target) as corpus:
+        assert corpus.times_seen("password") == BREACHED["password"]
@@ -0,0 +1,97 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+import password_manager
+
+from conftest import FAST_CIPHER, MASTER_PASSWORD
+
+QT_PACKAGES = ("PyQt6", "PyQt5", "PySide6", "PySide2", "shiboken6")
+
+# Wall time of `python -m password_manager.cli list`, median of STARTUP_RUNS,
+# interpreter start-up included. Measured at 105-125 ms on a single-core
+# machine where `python -c pass` takes ~17 ms, so the 100 ms goal is not
+# met there; this budget catches regressions such as an eager import of
+# the GUI stack, which costs several hundred ms.
+STARTUP_BUDGET_MS = 250
+STARTUP_RUNS = 5
+
+# Runs a command as the console script does, then prints the top-level
+# packages it imported as the last line of stdout
+RUNNER = """
+import sys
+from password_manager.cli import main
+try:
+    code = main(sys.argv[1:])
+finally:
+    print(" ".join(sorted({name.split(".")[0] for name in sys.modules})))
+sys.exit(code)
+"""
+
+
+@pytest.fixture
+def cli_env(vault_path):
+    env = dict(os.environ)
+    src = str(Path(password_manager.__file__).resolve().parent.parent)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [src, env.get("PYTHONPATH")]))
+    env["PASSWORD_MANAGER_VAULT"] = str(vault_path)
+    env["PASSWORD_MANAGER_PASSWORD"] = MASTER_PASSWORD
+    return env
+
+
+def run_cli(args: list, env: dict, stdin: str = "") -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-c", RUNNER, *args],
+        env=env, input=stdin, capture_output=True, text=True, timeout=60,
+    )
+
+
+@pytest.mark.parametrize("args", [
+    ["--help"],
+    ["list"],
+    ["--json", "search", "example"],
+    ["get", "mail", "--field", "all"],
+    ["totp", "mail"],
+    ["add", "new.example.net", "carol", "--generate", "20"],
+    ["add", "new.example.net", "dave", "--password-stdin"],
+    ["export", "{tmp}/export.csv"],
+    ["import", "--dry-run", "{tmp}/export.csv"],
+])
+def test_commands_never_import_qt(args, cli_env, tmp_path):
+    run_cli(["export", str(tmp_path / "export.csv")], cli_env)
+    args = [arg.format(tmp=tmp_path) for arg in args]
+    result = run_cli(args, cli_env, stdin="Entry-Password-3!\n")
+    assert result.returncode == 0, result.stderr
+    imported = set(result.stdout.splitlines()[-1].split())
+    assert imported.isdisjoint(QT_PACKAGES)
+
+
+def test_startup_time(cli_env):
+    samples = []
+    for _ in range(STARTUP_RUNS):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-m", "password_manager.cli", "list"],
+                                env=cli_env, capture_output=True, timeout=60)
+        samples.append((time.perf_counter() - start) * 1000)
+        assert result.returncode == 0
+    assert statistics.median(samples) < STARTUP_BUDGET_MS
+
+
+@pytest.mark.parametrize("length", ["0", "-5"])
+def test_add_rejects_a_generate_length_below_one(length, cli_env):
+    result = run_cli(["add", "new.example.net", "carol", "--generate", length], cli_env)
+    assert result.returncode == 1
+    assert "--generate needs a length above 0" in result.stderr
+
+
+def test_missing_password_input_is_an_error(cli_env):
+    del cli_env["PASSWORD_MANAGER_PASSWORD"]
+    result = run_cli(["list"], cli_env)
+    assert result.returncode == 1
+    assert "no input to read the password from" in result.stderr
+    assert "Traceback" not in result.stderr
@@ -0,0 +1,93 @@
+import random
+import threading
+
+import pytest
+
+from password_manager.core.vault import VaultManager
+
+from conftest import FAST_CIPHER, MASTER_PASSWORD
+
+THREADS = 8
+OPS = 300
+
+
+def worker(vault: VaultManager, number: int, expected: dict, errors: list):
+    """Run OPS random operations on this thread's own entries.
+
+    ``expected`` ends as {id: (website, username, password, favorite)}.
+    Every other operation goes through VaultManager.submit().
+    """
+    rng = random.Random(number)
+    mine = {}
+    try:
+        for op in range(OPS):
+            use_future = op % 2 == 1
+
+            def run(method, *args):
+                return vault.submit(method, *args).result() if use_future else method(*args)
+
+            choice = rng.random()
+            if choice < 0.3 or not mine:
+                website, username, password = f"t{number}-{op}.example.com", f"user{number}", f"pw-{op}"
+                entry_id = run(vault.add_password, website, username, password)
+                mine[entry_id] = (website, username, password, False)
+            elif choice < 0.45:
+                entry_id = rng.choice(list(mine))
+                website, username, _, favorite = mine[entry_id]
+                password = f"pw-{op}-changed"
+                run(vault.update_password, entry_id, website, username, password)
+                mine[entry_id] = (website, username, password, favorite)
+            elif choice < 0.55:
+                entry_id = rng.choice(list(mine))
+                website, username, password, favorite = mine[entry_id]
+                assert run(vault.toggle_favorite, entry_id) != favorite, f"favorite of {entry_id} did not flip"
+                mine[entry_id] = (website, username, password, not favorite)
+            elif choice < 0.65:
+                entry_id = rng.choice(list(mine))
+                run(vault.delete_password, entry_id)
+                del mine[entry_id]
+            elif choice < 0.8:
+                entry_id = rng.choice(list(mine))
+                secret = run(vault.get_secret, entry_id)
+                assert secret is not None and secret[0] == mine[entry_id][2], f"wrong secret for {entry_id}"
+            elif choice < 0.9:
+                website = mine[rng.choice(list(mine))][0]
+                ids = run(vault.search, website, 10)
+                assert any(i in mine and mine[i][0] == website for i in ids), f"search missed {website}"
+            else:
+                run(vault.count_entries)
+    except Exception as e:
+        errors.append(f"thread {number}: {e!r}")
+    expected.update(mine)
+
+
+# With the save scheduler, as the app runs, and saving every edit
+# synchronously, where edits queued together are saved as one batch
+@pytest.mark.parametrize("save_delay", [0.05, None], ids=["scheduled_save", "sync_save"])
+def test_concurrent_operations_keep_the_vault_consistent(tmp_path, save_delay):
+    path = tmp_path / "stress.vault"
+    vault = VaultManager(save_delay=save_delay)
+    vault.create(path, "Stress", MASTER_PASSWORD, FAST_CIPHER)
+
+    expected, errors = {}, []
+    workers = [threading.Thread(target=worker, args=(vault, number, expected, errors)) for number in range(THREADS)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    assert errors == []
+    assert vault.count_entries()[0] == len(expected)
+    vault.close()
+
+    # Everything acknowledged is on disk, and nothing else
+    reopened = VaultManager()
+    assert reopened.open(path, MASTER_PASSWORD)
+    try:
+        stored = {
+            entry_id: (website, username, password, bool(favorite))
+            for entry_id, website, username, password, _, favorite in reopened.iter_passwords()
+        }
+        assert stored == expected
+        assert reopened.count_entries()[0] == len(expected)
+    finally:
+        reopened.close()
@@ -0,0 +1,122 @@
+import csv
+import json
+import os
+import stat
+import threading
+
+import pytest
+
+from password_manager.core import export
+from password_manager.core.export import export_passwords
+from password_manager.core.importer import import_passwords
+from password_manager.core.vault import VaultManager
+
+from conftest import FAST_CIPHER, MASTER_PASSWORD
+
+
+@pytest.fixture
+def vault(vault_path):
+    vault = VaultManager()
+    assert vault.open(vault_path, MASTER_PASSWORD)
+    vault.add_password("cafe.example.fr", "zoë", 'quote " and, comma\nnewline')
+    vault.toggle_favorite(2)
+    yield vault
+    vault.close()
+
+
+@pytest.fixture
+def empty_vault(tmp_path):
+    vault = VaultManager()
+    vault.create(tmp_path / "empty.vault", "Empty", MASTER_PASSWORD, FAST_CIPHER)
+    yield vault
+    vault.close()
+
+
+def _leftovers(directory) -> list:
+    return [path.name for path in directory.iterdir() if path.name.endswith(".tmp")]
+
+
+@pytest.mark.parametrize("fmt", ["csv", "json"])
+def test_export_round_trips_through_import(vault, empty_vault, tmp_path, fmt):
+    path = tmp_path / f"export.{fmt}"
+    assert export_passwords(vault, path, fmt, batch_size=2)
+
+    result = import_passwords(empty_vault, path, dry_run=True)
+    assert (result.total, result.new, result.duplicates, result.invalid) == (3, 3, 0, 0)
+    # Everything is already in the vault it came from
+    result = import_passwords(vault, path, dry_run=True)
+    assert (result.new, result.duplicates) == (0, 3)
+
+
+def test_export_fields(vault, tmp_path):
+    expected = [
+        ["mail.example.com", "alice", "correct horse battery", "JBSWY3DPEHPK3PXP", False],
+        ["shop.example.org", "bob", "hunter2", "", True],
+        ["cafe.example.fr", "zoë", 'quote " and, comma\nnewline', "", False],
+    ]
+    export_passwords(vault, tmp_path / "export.json", "json")
+    text = (tmp_path / "export.json").read_text(encoding="utf-8")
+    entries = [dict(zip(export.EXPORT_FIELDS, row)) for row in expected]
+    # The streamed layout is json.dump's
+    assert text == json.dumps(entries, indent=2, ensure_ascii=False)
+
+    export_passwords(vault, tmp_path / "export.csv", "csv")
+    with open(tmp_path / "export.csv", newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == list(export.EXPORT_FIELDS)
+    assert rows[1:] == [[*row[:4], str(int(row[4]))] for row in expected]
+
+
+def test_empty_vault_exports_an_empty_list(empty_vault, tmp_path):
+    export_passwords(empty_vault, tmp_path / "export.json", "json")
+    assert (tmp_path / "export.json").read_text() == "[]"
+
+
+@pytest.mark.parametrize("fmt", ["csv", "json"])
+def test_cancelled_export_leaves_the_target_alone(vault, tmp_path, fmt):
+    path = tmp_path / f"export.{fmt}"
+    path.write_text("previous export")
+    cancel = threading.Event()
+    reports = []
+
+    def progress(done, total):
+        reports.append(done)
+        cancel.set()
+
+    assert not export_passwords(vault, path, fmt, progress=progress, cancel=cancel, batch_size=1)
+    assert reports == [1]
+    assert path.read_text() == "previous export"
+    assert _leftovers(tmp_path) == []
+
+
+def test_export_is_renamed_from_a_private_temp_file(vault, tmp_path, monkeypatch):
+    path = tmp_path / "export.csv"
+    renames = []
+    replace = os.replace
+
+    def record(src, dst):
+        renames.append((src, dst, stat.S_IMODE(os.stat(src).st_mode)))
+        replace(src, dst)
+
+    monkeypatch.setattr(export.os, "replace", record)
+    assert export_passwords(vault, path, "csv")
+    [(src, dst, mode)] = renames
+    assert dst == path
+    assert os.path.dirname(src) == str(tmp_path)
+    assert os.path.basename(src).startswith(".export.csv.")
+    assert mode == 0o600
+    assert _leftovers(tmp_path) == []
+
+
+def test_failed_export_removes_its_temp_file(vault, tmp_path, monkeypatch):
+    path = tmp_path / "export.csv"
+
+    def failing(batch_size):
+        yield (1, "mail.example.com", "alice", "x", "", 0)
+        raise OSError("disk full")
+
+    monkeypatch.setattr(vault, "iter_passwords", failing)
+    with pytest.raises(OSError, match="disk full"):
+        export_passwords(vault, path, "csv")
+    assert not path.exists()
+    assert _leftovers(tmp_path) == []
@@ -0,0 +1,107 @@
+import math
+from collections import Counter
+
+import pytest
+
+from password_manager.core import generator
+from password_manager.core.generator import CHARACTER_CLASSES, RandomSource, generate_password
+
+# Fixed sample sizes, and the p-value below which output counts as
+# non-uniform; a correct generator fails a test about once in a million runs
+SAMPLES = 200000
+PASSWORD_LENGTH = 16
+PASSWORDS = 20000
+MIN_P_VALUE = 1e-6
+
+
+class ScriptedSource(RandomSource):
+    """A RandomSource that hands out the given bytes instead of random ones."""
+
+    def __init__(self, data: bytes):
+        super().__init__()
+        self._data = bytearray(data)
+
+    def read(self, size: int) -> bytes:
+        if size > len(self._data):
+            # Pads reads that draw ahead of what a test scripted
+            self._data += bytes(size - len(self._data))
+        data, self._data = bytes(self._data[:size]), self._data[size:]
+        return data
+
+
+def chi_square_p(observed: list, expected: list, dof: int) -> float:
+    """Upper-tail p-value of the chi-square statistic (Wilson-Hilferty approximation)."""
+    statistic = sum((o - e) ** 2 / e for o, e in zip(observed, expected))
+    z = ((statistic / dof) ** (1 / 3) - (1 - 2 / (9 * dof))) / math.sqrt(2 / (9 * dof))
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def uniform_p(values, population) -> float:
+    counts = Counter(values)
+    observed = [counts[value] for value in population]
+    expected = len(values) / len(population)
+    return chi_square_p(observed, [expected] * len(population), len(population) - 1)
+
+
+def test_randbelow_rejects_bytes_that_would_bias_low_values():
+    # 256 % 3 == 1, so byte 255 is rejected rather than counted as 0
+    source = ScriptedSource(bytes([255, 4]))
+    assert source.randbelow(3) == 1
+
+
+def test_randbelow_uses_enough_bytes_for_n():
+    source = ScriptedSource(bytes([0x01, 0x2c]))
+    assert source.randbelow(1000) == 300
+
+
+def test_choices_rejects_bytes_at_or_above_the_limit():
+    # 256 - 256 % 3 == 255
+    source = ScriptedSource(bytes([255, 255, 7, 255, 2, 0]))
+    assert source.choices("abc", 3) == ["b", "c", "a"]
+
+
+def test_generate_password_redraws_passwords_missing_a_class(monkeypatch):
+    drawn = iter([list("aaaa"), list("aA1!")])
+    source = RandomSource()
+    monkeypatch.setattr(source, "choices", lambda population, k: next(drawn))
+    assert generate_password(4, source=source) == "aA1!"
+
+
+@pytest.mark.parametrize("length", [0, 3, generator.MAX_PASSWORD_LENGTH + 1])
+def test_generate_password_rejects_lengths_out_of_range(length):
+    with pytest.raises(ValueError):
+        generate_password(length)
+
+
+def test_choices_are_uniform():
+    alphabet = "".join(CHARACTER_CLASSES.values())
+    assert uniform_p(RandomSource().choices(alphabet, SAMPLES), alphabet) > MIN_P_VALUE
+
+
+def test_randbelow_is_uniform():
+    source = RandomSource()
+    values = [source.randbelow(1000) for _ in range(SAMPLES // 2)]
+    assert uniform_p(values, range(1000)) > MIN_P_VALUE
+
+
+def test_generated_characters_are_uniform_within_each_class():
+    passwords = [generate_password(PASSWORD_LENGTH) for _ in range(PASSWORDS)]
+    characters = "".join(passwords)
+    for chars in CHARACTER_CLASSES.values():
+        in_class = [c for c in characters if c in chars]
+        assert uniform_p(in_class, chars) > MIN_P_VALUE
+
+
+def test_generated_classes_do_not_depend_on_position():
+    # Seeding one character per class and shuffling would skew this
+    classes = list(CHARACTER_CLASSES.values())
+    class_of = {char: c for c, chars in enumerate(classes) for char in chars}
+    table = [[0] * len(classes) for _ in range(PASSWORD_LENGTH)]
+    for _ in range(PASSWORDS):
+        for position, char in enumerate(generate_password(PASSWORD_LENGTH)):
+            table[position][class_of[char]] += 1
+    column_totals = [sum(row[c] for row in table) for c in range(len(classes))]
+    observed = [count for row in table for count in row]
+    expected = [total / PASSWORD_LENGTH for _ in table for total in column_totals]
+    dof = (PASSWORD_LENGTH - 1) * (len(classes) - 1)
+    assert chi_square_p(observed, expected, dof) > MIN_P_VALUE
@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from password_manager.core import vault as vault_module
+from password_manager.core.importer import import_passwords
+from password_manager.core.vault import VaultManager
+
+from conftest import MASTER_PASSWORD
+
+ENTRIES = [
+    {"website": "mail.example.com", "username": "alice", "password": "x", "totp_key": ""},
+    {"website": "new.example.net", "username": "carol", "password": "y", "totp_key": ""},
+]
+
+
+@pytest.fixture
+def vault(vault_path):
+    vault = VaultManager()
+    assert vault.open(vault_path, MASTER_PASSWORD)
+    yield vault
+    vault.close()
+
+
+@pytest.mark.parametrize("prefix", ["", "\n", "  \r\n\t "])
+def test_json_is_recognized_after_leading_whitespace(vault, tmp_path, prefix):
+    path = tmp_path / "export.json"
+    path.write_text(prefix + json.dumps(ENTRIES), encoding="utf-8")
+    result = import_passwords(vault, path, dry_run=True)
+    assert result.source == "Password Manager JSON"
+    assert (result.total, result.new, result.duplicates) == (2, 1, 1)
+
+
+def test_blank_file_is_read_as_csv(vault, tmp_path):
+    path = tmp_path / "blank.csv"
+    path.write_text("  \n", encoding="utf-8")
+    with pytest.raises(ValueError, match="No password column"):
+        import_passwords(vault, path, dry_run=True)
+
+
+def test_existing_logins_spans_lookup_batches(vault, monkeypatch):
+    monkeypatch.setattr(vault_module, "LOGIN_LOOKUP_BATCH", 3)
+    logins = [(f"site{i}.example.com", "nobody") for i in range(7)]
+    logins[1] = ("mail.example.com", "alice")
+    logins[5] = ("shop.example.org", "bob")
+    assert vault.existing_logins(iter(logins)) == {("mail.example.com", "alice"), ("shop.example.org", "bob")}
+    assert vault.existing_logins([]) == set()
@@ -0,0 +1,89 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from PyQt6.QtCore import QCoreApplication  # noqa: E402
+
+from password_manager.controllers.job_runner import Job, JobRunner  # noqa: E402
+
+
+class BlockingJob(Job):
+    """Runs until ``release`` is set."""
+
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def execute(self):
+        self.started.set()
+        self.release.wait(10)
+
+
+class QuickJob(Job):
+    def execute(self):
+        return "done"
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture
+def runner(app):
+    runner = JobRunner()
+    yield runner
+    runner.wait()
+
+
+def test_stop_drops_a_job_queued_behind_an_exclusive_one(runner):
+    blocking = runner.submit(BlockingJob())
+    assert blocking.started.wait(5)
+    queued = runner.submit(QuickJob())
+    cancelled = []
+    queued.cancelled.connect(lambda: cancelled.append(queued))
+
+    # Would block forever if it waited for the queued job to start
+    runner.stop(queued)
+    assert queued.status == "cancelled"
+    assert cancelled == [queued]
+    assert blocking.status == "running"
+    blocking.release.set()
+
+
+def test_stop_waits_for_a_running_job(runner):
+    job = runner.submit(BlockingJob())
+    assert job.started.wait(5)
+    threading.Timer(0.05, job.release.set).start()
+    runner.stop(job)
+    assert job.status == "cancelled"
+
+
+def test_when_idle_runs_at_once_without_jobs(runner):
+    calls = []
+    runner.when_idle(lambda: calls.append("idle"))
+    assert calls == ["idle"]
+
+
+def test_when_idle_waits_for_running_jobs_without_blocking(runner, app):
+    job = runner.submit(BlockingJob())
+    assert job.started.wait(5)
+    queued = runner.submit(QuickJob())
+    calls = []
+
+    runner.when_idle(lambda: calls.append("idle"))
+    # Returned while the job still runs; the queued one was dropped
+    assert calls == []
+    assert queued.status == "cancelled"
+    assert job.cancel_event.is_set()
+
+    job.release.set()
+    deadline = time.monotonic() + 5
+    while not calls and time.monotonic() < deadline:
+        app.processEvents()
+    assert calls == ["idle"]
+    assert job.status == "cancelled"
@@ -0,0 +1,128 @@
+import json
+import shutil
+import zipfile
+
+from password_manager.core.vault import (
+    JOURNAL_HEADER, JOURNAL_MAGIC, VAULT_DB_FILE, VAULT_INFO_FILE, VAULT_JOURNAL_SUFFIX, VAULT_VERSION,
+    VaultManager,
+)
+
+from conftest import MASTER_PASSWORD
+
+
+def _open(path) -> VaultManager:
+    vault = VaultManager()
+    assert vault.open(path, MASTER_PASSWORD)
+    return vault
+
+
+def _journal(path):
+    return path.with_name(path.name + VAULT_JOURNAL_SUFFIX)
+
+
+def _crash_copy(path, target):
+    """Copy the vault and its journal as a crash before close() would leave them."""
+    target.mkdir()
+    copy = target / path.name
+    shutil.copy(path, copy)
+    shutil.copy(_journal(path), _journal(copy))
+    return copy
+
+
+def _logins(vault) -> list:
+    return sorted(login for login in vault.get_logins(list(range(1, 100))).values())
+
+
+def test_journal_is_replayed_after_a_crash(vault_path, tmp_path):
+    vault = _open(vault_path)
+    vault.add_password("new.example.net", "carol", "s3cret")
+    vault.delete_password(2)
+    header = _journal(vault_path).read_bytes()[:JOURNAL_HEADER.size]
+    assert JOURNAL_HEADER.unpack(header) == (JOURNAL_MAGIC, vault.generation)
+    copy = _crash_copy(vault_path, tmp_path / "crash")
+    vault.close()
+
+    vault = _open(copy)
+    try:
+        assert _logins(vault) == [("mail.example.com", "alice"), ("new.example.net", "carol")]
+        # Replayed changes are folded into the container at once
+        assert not _journal(copy).exists()
+    finally:
+        vault.close()
+    vault = _open(copy)
+    try:
+        assert vault.count_entries()[0] == 2
+    finally:
+        vault.close()
+
+
+def test_torn_journal_tail_is_dropped(vault_path, tmp_path):
+    vault = _open(vault_path)
+    vault.add_password("first.example.net", "carol", "s3cret")
+    complete = _journal(vault_path).stat().st_size
+    vault.add_password("second.example.net", "dave", "s3cret")
+    torn = _journal(vault_path).stat().st_size
+    assert torn > complete
+    copy = _crash_copy(vault_path, tmp_path / "crash")
+    vault.close()
+
+    # The second save was cut off halfway through its frames
+    with open(_journal(copy), "r+b") as f:
+        f.truncate((complete + torn) // 2)
+    vault = _open(copy)
+    try:
+        assert _logins(vault) == [
+            ("first.example.net", "carol"), ("mail.example.com", "alice"), ("shop.example.org", "bob"),
+        ]
+    finally:
+        vault.close()
+
+
+def test_journal_of_an_earlier_generation_is_ignored(vault_path, tmp_path):
+    vault = _open(vault_path)
+    vault.add_password("new.example.net", "carol", "s3cret")
+    stale = _journal(vault_path).read_bytes()
+    generation = vault.generation
+    vault.close()
+
+    # The checkpoint on close folded the journal in and started a new generation
+    vault = _open(vault_path)
+    assert vault.generation == generation + 1
+    vault.delete_password(3)
+    vault.close()
+
+    _journal(vault_path).write_bytes(stale)
+    vault = _open(vault_path)
+    try:
+        assert vault.count_entries()[0] == 2
+        assert not _journal(vault_path).exists()
+    finally:
+        vault.close()
+
+
+def test_version_1_container_is_upgraded_on_close(vault_path):
+    # A 1.0 container: deflated database, no generation
+    with zipfile.ZipFile(vault_path) as zf:
+        database = zf.read(VAULT_DB_FILE)
+        info = json.loads(zf.read(VAULT_INFO_FILE))
+    info["version"] = "1.0"
+    info.pop("generation", None)
+    with zipfile.ZipFile(vault_path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(VAULT_INFO_FILE, json.dumps(info))
+        zf.writestr(VAULT_DB_FILE, database)
+
+    vault = _open(vault_path)
+    assert vault.vault_version == "1.0"
+    assert vault.count_entries()[0] == 2
+    vault.close()
+
+    with zipfile.ZipFile(vault_path) as zf:
+        info = json.loads(zf.read(VAULT_INFO_FILE))
+        assert zf.getinfo(VAULT_DB_FILE).compress_type == zipfile.ZIP_STORED
+    assert info["version"] == VAULT_VERSION
+    assert info["generation"] == 1
+    vault = _open(vault_path)
+    try:
+        assert _logins(vault) == [("mail.example.com", "alice"), ("shop.example.org", "bob")]
+    finally:
+        vault.close()
@@ -0,0 +1,112 @@
+from password_manager.core import audit
+from password_manager.core.migrations import SCHEMA_VERSION, migrate
+from password_manager.core.vault import VaultManager
+
+from conftest import FAST_CIPHER, MASTER_PASSWORD
+
+
+def _schema_version(vault) -> int:
+    return vault._actor.call(lambda: vault._conn.execute("PRAGMA user_version").fetchone()[0])
+
+
+def _reopen(path, password):
+    vault = VaultManager()
+    assert vault.open(path, password)
+    return vault
+
+
+def test_reopen_after_master_password_change(vault_path):
+    vault = _reopen(vault_path, MASTER_PASSWORD)
+    assert vault.change_master_password(MASTER_PASSWORD, "New-Master-2!", FAST_CIPHER)
+    vault.close()
+
+    vault = _reopen(vault_path, "New-Master-2!")
+    try:
+        assert _schema_version(vault) == SCHEMA_VERSION
+        assert vault.count_entries()[0] == 2
+    finally:
+        vault.close()
+
+
+def test_reopen_after_retune(vault_path):
+    vault = _reopen(vault_path, MASTER_PASSWORD)
+    assert vault.retune(MASTER_PASSWORD, FAST_CIPHER._replace(page_size=8192))
+    vault.close()
+
+    vault = _reopen(vault_path, MASTER_PASSWORD)
+    try:
+        assert _schema_version(vault) == SCHEMA_VERSION
+        assert vault.count_entries()[0] == 2
+    finally:
+        vault.close()
+
+
+def test_migrations_run_again_on_a_migrated_schema(vault_path):
+    vault = _reopen(vault_path, MASTER_PASSWORD)
+    try:
+        # What re-encrypted vaults looked like when the copy lost user_version
+        vault._actor.call(vault._conn.execute, "PRAGMA user_version = 0")
+        assert vault._actor.call(migrate, vault._conn) == SCHEMA_VERSION
+        assert _schema_version(vault) == SCHEMA_VERSION
+        assert vault.count_entries()[0] == 2
+    finally:
+        vault.close()
+
+
+def test_strength_version_bump_rescores_entries(vault_path, monkeypatch):
+    # Entries are scored as they are added
+    vault = _reopen(vault_path, MASTER_PASSWORD)
+    assert vault.score_passwords() == 0
+    vault.close()
+
+    monkeypatch.setattr(audit, "STRENGTH_VERSION", audit.STRENGTH_VERSION + 1)
+    vault = _reopen(vault_path, MASTER_PASSWORD)
+    try:
+        assert vault.score_passwords() == 2
+    finally:
+        vault.close()
+
+
+def test_up_to_date_open_reads_only_markers(vault_path):
+    vault = _reopen(vault_path, MASTER_PASSWORD)
+    try:
+        statements = []
+        vault._actor.call(vault._conn.set_trace_callback, statements.append)
+        vault._actor.call(vault._migrate_database)
+        vault._actor.call(vault._conn.set_trace_callback, None)
+        assert statements
+        assert all(statement.startswith(("PRAGMA user_version", "SELECT value FROM vault_meta"))
+                   for statement in statements), statements
+    finally:
+        vault.close()
+
+
+def test_entries_added_without_the_index_are_indexed_on_open(vault_path):
+    vault = _reopen(vault_path, MASTER_PASSWORD)
+
+    def add_unindexed():
+        # What an older release, unaware of the index, does
+        vault._conn.execute(
+            "INSERT INTO passwords (website, username, password) VALUES ('old.example.net', 'carol', 'hunter2')"
+        )
+        vault._conn.commit()
+
+    vault._actor.call(add_unindexed)
+    vault.close()
+
+    vault = _reopen(vault_path, MASTER_PASSWORD)
+    try:
+        report = vault.audit()
+        assert report.total == 3
+        assert report.reused_count == 2
+    finally:
+        vault.close()
+
+
+def test_deleted_entries_leave_the_index(vault_path):
+    vault = _reopen(vault_path, MASTER_PASSWORD)
+    try:
+        vault._actor.call(vault._conn.execute, "DELETE FROM passwords WHERE id = 2")
+        assert vault.audit().total == 1
+    finally:
+        vault.close()
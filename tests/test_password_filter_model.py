@@ -0,0 +1,127 @@
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from password_manager.models.password_filter_model import PasswordFilterModel  # noqa: E402
+from password_manager.models.password_model import PasswordListModel  # noqa: E402
+
+ENTRIES = 1000
+
+
+@pytest.fixture
+def models():
+    source = PasswordListModel()
+    source.load_entries([
+        (i + 1, f"site{i}.example.com", f"user{i}", i % 2 == 0, i % 7 == 0) for i in range(ENTRIES)
+    ])
+    proxy = PasswordFilterModel()
+    proxy.setSourceModel(source)
+    emitted = []
+    proxy.dataChanged.connect(lambda top, bottom, roles: emitted.append((top.row(), bottom.row(), list(roles))))
+    return source, proxy, emitted
+
+
+def test_source_range_change_is_one_proxy_emit(models):
+    source, proxy, emitted = models
+    roles = [PasswordListModel.TotpCodeRole]
+    source.dataChanged.emit(source.index(0), source.index(ENTRIES - 1), roles)
+    assert emitted == [(0, ENTRIES - 1, roles)]
+
+
+def test_filtered_change_is_emitted_per_contiguous_proxy_run(models):
+    source, proxy, emitted = models
+    proxy.searchQuery = "site1"
+    roles = [PasswordListModel.TotpCodeRole]
+    source.dataChanged.emit(source.index(0), source.index(ENTRIES - 1), roles)
+    assert emitted == [(0, proxy.rowCount() - 1, roles)]
+
+
+def test_change_covers_only_mapped_rows(models):
+    source, proxy, emitted = models
+    proxy.favoritesOnly = True
+    favorites = proxy.rowCount()
+    roles = [PasswordListModel.TotpCodeRole]
+    source.dataChanged.emit(source.index(0), source.index(20), roles)
+    # Source rows 0, 7 and 14 are favorites, and the first three proxy rows
+    assert emitted == [(0, 2, roles)]
+    assert proxy.rowCount() == favorites
+
+
+def test_edit_that_no_longer_matches_removes_the_row(models):
+    source, proxy, emitted = models
+    proxy.searchQuery = "site12."
+    matches = proxy.rowCount()
+    source.update_entry(12, "renamed.example.com", "user12", "pw")
+    assert proxy.rowCount() == matches - 1
+    assert emitted == []
+
+
+def _paged_source(rows: list) -> PasswordListModel:
+    source = PasswordListModel()
+    source.load_pages(
+        lambda after_id, limit, callback: callback(
+            [row for row in rows if row[0] > after_id][:limit if limit >= 0 else None]
+        ),
+        len(rows), sum(1 for row in rows if row[4]),
+    )
+    return source
+
+
+def test_provider_search_keeps_a_large_source_paged():
+    rows = [(i + 1, f"site{i}.example.com", f"user{i}", False, i % 2 == 0) for i in range(3000)]
+    source = _paged_source(rows)
+    proxy = PasswordFilterModel()
+    proxy.setSourceModel(source)
+    queries = []
+
+    def provider(query, callback):
+        queries.append(query)
+        # One hit in the first page, two in pages not read yet
+        callback([rows[2999], rows[10], rows[2500]])
+
+    proxy.set_search_provider(provider, min_rows=len(rows))
+    loaded = source.rowCount()
+    proxy.searchQuery = "site"
+    assert queries == ["site"]
+    assert source.canFetchMore()
+    assert source.rowCount() == loaded + 2
+    ids = [source.data(proxy.mapToSource(proxy.index(row)), PasswordListModel.IdRole)
+           for row in range(proxy.rowCount())]
+    assert ids == [3000, 11, 2501]
+
+    proxy.favoritesOnly = True
+    assert source.canFetchMore()
+    assert proxy.rowCount() == 2  # ids 11 and 2501
+
+    # Unread pages skip the hits added ahead of them
+    source.fetch_all()
+    assert source.rowCount() == len(rows)
+
+
+def test_search_without_provider_loads_every_page():
+    rows = [(i + 1, f"site{i}.example.com", f"user{i}", False, False) for i in range(3000)]
+    source = _paged_source(rows)
+    proxy = PasswordFilterModel()
+    proxy.setSourceModel(source)
+    proxy.searchQuery = "site2999."
+    assert not source.canFetchMore()
+    assert proxy.rowCount() >= 1
+
+
+def test_provider_hits_for_a_replaced_query_are_dropped():
+    rows = [(i + 1, f"site{i}.example.com", f"user{i}", False, False) for i in range(100)]
+    source = PasswordListModel()
+    source.load_entries(rows)
+    proxy = PasswordFilterModel()
+    proxy.setSourceModel(source)
+    pending = []
+    proxy.set_search_provider(lambda query, callback: pending.append((query, callback)), min_rows=1)
+
+    proxy.searchQuery = "site1"
+    proxy.searchQuery = "site2"
+    # Nothing changes until the provider answers
+    assert proxy.rowCount() == len(rows)
+    (_, first), (_, second) = pending
+    second([rows[2]])
+    first([rows[1]])
+    assert [proxy.mapToSourceRow(row) for row in range(proxy.rowCount())] == [2]
@@ -0,0 +1,105 @@
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from password_manager.models.password_model import PasswordListModel  # noqa: E402
+
+
+class Deferred:
+    """Collects loader requests so a test decides when each one is answered."""
+
+    def __init__(self):
+        self.requests = []
+
+    def __call__(self, *args):
+        self.requests.append(args)
+
+    def answer(self, result):
+        *_, callback = self.requests.pop(0)
+        callback(result)
+
+
+def _rows(count: int) -> list:
+    return [(i + 1, f"site{i}.example.com", f"user{i}", i % 2 == 0, False) for i in range(count)]
+
+
+def test_pages_are_applied_when_they_arrive():
+    rows = _rows(PasswordListModel.PAGE_SIZE + 10)
+    loader = Deferred()
+    model = PasswordListModel()
+    model.load_pages(loader, len(rows), 0)
+    assert model.rowCount() == 0
+    assert model.count == len(rows)
+    assert loader.requests[0][:2] == (0, PasswordListModel.PAGE_SIZE)
+
+    # One request at a time
+    model.fetchMore()
+    assert len(loader.requests) == 1
+
+    loader.answer(rows[:PasswordListModel.PAGE_SIZE])
+    assert model.rowCount() == PasswordListModel.PAGE_SIZE
+    assert model.canFetchMore()
+    model.fetchMore()
+    assert loader.requests[0][:2] == (PasswordListModel.PAGE_SIZE, PasswordListModel.PAGE_SIZE)
+    loader.answer(rows[PasswordListModel.PAGE_SIZE:])
+    assert model.rowCount() == len(rows)
+    assert not model.canFetchMore()
+
+
+def test_a_page_for_an_earlier_load_is_dropped():
+    loader = Deferred()
+    model = PasswordListModel()
+    model.load_pages(loader, 3, 0)
+    model.load_entries(_rows(1))
+    loader.answer(_rows(3))
+    assert model.rowCount() == 1
+
+
+def test_fetch_all_waits_for_the_page_in_flight():
+    rows = _rows(PasswordListModel.PAGE_SIZE * 3)
+    loader = Deferred()
+    model = PasswordListModel()
+    model.load_pages(loader, len(rows), 0)
+    model.fetch_all()
+    loader.answer(rows[:PasswordListModel.PAGE_SIZE])
+    assert loader.requests[0][:2] == (PasswordListModel.PAGE_SIZE, -1)
+    loader.answer(rows[PasswordListModel.PAGE_SIZE:])
+    assert model.rowCount() == len(rows)
+    assert not model.canFetchMore()
+
+
+def test_secrets_load_once_and_redraw_the_row():
+    loader = Deferred()
+    model = PasswordListModel()
+    model.load_entries(_rows(2))
+    model.set_secret_loader(loader)
+    model.toggleVisibility(0)
+    changed = []
+    model.dataChanged.connect(lambda top, bottom, roles: changed.append((top.row(), bottom.row())))
+
+    index = model.index(0)
+    assert model.data(index, PasswordListModel.PasswordRole) == ""
+    copied = []
+    model.request_secret(1, copied.append)
+    assert len(loader.requests) == 1
+
+    loader.answer(("hunter2", "JBSWY3DPEHPK3PXP"))
+    assert copied == [("hunter2", "JBSWY3DPEHPK3PXP")]
+    assert changed == [(0, 0)]
+    assert model.data(index, PasswordListModel.PasswordRole) == "hunter2"
+    assert model.data(index, PasswordListModel.TotpCodeRole).isdigit()
+
+    # Cached now, so answered at once
+    model.request_secret(1, copied.append)
+    assert len(copied) == 2 and not loader.requests
+
+
+def test_a_missing_secret_is_empty():
+    loader = Deferred()
+    model = PasswordListModel()
+    model.load_entries(_rows(1))
+    model.set_secret_loader(loader)
+    got = []
+    model.request_secret(1, got.append)
+    loader.answer(None)
+    assert got == [("", "")]
@@ -0,0 +1,138 @@
+import base64
+
+import pytest
+
+from password_manager.core.totp import TotpCodeCache, TotpKey, compute_totp, generate_totp, parse_totp_key
+from password_manager.core.validators import validate_totp_key
+
+# RFC 6238 appendix B: 8-digit codes, 30 second period
+SEEDS = {
+    "SHA1": b"12345678901234567890",
+    "SHA256": b"12345678901234567890123456789012",
+    "SHA512": b"1234567890" * 6 + b"1234",
+}
+VECTORS = [
+    (59, {"SHA1": "94287082", "SHA256": "46119246", "SHA512": "90693936"}),
+    (1111111109, {"SHA1": "07081804", "SHA256": "68084774", "SHA512": "25091201"}),
+    (1111111111, {"SHA1": "14050471", "SHA256": "67062674", "SHA512": "99943326"}),
+    (1234567890, {"SHA1": "89005924", "SHA256": "91819424", "SHA512": "93441116"}),
+    (2000000000, {"SHA1": "69279037", "SHA256": "90698825", "SHA512": "38618901"}),
+    (20000000000, {"SHA1": "65353130", "SHA256": "77737706", "SHA512": "47863826"}),
+]
+
+
+def _secret(algorithm: str) -> str:
+    return base64.b32encode(SEEDS[algorithm]).decode().rstrip("=")
+
+
+def _uri(algorithm: str, **params) -> str:
+    query = "&".join(f"{name}={value}" for name, value in params.items())
+    return f"otpauth://totp/Example:alice@example.com?secret={_secret(algorithm)}&algorithm={algorithm}&{query}"
+
+
+@pytest.mark.parametrize("algorithm", sorted(SEEDS))
+@pytest.mark.parametrize("now, codes", VECTORS)
+def test_rfc_6238_vectors(algorithm, now, codes):
+    key = parse_totp_key(_uri(algorithm, digits=8, period=30, issuer="Example"))
+    assert key == TotpKey(SEEDS[algorithm], algorithm, 8, 30)
+    assert compute_totp(key, now) == codes[algorithm]
+
+
+def test_plain_secret_is_sha1_with_six_digits():
+    key = parse_totp_key(" " + _secret("SHA1").lower() + " ")
+    assert key == TotpKey(SEEDS["SHA1"], "SHA1", 6, 30)
+    # Six digits are the low digits of the eight-digit code
+    assert compute_totp(key, 59) == "287082"
+
+
+def test_uri_parameters():
+    key = parse_totp_key(_uri("SHA256", digits=7, period=60).replace("algorithm=SHA256", "ALGORITHM=sha256"))
+    assert (key.algorithm, key.digits, key.period) == ("SHA256", 7, 60)
+    # One 60 second step covers both RFC times in it
+    assert compute_totp(key, 59) == compute_totp(key, 0)
+    assert len(compute_totp(key, 59)) == 7
+    # Defaults apply to what the URI leaves out
+    key = parse_totp_key(f"otpauth://totp/alice?secret={_secret('SHA1')}")
+    assert key == TotpKey(SEEDS["SHA1"], "SHA1", 6, 30)
+
+
+@pytest.mark.parametrize("uri, message", [
+    (f"otpauth://hotp/alice?secret={'A' * 16}&counter=1", "Only otpauth://totp/"),
+    ("otpauth://totp/alice?issuer=Example", "no secret"),
+    (f"otpauth://totp/alice?secret={'A' * 16}&algorithm=MD5", "Unsupported TOTP algorithm"),
+    (f"otpauth://totp/alice?secret={'A' * 16}&digits=5", "digits or period"),
+    (f"otpauth://totp/alice?secret={'A' * 16}&digits=11", "digits or period"),
+    (f"otpauth://totp/alice?secret={'A' * 16}&period=0", "digits or period"),
+    (f"otpauth://totp/alice?secret={'A' * 16}&period=soon", None),
+    ("otpauth://totp/alice?secret=not-base32!", None),
+])
+def test_bad_uri(uri, message):
+    with pytest.raises(ValueError, match=message):
+        parse_totp_key(uri)
+    assert not validate_totp_key(uri)
+    assert generate_totp(uri) == ""
+
+
+def test_cached_codes_last_one_period():
+    cache = TotpCodeCache()
+    cache.set_key(1, _uri("SHA1", digits=8))
+    cache.set_key(2, _uri("SHA256", digits=8, period=60))
+    assert cache.code(1, now=59) == "94287082"
+    assert cache.code(2, now=59) == compute_totp(parse_totp_key(_uri("SHA256", digits=8, period=60)), 59)
+    assert cache.period(2) == 60
+
+    assert sorted(cache.refresh(now=59)) == [1, 2]
+    assert cache.refresh(now=59.9) == []
+    assert sorted(cache.refresh(now=60)) == [1, 2]
+    # Only the 30 second entry rolls over at 90
+    assert cache.refresh(now=90) == [1]
+    assert cache.code(1, now=1111111109) == "07081804"
+
+
+def test_cache_skips_missing_and_invalid_keys():
+    cache = TotpCodeCache()
+    cache.set_key(1, "not base32!")
+    assert cache.code(1, now=59) == ""
+    assert cache.period(1) == 30
+    assert cache.code(2, now=59) == ""
+    assert cache.refresh(now=59) == []
+
+
+def test_replaced_and_invalidated_keys():
+    cache = TotpCodeCache()
+    cache.set_key(1, _uri("SHA1", digits=8))
+    assert cache.code(1, now=59) == "94287082"
+    cache.set_key(1, _uri("SHA512", digits=8))
+    assert cache.code(1, now=59) == "90693936"
+    cache.invalidate(1)
+    assert cache.code(1, now=59) == ""
+    assert cache.refresh(now=59) == []
+
+
+def test_loader_fetches_each_key_once_and_keeps_the_recent_ones():
+    loaded = []
+    secrets = {1: _uri("SHA1", digits=8), 2: _uri("SHA256", digits=8), 3: _uri("SHA512", digits=8)}
+
+    def loader(entry_id):
+        loaded.append(entry_id)
+        return secrets.get(entry_id, "")
+
+    cache = TotpCodeCache(loader=loader, max_keys=2)
+    assert cache.code(1, now=59) == "94287082"
+    assert cache.code(1, now=1111111109) == "07081804"
+    assert cache.code(2, now=59) == "46119246"
+    assert loaded == [1, 2]
+
+    # 1 was used less recently than 2, so it is evicted for 3
+    cache.code(2, now=59)
+    assert cache.code(3, now=59) == "90693936"
+    cache.code(2, now=59)
+    assert loaded == [1, 2, 3]
+    cache.code(1, now=59)
+    assert loaded == [1, 2, 3, 1]
+
+    # An entry without a key is asked for again, e.g. once its secret has loaded
+    assert cache.code(4, now=59) == ""
+    secrets[4] = _uri("SHA1", digits=8)
+    assert cache.code(4, now=59) == "94287082"
+    assert loaded[-2:] == [4, 4]
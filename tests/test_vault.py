@@ -0,0 +1,25 @@
+from password_manager.core.vault import VaultManager
+
+from conftest import MASTER_PASSWORD
+
+
+def _open(path) -> VaultManager:
+    vault = VaultManager()
+    assert vault.open(path, MASTER_PASSWORD)
+    return vault
+
+
+def test_search_summaries_are_ranked_summary_rows(vault_path):
+    vault = _open(vault_path)
+    try:
+        vault.toggle_favorite(2)
+        summaries = vault.search_summaries("example")
+        assert [row[0] for row in summaries] == vault.search("example")
+        assert sorted(summaries) == [
+            (1, "mail.example.com", "alice", 1, 0),
+            (2, "shop.example.org", "bob", 0, 1),
+        ]
+        assert vault.search_summaries("bob") == [(2, "shop.example.org", "bob", 0, 1)]
+        assert vault.search_summaries("nothing here") == []
+    finally:
+        vault.close()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Convert a Have I Been Pwned SHA-1 download into a breach corpus file.
+
+The input is the "SHA1:COUNT" text file ordered by hash, as written by the
+official downloader (haveibeenpwned-downloader, SHA-1 mode). The output is
+the memory-mapped format read by password_manager.core.breach; choose it
+under Security Settings to check passwords against it offline.
+
+    python tools/build_breach_corpus.py pwnedpasswords.txt breached.bin
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+from password_manager.core.breach import build_corpus  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", type=Path, help="SHA1:COUNT text file ordered by hash")
+    parser.add_argument("target", type=Path, help="corpus file to write")
+    args = parser.parse_args()
+
+    size = os.path.getsize(args.source)
+    started = time.perf_counter()
+
+    def progress(read: int):
+        print(f"\r{read * 100 // max(size, 1)}%", end="", file=sys.stderr, flush=True)
+
+    try:
+        count = build_corpus(args.source, args.target, progress)
+    except (OSError, ValueError) as e:
+        print(f"\n{args.source}: {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - started
+    print(f"\r{count:,} hashes written to {args.target} in {elapsed:.1f} s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())